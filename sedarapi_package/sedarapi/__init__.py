@@ -1,2 +1,17 @@
 # Make the SedarAPI class directly importable
-from .sedarapi import SedarAPI
\ No newline at end of file
+from .sedarapi import SedarAPI
+
+# Make the local datasource helpers directly importable
+from .datasource import infer_datasource_definition
+from .datasource import validate_datasource_definition
+
+# Make the helpers for bulk operations directly importable
+from .bulk import run_bulk
+from .journal import JobJournal
+
+# Make the helpers for the server logs directly importable
+from .logs import AccessLogStore
+from .logs import LogCursor
+
+# Make the local catalog index directly importable
+from .catalog import CatalogIndex
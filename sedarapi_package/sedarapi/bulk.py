@@ -0,0 +1,173 @@
+# Import needed python modules
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+import json
+import logging
+import time
+
+# Import needed SEDAR modules
+from .journal import FINISHED
+from .journal import STARTED
+
+#--------------------------------------------------------------
+# Helpers for bulk operations
+#--------------------------------------------------------------
+class BulkResult:
+    """
+    The outcome of one item of a bulk operation.
+
+    Attributes:
+        index (int): The position of the item in the input.
+        key (str): A readable name of the item, e.g. the dataset name.
+        value: The return value of the operation, or None if it failed.
+        error (Exception): The exception raised by the operation, or None if it succeeded.
+        seconds (float): The time the operation took.
+        resumed (bool): True if the item was finished in an earlier run and taken from the journal.
+    """
+    def __init__(self, index, key, value=None, error=None, seconds=0.0, resumed=False):
+        self.index = index
+        self.key = key
+        self.value = value
+        self.error = error
+        self.seconds = seconds
+        self.resumed = resumed
+
+    #--------------------------------------------------------------
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    #--------------------------------------------------------------
+    def __repr__(self):
+        state = ("resumed" if self.resumed else "ok") if self.ok else f"error={str(self.error)!r}"
+        return f"BulkResult(index={self.index}, key={self.key!r}, {state}, seconds={self.seconds:.2f})"
+
+
+#--------------------------------------------------------------
+def run_bulk(items, func, max_workers: int = 4, stop_on_error: bool = False, progress_callback=None, key=None, total: int = None,
+             journal=None, record=None, restore=None, reconcile=None) -> list:
+    """
+    Runs an operation for many items with a bounded number of threads.
+
+    Args:
+        items (iterable): The items. The iterable is consumed lazily, only "max_workers" items are pending at a time.
+        func (callable): The operation, called with one item. Its return value is stored in the result.
+        max_workers (int, optional): The maximum number of items processed at the same time. Defaults to 4.
+        stop_on_error (bool, optional): If True, no new items are started after the first failed one.
+            Items that are already running are finished. Defaults to False.
+        progress_callback (callable, optional): Called with (finished_items, total_items, result) after every item.
+            "total_items" is None if it is not known.
+        key (callable, optional): Returns the readable name of an item. Defaults to 'str'.
+        total (int, optional): The number of items, if "items" has no length.
+        journal (JobJournal, optional): Records the state of every item. Items finished in an earlier run with the same 
+            journal are not run again. The names returned by "key" identify the items, so they have to be unique and stable.
+        record (callable, optional): Turns the return value of "func" into the JSON serializable result stored in the journal.
+            Defaults to the value itself if it is JSON serializable, otherwise to its "id" attribute or None.
+        restore (callable, optional): Called with (item, stored_result) for items finished in an earlier run. Its return value
+            is used as the value of the result. Defaults to the stored result.
+        reconcile (callable, optional): Called with an item that was started in an earlier run, but whose outcome is unknown.
+            Checks the server and returns the result to store if the item was done, or None to run it again.
+            Without it, such items are run again.
+
+    Returns:
+        list: One BulkResult per started item, ordered like the input.
+
+    Raises:
+        ValueError: If "max_workers" is smaller than 1.
+
+    Notes:
+        - The journal is written after "func" has returned. If the write fails, the error is logged and the result is kept,
+          the item is then reconciled or run again when the operation is resumed.
+    """
+    if max_workers < 1:
+        raise ValueError("A bulk operation needs at least 1 worker.")
+    if total is None and hasattr(items, "__len__"):
+        total = len(items)
+    key = key or str
+
+    def run(index, item):
+        name = key(item)
+        started = time.monotonic()
+        try:
+            if journal is not None:
+                stored = _resume(journal, name, item, reconcile)
+                if stored is not None:
+                    value = restore(item, stored[0]) if restore is not None else stored[0]
+                    return BulkResult(index, name, value=value, seconds=time.monotonic() - started, resumed=True)
+                journal.start(name)
+
+            value = func(item)
+
+        except Exception as e:
+            if journal is not None:
+                _write_journal(name, lambda: journal.fail(name, e))
+            return BulkResult(index, name, error=e, seconds=time.monotonic() - started)
+
+        # The item succeeded on the server, a failed journal write must not turn it into a failed result
+        if journal is not None:
+            _write_journal(name, lambda: journal.finish(name, record(value) if record is not None else _default_record(value)))
+        return BulkResult(index, name, value=value, seconds=time.monotonic() - started)
+
+    results = []
+    pending = set()
+    stopped = False
+    iterator = enumerate(items)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            # Keep the pool busy without materializing the whole input
+            while not stopped and len(pending) < max_workers:
+                next_item = next(iterator, None)
+                if next_item is None:
+                    break
+                if journal is not None:
+                    journal.plan(key(next_item[1]))
+                pending.add(executor.submit(run, *next_item))
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                results.append(result)
+                if not result.ok and stop_on_error:
+                    stopped = True
+                if progress_callback is not None:
+                    progress_callback(len(results), total, result)
+
+    return sorted(results, key=lambda result: result.index)
+
+#--------------------------------------------------------------
+def _resume(journal, name, item, reconcile):
+    # Returns a one element tuple with the stored result if the item is done already, otherwise None
+    entry = journal.get(name)
+    if entry is None:
+        return None
+    state, result, _ = entry
+
+    # The outcome of an interrupted call is checked on the server
+    if state == STARTED and reconcile is not None:
+        result = reconcile(item)
+        if result is not None:
+            journal.finish(name, result)
+            state = FINISHED
+
+    return (result,) if state == FINISHED else None
+
+#--------------------------------------------------------------
+def _default_record(value):
+    # Stores JSON serializable values as they are and objects like Dataset or Job by their id
+    try:
+        json.dumps(value)
+        return value
+    except (TypeError, ValueError):
+        return getattr(value, "id", None)
+
+#--------------------------------------------------------------
+def _write_journal(name, write):
+    # A journal that can not be written does not change the outcome of the item itself
+    try:
+        write()
+    except Exception as e:
+        logging.getLogger("SedarAPI-Logger").error(f"The journal entry of '{name}' could not be written: {str(e)}")
@@ -0,0 +1,391 @@
+# Import needed python modules
+from bisect import bisect_left
+import heapq
+import json
+import math
+import os
+import re
+import tempfile
+
+# Import needed SEDAR modules
+from .bulk import run_bulk
+from .dataset import Dataset
+
+#--------------------------------------------------------------
+# Local full text index over the catalog
+#--------------------------------------------------------------
+# Matches in these fields count more than in the others
+FIELD_WEIGHTS = {"title": 3.0, "tags": 2.0, "author": 1.5, "description": 1.0, "attributes": 1.0, "notebooks": 1.0}
+
+# Factors for terms that only match the start of a query term, or one edit away from it
+PREFIX_FACTOR = 0.8
+FUZZY_FACTOR = 0.5
+
+# The number of terms a short prefix is expanded to at most, the most frequent ones are kept
+MAX_PREFIX_EXPANSIONS = 50
+
+_CAMEL_CASE = re.compile(r"([a-z])([A-Z][a-z])")
+_TOKEN = re.compile(r"[^\W\d_]+|\d+")
+
+def tokenize(text) -> list:
+    """
+    Splits a text into lower case terms. Camel case and snake case names are split into their words.
+    """
+    if not text:
+        return []
+    return [token.lower() for token in _TOKEN.findall(_CAMEL_CASE.sub(r"\1 \2", str(text)))]
+
+#--------------------------------------------------------------
+def _get_title(value):
+    # Tags, notebooks and annotations are sent as strings or as documents with a title
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        annotation = value.get("annotation") or {}
+        return value.get("title") or value.get("name") or (annotation.get("title") if isinstance(annotation, dict) else None)
+    return getattr(value, "title", value)
+
+#--------------------------------------------------------------
+def _get_schema_texts(schema):
+    texts = []
+    stack = list((schema or {}).get("entities") or [])
+    while stack:
+        element = stack.pop()
+        texts += [element.get("displayName"), element.get("name"), element.get("description")]
+        stack += element.get("attributes") or []
+    return [text for text in texts if text]
+
+#--------------------------------------------------------------
+def _get_deletes(term):
+    return {term[:position] + term[position + 1:] for position in range(len(term))}
+
+#--------------------------------------------------------------
+def _is_one_edit(a, b):
+    # True if b can be made from a by one insertion, deletion, substitution or swap of neighbouring characters
+    if abs(len(a) - len(b)) > 1 or a == b:
+        return False
+    start = 0
+    while start < min(len(a), len(b)) and a[start] == b[start]:
+        start += 1
+    if len(a) == len(b):
+        return a[start + 1:] == b[start + 1:] or (a[start + 2:] == b[start + 2:] and a[start:start + 2] == b[start:start + 2][::-1])
+    shorter, longer = (a, b) if len(a) < len(b) else (b, a)
+    return shorter[start:] == longer[start + 1:]
+
+
+#--------------------------------------------------------------
+class CatalogHit:
+    """
+    One result of a 'CatalogIndex' search.
+
+    Attributes:
+        id (str): The id of the dataset or workspace.
+        kind (str): Either "dataset" or "workspace".
+        workspace (str): The id of the workspace the dataset belongs to, the own id for workspaces.
+        title (str): The title of the dataset or workspace.
+        score (float): The BM25 relevance of the hit.
+    """
+    __slots__ = ("id", "kind", "workspace", "title", "score")
+
+    def __init__(self, id, kind, workspace, title, score):
+        self.id = id
+        self.kind = kind
+        self.workspace = workspace
+        self.title = title
+        self.score = score
+
+    #--------------------------------------------------------------
+    def __repr__(self):
+        return f"CatalogHit({self.kind}, id={self.id!r}, title={self.title!r}, score={self.score:.3f})"
+
+
+#--------------------------------------------------------------
+class CatalogIndex:
+    """
+    An in-memory inverted index over the metadata of workspaces and datasets, for fast local catalog searches.
+
+    The index covers the titles, descriptions and authors of datasets, the names and descriptions of their entities
+    and attributes, their tags and notebook titles, and the titles and descriptions of workspaces. Results are ranked
+    with BM25. The last term of a query also matches as prefix, for search-as-you-type, and terms of four or more
+    characters also match terms one typo away.
+
+    The index is built from the documents the client fetches anyway, with 'add_dataset' and 'add_workspace', or
+    from the server with 'refresh', which only fetches the datasets that changed since the last refresh. It can be
+    saved to and loaded from a JSON file.
+
+    Args:
+        k1 (float, optional): The BM25 term frequency saturation. Defaults to 1.2.
+        b (float, optional): The BM25 length normalisation. Defaults to 0.75.
+
+    Example:
+        ```python
+        index = CatalogIndex.load("catalog.json") if os.path.exists("catalog.json") else CatalogIndex()
+        index.refresh(sedar.get_all_workspaces())
+        index.save("catalog.json")
+
+        for hit in index.search("temperatur sens"):
+            print(hit.title, hit.score)
+        ```
+    """
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._documents = {}            # Key -> {"id", "kind", "workspace", "title", "stamp", "terms", "length"}
+        self._postings = {}             # Term -> {key: weighted term frequency}
+        self._deletes = {}              # Term with one character removed -> set of terms
+        self._sorted_terms = None       # Sorted terms for prefix lookups, rebuilt after changes
+        self._total_length = 0.0
+
+    #--------------------------------------------------------------
+    def __len__(self):
+        return len(self._documents)
+
+    #--------------------------------------------------------------
+    def add_dataset(self, dataset, workspace_id: str = None, notebooks: list = None, stamp: str = None):
+        """
+        Adds a dataset to the index or replaces its previous entry.
+
+        Args:
+            dataset (Dataset or dict): The dataset, or its document as sent by the server.
+            workspace_id (str, optional): The id of the workspace. Taken from the Dataset object by default.
+            notebooks (list, optional): The notebooks of the dataset, as Notebook objects or documents. By default
+                the notebooks in the dataset document are used, if any.
+            stamp (str, optional): The modification time of the dataset, used by 'refresh' to detect changes.
+                Defaults to "lastUpdatedOn" of the document.
+        """
+        content = getattr(dataset, "content", dataset)
+        workspace_id = workspace_id or getattr(dataset, "workspace", None)
+        notebooks = notebooks if notebooks is not None else content.get("notebooks") or []
+        fields = {
+            "title": content.get("title"),
+            "description": content.get("description"),
+            "author": content.get("author"),
+            "tags": " ".join(str(_get_title(tag)) for tag in content.get("tags") or []),
+            "attributes": " ".join(_get_schema_texts(content.get("schema"))),
+            "notebooks": " ".join(str(_get_title(notebook)) for notebook in notebooks)
+        }
+        self._add(getattr(dataset, "id", None) or content["id"], "dataset", workspace_id, content.get("title"), fields, stamp or content.get("lastUpdatedOn"))
+
+    #--------------------------------------------------------------
+    def add_workspace(self, workspace):
+        """
+        Adds a workspace to the index or replaces its previous entry.
+
+        Args:
+            workspace (Workspace or dict): The workspace, or its document as sent by the server.
+        """
+        content = getattr(workspace, "content", workspace)
+        fields = {"title": content.get("title"), "description": content.get("description")}
+        workspace_id = getattr(workspace, "id", None) or content["id"]
+        self._add(workspace_id, "workspace", workspace_id, content.get("title"), fields, None)
+
+    #--------------------------------------------------------------
+    def remove(self, id: str, kind: str = "dataset") -> bool:
+        """
+        Removes a dataset or workspace from the index. Returns False if it was not indexed.
+        """
+        key = f"{kind}:{id}"
+        document = self._documents.pop(key, None)
+        if document is None:
+            return False
+
+        for term in document["terms"]:
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+                for delete in _get_deletes(term):
+                    self._deletes[delete].discard(term)
+                    if not self._deletes[delete]:
+                        del self._deletes[delete]
+                self._sorted_terms = None
+        self._total_length -= document["length"]
+        return True
+
+    #--------------------------------------------------------------
+    def refresh(self, workspaces: list, max_workers: int = 8, include_notebooks: bool = False) -> dict:
+        """
+        Brings the index up to date with the server, fetching only the datasets that changed.
+
+        Args:
+            workspaces (list): The Workspace objects to index. Workspaces of the index that are not passed are removed
+                together with their datasets.
+            max_workers (int, optional): The maximum number of dataset requests at the same time. Defaults to 8.
+            include_notebooks (bool, optional): If True, the notebooks of every changed dataset are fetched and
+                their titles indexed. This costs one more request per changed dataset. Defaults to False.
+
+        Returns:
+            dict: The number of "added", "updated", "removed" and "unchanged" datasets.
+
+        Description:
+            One request per workspace lists its datasets with their modification time. Only new datasets and those
+            whose modification time differs from the indexed one are fetched in full, concurrently. Datasets that
+            are no longer listed are removed. A dataset that can not be fetched keeps its previous entry.
+        """
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        workspace_ids = set()
+        for workspace in workspaces:
+            workspace_ids.add(workspace.id)
+            self.add_workspace(workspace)
+            listing = {dataset["id"]: dataset.get("lastUpdatedOn") for dataset in workspace._get_all_datasets_json(workspace.id)}
+
+            removed = [document["id"] for document in self._documents.values()
+                       if document["kind"] == "dataset" and document["workspace"] == workspace.id and document["id"] not in listing]
+            for dataset_id in removed:
+                self.remove(dataset_id)
+            stats["removed"] += len(removed)
+
+            changed = [dataset_id for dataset_id, stamp in listing.items()
+                       if stamp is None or self._documents.get(f"dataset:{dataset_id}", {}).get("stamp") != stamp]
+            stats["unchanged"] += len(listing) - len(changed)
+
+            def fetch(dataset_id):
+                dataset = Dataset(workspace.connection, workspace.id, dataset_id)
+                notebooks = dataset._get_all_notebooks(workspace.id, dataset_id) if include_notebooks else None
+                return dataset, notebooks
+
+            for result in run_bulk(changed, fetch, max_workers):
+                if not result.ok:
+                    workspace.logger.warning(f"The Dataset '{result.key}' could not be indexed: {str(result.error)}")
+                    continue
+                dataset, notebooks = result.value
+                stats["updated" if f"dataset:{result.key}" in self._documents else "added"] += 1
+                self.add_dataset(dataset, workspace.id, notebooks, listing[result.key])
+
+        # Workspaces that were not passed (e.g. deleted ones) are dropped with their datasets
+        removed = [(document["id"], document["kind"]) for document in self._documents.values() if document["workspace"] not in workspace_ids]
+        for document_id, kind in removed:
+            self.remove(document_id, kind)
+        stats["removed"] += sum(1 for _, kind in removed if kind == "dataset")
+        return stats
+
+    #--------------------------------------------------------------
+    def search(self, query: str, limit: int = 10, prefix: bool = True, fuzzy: bool = True, kind: str = None, workspace_id: str = None) -> list:
+        """
+        Searches the index.
+
+        Args:
+            query (str): The search text.
+            limit (int, optional): The maximum number of hits. Defaults to 10.
+            prefix (bool, optional): If True, the last term of the query also matches longer terms starting with it. Defaults to True.
+            fuzzy (bool, optional): If True, query terms of four or more characters also match terms one typo away. Defaults to True.
+            kind (str, optional): Only returns hits of this kind, "dataset" or "workspace".
+            workspace_id (str, optional): Only returns hits of this workspace.
+
+        Returns:
+            list[CatalogHit]: The hits, the most relevant first.
+        """
+        tokens = tokenize(query)
+        if not tokens or not self._documents:
+            return []
+        average_length = self._total_length / len(self._documents)
+
+        scores = {}
+        for position, token in enumerate(tokens):
+            # Every document counts the best matching variant of a query term only once
+            best = {}
+            for term, factor in self._expand(token, prefix and position == len(tokens) - 1, fuzzy).items():
+                postings = self._postings[term]
+                idf = math.log(1 + (len(self._documents) - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, frequency in postings.items():
+                    length = self._documents[key]["length"]
+                    score = factor * idf * frequency * (self.k1 + 1) / (frequency + self.k1 * (1 - self.b + self.b * length / average_length))
+                    if score > best.get(key, 0.0):
+                        best[key] = score
+            for key, score in best.items():
+                scores[key] = scores.get(key, 0.0) + score
+
+        hits = []
+        for key, score in sorted(scores.items(), key=lambda item: (-item[1], item[0])):
+            document = self._documents[key]
+            if (kind is None or document["kind"] == kind) and (workspace_id is None or document["workspace"] == workspace_id):
+                hits.append(CatalogHit(document["id"], document["kind"], document["workspace"], document["title"], score))
+                if len(hits) >= limit:
+                    break
+        return hits
+
+    #--------------------------------------------------------------
+    def save(self, path: str):
+        """
+        Writes the index to a JSON file. The file is replaced atomically.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".catalog-")
+        try:
+            with os.fdopen(file_descriptor, "w") as f:
+                json.dump({"version": 1, "k1": self.k1, "b": self.b, "documents": list(self._documents.values())}, f)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    #--------------------------------------------------------------
+    @classmethod
+    def load(cls, path: str) -> "CatalogIndex":
+        """
+        Reads an index written by 'save'.
+        """
+        with open(path, "r") as f:
+            data = json.load(f)
+        if data.get("version") != 1:
+            raise Exception(f"The catalog index '{path}' was written by an unsupported version.")
+
+        index = cls(data["k1"], data["b"])
+        for document in data["documents"]:
+            index._insert(f"{document['kind']}:{document['id']}", document)
+        return index
+
+    #--------------------------------------------------------------
+    # Private helper methods
+    #--------------------------------------------------------------
+    def _add(self, id, kind, workspace_id, title, fields, stamp):
+        terms = {}
+        for field, text in fields.items():
+            for token in tokenize(text):
+                terms[token] = terms.get(token, 0.0) + FIELD_WEIGHTS[field]
+
+        self.remove(id, kind)
+        self._insert(f"{kind}:{id}", {"id": id, "kind": kind, "workspace": workspace_id, "title": title, "stamp": stamp,
+                                      "terms": terms, "length": sum(terms.values())})
+
+    #--------------------------------------------------------------
+    def _insert(self, key, document):
+        self._documents[key] = document
+        for term, frequency in document["terms"].items():
+            if term not in self._postings:
+                self._postings[term] = {}
+                for delete in _get_deletes(term):
+                    self._deletes.setdefault(delete, set()).add(term)
+                self._sorted_terms = None
+            self._postings[term][key] = frequency
+        self._total_length += document["length"]
+
+    #--------------------------------------------------------------
+    def _expand(self, token, prefix, fuzzy):
+        # Returns the indexed terms matching a query term, with the factor their score is multiplied with
+        matches = {token: 1.0} if token in self._postings else {}
+
+        if prefix:
+            if self._sorted_terms is None:
+                self._sorted_terms = sorted(self._postings)
+            position = end = bisect_left(self._sorted_terms, token)
+            while end < len(self._sorted_terms) and self._sorted_terms[end].startswith(token):
+                end += 1
+            expansions = self._sorted_terms[position:end]
+            if len(expansions) > MAX_PREFIX_EXPANSIONS:
+                expansions = heapq.nlargest(MAX_PREFIX_EXPANSIONS, expansions, key=lambda term: len(self._postings[term]))
+            for term in expansions:
+                matches.setdefault(term, PREFIX_FACTOR)
+
+        if fuzzy and len(token) >= 4:
+            # Terms one edit away share the term itself or one of its deletions with the query term
+            candidates = set(self._deletes.get(token, ()))
+            for delete in _get_deletes(token):
+                candidates.update(self._deletes.get(delete, ()))
+                if delete in self._postings:
+                    candidates.add(delete)
+            for term in candidates:
+                if _is_one_edit(token, term):
+                    matches.setdefault(term, FUZZY_FACTOR)
+        return matches
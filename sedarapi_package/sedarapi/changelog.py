@@ -0,0 +1,102 @@
+# Import needed python modules
+from datetime import datetime
+import heapq
+
+# Import needed SEDAR modules
+from .commons import _parse_time
+
+#--------------------------------------------------------------
+# Records of the change log of a dataset
+#--------------------------------------------------------------
+class DatasetLogRecord:
+    """
+    One entry of the change log of a dataset, see 'Dataset.get_logs'.
+
+    The record only references the entry as sent by the server. The readable text is built when the record is
+    converted to a string, so loading many records stays cheap.
+
+    Attributes:
+        version: The version of the dataset the entry belongs to.
+        created_on (str): The time of the change as sent by the server.
+        user (dict): The user who made the change.
+        description (dict): The description of the change by language, e.g. {"en": "..."}.
+        changes (list): The changed keys as dictionaries with "key", "from" and "to".
+    """
+    __slots__ = ("version", "created_on", "user", "description", "changes")
+
+    def __init__(self, log: dict):
+        self.version = log.get("version")
+        self.created_on = log.get("createdOn")
+        self.user = log.get("user") or {}
+        self.description = log.get("description") or {}
+        self.changes = log.get("changes") or []
+
+    #--------------------------------------------------------------
+    @property
+    def username(self) -> str:
+        return self.user.get("username")
+
+    #--------------------------------------------------------------
+    @property
+    def changed_keys(self) -> list:
+        return [change["key"] for change in self.changes]
+
+    #--------------------------------------------------------------
+    def get_time(self) -> datetime:
+        """
+        Returns the time of the change as UTC-aware datetime, or None if it can not be parsed.
+        """
+        return _parse_time(self.created_on)
+
+    #--------------------------------------------------------------
+    def __str__(self):
+        lines = [f"Version: {self.version}, Created On: {self.created_on}, User: {self.username}",
+                 f"Description: {self.description.get('en')}"]
+        lines += [f"\tChanged '{change['key']}' from '{change['from']}' to '{change['to']}'" for change in self.changes]
+        return "\n".join(lines) + "\n"
+
+    #--------------------------------------------------------------
+    def __repr__(self):
+        return f"DatasetLogRecord(version={self.version!r}, created_on={self.created_on!r}, changed_keys={self.changed_keys!r})"
+
+#--------------------------------------------------------------
+def filter_dataset_logs(logs: list, newest: int = None, versions: tuple = None, since=None, until=None, keys=None) -> list:
+    """
+    Selects entries of a dataset change log and wraps only the selected ones into DatasetLogRecords.
+
+    Args:
+        logs (list): The log entries as sent by the server.
+        newest (int, optional): Only the newest N matching entries are returned.
+        versions (tuple, optional): An inclusive (first, last) range of versions. Either bound may be None.
+            Entries without a version are skipped if a bound is given.
+        since (str or datetime, optional): Only entries at or after this time are returned.
+        until (str or datetime, optional): Only entries before this time are returned.
+        keys (iterable, optional): Only entries that changed at least one of these keys are returned.
+
+    Returns:
+        list[DatasetLogRecord]: The matching entries, the oldest first.
+    """
+    first, last = versions if versions is not None else (None, None)
+    # Times without a time zone are taken as UTC, like the times sent by the server
+    since = _parse_time(since)
+    until = _parse_time(until)
+    keys = set(keys) if keys is not None else None
+
+    def matches(log):
+        version = log.get("version")
+        if (first is not None or last is not None) and version is None:
+            return False
+        if (first is not None and version < first) or (last is not None and version > last):
+            return False
+        if since is not None or until is not None:
+            created_on = _parse_time(log.get("createdOn"))
+            if created_on is None or (since is not None and created_on < since) or (until is not None and created_on >= until):
+                return False
+        if keys is not None and not any(change.get("key") in keys for change in log.get("changes") or []):
+            return False
+        return True
+
+    # The position breaks ties, so entries without a version keep the order of the server
+    selected = [(log.get("version") or 0, position, log) for position, log in enumerate(logs) if matches(log)]
+    selected = heapq.nlargest(newest, selected, key=lambda entry: entry[:2]) if newest is not None else selected
+    return [DatasetLogRecord(log) for _, _, log in sorted(selected, key=lambda entry: entry[:2])]
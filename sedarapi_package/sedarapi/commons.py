@@ -1,18 +1,31 @@
 # Import needed python modules
+from contextlib import contextmanager
+from datetime import datetime
+from datetime import timezone
 import requests
+import hashlib
 import logging
+import threading
+import time
 import os
 import uuid
 
+# Import needed SEDAR modules
+from .upload import MultipartStream
+from .upload import format_transfer_stats
+from .jobs import JobWatcher
+
 #--------------------------------------------------------------
 # Common HTTP request methods
 #--------------------------------------------------------------
 class Commons:
-    def __init__(self, base_url):
+    def __init__(self, base_url, query_session_pool_size=4, query_session_idle_expiry=300):
         self.base_url = base_url
         self.user = None
         self.session = requests.Session()
         self.session_id = str(uuid.uuid4())
+        self.query_sessions = QuerySessionPool(query_session_pool_size, query_session_idle_expiry)
+        self.jobs = JobWatcher()
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger("SedarAPI-Logger")
     #--------------------------------------------------------------
@@ -88,6 +101,162 @@ class Commons:
 
         return None
 
+    #----------------------------------------------------------
+    def _upload_resource(self, method, resource_path, data=None, files=None, progress_callback=None):
+        # Streams a multipart request from disk instead of building the whole body in memory.
+        # "files" maps field names to (file_name, source, mime_type) tuples, see "MultipartStream".
+        url = self.base_url + resource_path
+        body = MultipartStream(data, files, progress_callback=progress_callback)
+        response = None
+
+        try:
+            # A body of unknown length is sent with chunked transfer encoding
+            response = self.session.request(method, url, data=body if body.length is not None else iter(body), headers={"Content-Type": body.content_type})
+            response.raise_for_status()
+            self.logger.info(f"Uploaded {format_transfer_stats(body.get_stats())}")
+            try:
+                return response.json()
+            except ValueError:
+                return response.content
+
+        #Handle Connection-Error
+        except requests.exceptions.ConnectionError as e:
+            self.logger.error(f"An Exception occured!\n\tMessage:\n\tFailed to connect to the server: {str(e)}\n\tServer Response:\n\t{getattr(response, 'content', None)}")
+
+        #Handle HTTP-Error
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"An Exception occured!\n\tMessage:\n\tFailed to upload to resource {resource_path}: {str(e)}\n\tServer Response:\n\t{getattr(response, 'content', None)}")
+
+        finally:
+            body.close()
+
+        return None
+
+    #----------------------------------------------------------
+    def _download_resource(self, resource_path, target_path, data=None, resume=True, checksum=None, checksum_algorithm="sha256",
+                           retries=3, chunk_size=1024 * 1024, progress_callback=None):
+        # Streams a response to disk. The data is written to '{target_path}.part' and renamed once it is complete,
+        # so "target_path" never holds a half written file. An existing part file is continued with a HTTP Range request.
+        url = self.base_url + resource_path
+        part_path = target_path + ".part"
+        validator_path = part_path + ".validator"
+        if not os.path.isdir(os.path.dirname(target_path) or "."):
+            self.logger.error(f"An Exception occured!\n\tMessage:\n\tFailed to download resource {resource_path}: The directory of '{target_path}' does not exist.")
+            return None
+        if not resume:
+            for path in (part_path, validator_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        for attempt in range(retries + 1):
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            headers = {"Range": f"bytes={offset}-"} if offset > 0 else {}
+
+            # With "If-Range" the server sends the whole resource again if it changed since the part file was started
+            if offset > 0 and os.path.exists(validator_path):
+                with open(validator_path, "r") as f:
+                    headers["If-Range"] = f.read()
+            response = None
+
+            try:
+                with self.session.get(url, json=data, headers=headers, stream=True) as response:
+                    # The part file may be complete already. It is only taken if the size reported in 'Content-Range: bytes */N'
+                    # and the checksum confirm it, otherwise it is removed and the download starts from the beginning.
+                    if response.status_code == 416 and offset > 0:
+                        if response.headers.get("Content-Range") == f"bytes */{offset}" and \
+                                (checksum is None or self._hash_file(part_path, checksum_algorithm, chunk_size) == checksum.lower()):
+                            break
+                        self.logger.warning(f"The partial download of {resource_path} does not match the resource and is started again.")
+                        for path in (part_path, validator_path):
+                            if os.path.exists(path):
+                                os.remove(path)
+                        continue
+                    response.raise_for_status()
+
+                    # Start from the beginning if the server ignored the Range header
+                    mode = "ab" if response.status_code == 206 and response.headers.get("Content-Range", "").startswith(f"bytes {offset}-") else "wb"
+                    written = offset if mode == "ab" else 0
+                    total = response.headers.get("Content-Length")
+                    total = int(total) + written if total is not None else None
+
+                    validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+                    if mode == "wb" and validator:
+                        with open(validator_path, "w") as f:
+                            f.write(validator)
+
+                    with open(part_path, mode) as f:
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            f.write(chunk)
+                            written += len(chunk)
+                            if progress_callback is not None:
+                                progress_callback(written, total)
+                break
+
+            #Handle Connection-Error (the part file is kept and continued by the next attempt)
+            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+                self.logger.warning(f"The download of {resource_path} was interrupted (attempt {attempt + 1} of {retries + 1}): {str(e)}")
+                if attempt == retries:
+                    self.logger.error(f"An Exception occured!\n\tMessage:\n\tFailed to download resource {resource_path}: {str(e)}")
+                    return None
+
+            #Handle HTTP-Error
+            except requests.exceptions.RequestException as e:
+                self.logger.error(f"An Exception occured!\n\tMessage:\n\tFailed to download resource {resource_path}: {str(e)}\n\tServer Response:\n\t{getattr(response, 'content', None)}")
+                return None
+
+            #Handle errors of the local file
+            except OSError as e:
+                self.logger.error(f"An Exception occured!\n\tMessage:\n\tFailed to write the download of {resource_path} to '{part_path}': {str(e)}")
+                return None
+        else:
+            self.logger.error(f"An Exception occured!\n\tMessage:\n\tFailed to download resource {resource_path}: The download was not completed after {retries + 1} attempts.")
+            return None
+
+        if checksum is not None:
+            if self._hash_file(part_path, checksum_algorithm, chunk_size) != checksum.lower():
+                os.remove(part_path)
+                if os.path.exists(validator_path):
+                    os.remove(validator_path)
+                raise Exception(f"The {checksum_algorithm} checksum of the download {resource_path} does not match. The downloaded data was removed.")
+
+        os.replace(part_path, target_path)
+        if os.path.exists(validator_path):
+            os.remove(validator_path)
+        return target_path
+
+    #----------------------------------------------------------
+    @staticmethod
+    def _hash_file(path, algorithm, chunk_size):
+        digest = hashlib.new(algorithm)
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    #----------------------------------------------------------
+    def _stream_resource(self, resource_path, data=None, chunk_size=64 * 1024, offset=0, response_info=None):
+        # Yields the body of a response in chunks, without holding it in memory. Unlike the other helpers an error
+        # can not be signalled by returning None, so it is logged and raised. With an "offset" only the bytes from
+        # there on are requested; the status code is put into "response_info", as the server may ignore the Range
+        # header (200) or answer that the resource is shorter than the offset (416, nothing is yielded).
+        url = self.base_url + resource_path
+        headers = {"Range": f"bytes={offset}-"} if offset > 0 else {}
+        response = None
+        try:
+            with self.session.get(url, json=data, headers=headers, stream=True) as response:
+                if response_info is not None:
+                    response_info["status"] = response.status_code
+                if response.status_code == 416 and offset > 0:
+                    return
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if chunk:
+                        yield chunk
+
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"An Exception occured!\n\tMessage:\n\tFailed to stream resource {resource_path}: {str(e)}\n\tServer Response:\n\t{getattr(response, 'content', None)}")
+            raise Exception(f"The resource '{resource_path}' could not be streamed. Set the logger level to \"Error\" or below to get more detailed information.")
+
     #----------------------------------------------------------    
     def _patch_resource(self, resource_path, data=None):
         url = self.base_url + resource_path
@@ -214,3 +383,133 @@ class Commons:
     @staticmethod
     def _remove_file_extension(file_name):
         return os.path.splitext(file_name)[0]
+
+    #--------------------------------------------------------------
+    def _collect_upload_files(self, file_paths, mime_type="application/vnd.ms-excel"):
+        """
+        Builds the file fields for a multipart upload from the "file_paths" argument of the upload methods.
+
+        Args:
+            file_paths (str or dict): Either a single path to a file (str) or a dictionary of datasource names to file paths.
+            mime_type (str, optional): The mime-type sent for every file.
+
+        Returns:
+            dict: The file fields, mapping field names to (file_name, file_path, mime_type) tuples,
+                or None if a file does not exist or "file_paths" has an invalid type.
+
+        Raises:
+            None
+        """
+        # If we got a single file_path, the file name without its extension is used as the field name
+        if isinstance(file_paths, str):
+            file_paths = {self._remove_file_extension(os.path.basename(file_paths)): file_paths}
+
+        # Throw error if we do not get a dict or str as "file_paths"
+        elif not isinstance(file_paths, dict):
+            self.logger.error(f"Invalid type for file_paths: {type(file_paths)}")
+            return None
+
+        files = {}
+        for key, path in file_paths.items():
+            if not os.path.exists(path):
+                self.logger.error(f"File not found: {path}")
+                return None
+            files[key] = (os.path.basename(path), path, mime_type)
+
+        return files
+
+
+#--------------------------------------------------------------
+# Query session pool
+#--------------------------------------------------------------
+class QuerySessionPool:
+    """
+    A thread-safe pool of query session ids.
+
+    The SEDAR server keeps one query session per session id, so all queries sent with the same id are
+    executed one after another. Concurrent callers check out distinct ids from this pool, which allows the
+    server to run their queries in parallel.
+
+    Args:
+        size (int): The maximum number of session ids handed out at the same time.
+        idle_expiry (float): Seconds after which an unused session id is discarded and replaced by a fresh one.
+            Set to None to keep session ids forever.
+    """
+    def __init__(self, size=4, idle_expiry=300):
+        if size < 1:
+            raise ValueError("The query session pool needs a size of at least 1.")
+        self.size = size
+        self.idle_expiry = idle_expiry
+        self._idle = []         # List of (session_id, last_used) tuples, most recently used last
+        self._in_use = 0
+        self._condition = threading.Condition()
+
+    #--------------------------------------------------------------
+    @contextmanager
+    def checkout(self, timeout=None):
+        """
+        Checks out a session id for the duration of the with-block and returns it to the pool afterwards.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait for a free session id. Waits forever by default.
+
+        Raises:
+            TimeoutError: If no session id became available within the timeout.
+
+        Example:
+            with connection.query_sessions.checkout() as session_id:
+                payload = {"session_id": session_id, "query": query}
+        """
+        session_id = self._acquire(timeout)
+        try:
+            yield session_id
+        finally:
+            self._release(session_id)
+
+    #--------------------------------------------------------------
+    def _acquire(self, timeout):
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._in_use < self.size, timeout):
+                raise TimeoutError(f"No query session became available within {timeout} seconds.")
+            self._in_use += 1
+            self._expire_idle()
+
+            # Reuse the most recently returned session, so that the server side session stays warm
+            if self._idle:
+                return self._idle.pop()[0]
+        return str(uuid.uuid4())
+
+    #--------------------------------------------------------------
+    def _release(self, session_id):
+        with self._condition:
+            self._idle.append((session_id, time.monotonic()))
+            self._in_use -= 1
+            self._condition.notify()
+
+    #--------------------------------------------------------------
+    def _expire_idle(self):
+        if self.idle_expiry is None:
+            return
+        deadline = time.monotonic() - self.idle_expiry
+        self._idle = [(session_id, last_used) for session_id, last_used in self._idle if last_used >= deadline]
+
+
+#--------------------------------------------------------------
+# Shared helpers
+#--------------------------------------------------------------
+def _parse_time(value):
+    # Parses a timestamp sent by the server into a UTC-aware datetime, or returns None if it can not be parsed.
+    # Timestamps without a time zone are taken as UTC, so all results can be compared with each other.
+    if value is None:
+        return None
+    try:
+        if isinstance(value, datetime):
+            time = value
+        elif isinstance(value, (int, float)):
+            # Epoch timestamps are given in milliseconds by the server
+            return datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+        else:
+            time = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except (ValueError, OverflowError, OSError):
+        return None
+    return time.replace(tzinfo=timezone.utc) if time.tzinfo is None else time.astimezone(timezone.utc)
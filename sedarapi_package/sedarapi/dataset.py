@@ -4,6 +4,7 @@ from typing import Type
 from typing import List
 import os
 import json
+import tempfile
 
 # Import needed SEDAR modules
 from .commons import Commons
@@ -15,16 +16,38 @@ from .ontology import Annotation
 from .attribute import Attribute
 from .entity import Entity
 from .file import File
+from .file import _plan_file_downloads
+from .file import _download_files
 from .cleaning import DatasetCleaning
+from .sourcefiles import prepare_upload
+from .sourcefiles import plan_incremental_upload
+from .datasource import validate_datasource_definition
+from .manifest import UploadManifest
+from .manifest import hash_file
+from .manifest import hash_json
+from .jobs import Job
+from .changelog import DatasetLogRecord
+from .changelog import filter_dataset_logs
+
+# The flags of the dataset document that report the steps of the publish process
+_PUBLISH_FLAGS = {"published": "isPublished", "indexed": "isIndexed", "profiled": "isProfiled"}
 
 class Dataset:
     #--------------------------------------------------------------
-    def __init__(self, connection: Type[Commons], workspace_id: str, dataset_id: str):
+    def __init__(self, connection: Type[Commons], workspace_id: str, dataset_id: str, content: dict = None):
         self.connection = connection
         self.workspace = workspace_id
         self.id = dataset_id
         self.logger = self.connection.logger
-        self.content = self._get_dataset_json(self.workspace, self.id)
+
+        # A document that is known already (e.g. from a search hit) saves the request, if it holds all members
+        # including the datasource, whose current revision is read by several methods
+        datasource = content.get("datasource") if content is not None else None
+        if content is None or any(key not in content for key in ("title", "description", "isPublic", "isFavorite", "author",
+                                                                   "longitude", "latitude", "license", "language")) \
+                or not isinstance(datasource, dict) or "currentRevision" not in datasource:
+            content = self._get_dataset_json(self.workspace, self.id)
+        self.content = content
 
         # Extract some members from the "content" attribute
         self.title = self.content["title"]
@@ -36,6 +59,9 @@ class Dataset:
         self.latitude = self.content["latitude"]
         self.license = self.content["license"]
         self.language = self.content["language"]
+
+        # Set by "update_datasource", True if the last update was skipped because nothing changed
+        self.update_skipped = False
     
     #--------------------------------------------------------------
     #--------------------- Interface methods ----------------------
@@ -94,7 +120,8 @@ class Dataset:
                        self._update_dataset(self.workspace, self.id, title, description, author, longitude, 
                                             latitude, range_start, range_end, license, language)["id"])
     
-    def update_datasource(self, datasource_definition, file_paths) -> Dataset:
+    def update_datasource(self, datasource_definition, file_paths, progress_callback=None, shards: int = None, convert_to: str = None, validate: bool = False,
+                          skip_unchanged: bool = False, manifest_path: str = None, incremental: bool = False, compression: str = None) -> Dataset:
         """
         Updates the datasource of the specified dataset.
 
@@ -104,10 +131,24 @@ class Dataset:
             file_paths: The path to the datasource file or a dictionary containing 
                                     multiple file paths with keys being the datasource names and 
                                     values being their respective paths.
+            progress_callback (callable, optional): Called with (bytes_sent, total_bytes) while the files are uploaded. 
+                total_bytes is None when compressing, as the compressed size is not known in advance.
+            shards (int, optional): If set, every CSV or JSON lines source file is split into this number of record-aligned shards.
+            convert_to (str, optional): If set to "parquet", CSV and JSON lines source files are converted to compressed Parquet before the upload.
+            validate (bool, optional): If True, the definition is checked against a sample of the source files before the upload. 
+                See 'validate_datasource_definition'. Defaults to False.
+            skip_unchanged (bool, optional): If True, nothing is sent to the server when the source files, the datasource definition 
+                and the preparation options are the same as in the last update of this dataset. Defaults to False.
+            manifest_path (str, optional): The local manifest that stores the hashes of the last update. 
+                Defaults to '~/.sedarapi/upload_manifest.json'.
+            incremental (bool, optional): If True, only the lines appended to the CSV or JSON lines source files since the last 
+                incremental update are uploaded and merged into the dataset. Defaults to False.
+            compression (str, optional): If set to "gzip" or "zstd", the source files are compressed while they are uploaded.
 
         Returns:
             Dataset: An instance of the Dataset class representing the updated dataset with the new datasource. 
-            The content of the dataset details can be accessed using the `.content` attribute.
+            The content of the dataset details can be accessed using the `.content` attribute. `.update_skipped` is True 
+            if nothing was sent because the source files did not change (see "skip_unchanged" and "incremental").
 
         Raises:
             Exception: If there's an error during the update process.
@@ -120,7 +161,21 @@ class Dataset:
         Notes:
             - The method requires appropriate permissions to update a dataset's datasource.
             - The new datasource will automatically be ingested
-            - All opened files will be closed after the update process.
+            - The files are streamed from disk, so the memory footprint does not grow with the file size.
+              All opened files will be closed after the update process.
+            - When sharding, "source_files" of the datasource definition is rewritten to list the shards. 
+              See 'Workspace.create_dataset' for details.
+            - The Parquet conversion requires the optional 'pyarrow' package and rewrites "read_format" and "read_options"
+              of the datasource definition. See 'Workspace.create_dataset' for details.
+            - With "skip_unchanged", the SHA-256 hashes of the source files are computed by reading them chunk by chunk.
+              They are only written to the manifest after a successful update. A skipped update returns the dataset unchanged with 
+              `.update_skipped` set to True.
+            - The incremental mode is meant for append-only files. It stores the uploaded byte offset, line count and a hash of the 
+              uploaded part of every file in the manifest. The appended lines are sent as new source files with "write_type" set to 
+              "DELTA", so the definition needs an "id_column". Files without appended lines are left out. If the uploaded part of any 
+              file changed, all files are uploaded completely with "write_type" "DEFAULT", replacing the dataset. 
+              An update without appended lines is skipped. The mode can not be combined with "shards" or "convert_to".
+            - The compression streams the source files through the codec while they are sent. See 'Workspace.create_dataset' for details.
 
         Example:
             ```python
@@ -132,22 +187,31 @@ class Dataset:
                 print(e)
             ```
         """
-        self._update_datasource(self.workspace, self.id, datasource_definition, file_paths)
+        manifest = UploadManifest(manifest_path) if skip_unchanged or incremental else None
+        if self._update_datasource(self.workspace, self.id, datasource_definition, file_paths, progress_callback, shards, convert_to, validate, manifest, incremental, compression) is False:
+            # Nothing changed since the last update, so there is nothing to refresh either
+            self.update_skipped = True
+            return self
         # Update the content of our dataset to avoid inconsistencies
         self.content = self._get_dataset_json(self.workspace, self.id)
+        self.update_skipped = False
         return self
 
-    def publish(self, index=False, with_thread=True, profile=False) -> bool:
+    def publish(self, index=False, with_thread=True, profile=False, return_job: bool = False) -> bool | Job:
         """
         Publishes the current dataset.
 
         Args:
             index (bool, optional): If set to True, the dataset will be indexed. Defaults to False.
-            with_thread (bool, optional): If set to True, the publishing will be threaded. Defaults to True.
+            with_thread (bool, optional): If set to True, the server publishes the dataset in the background and the request 
+                returns immediately. If set to False, the request only returns once the server is done. Defaults to True.
             profile (bool, optional): If set to True, the dataset profiling will be started for the dataset. Defaults to False.
+            return_job (bool, optional): If set to True, a Job that follows the publish process is returned. Defaults to False.
 
         Returns:
-            bool: True if the dataset was successfully published
+            bool: True if the publish request was accepted. 
+            Job: With "return_job", a handle for the publish process instead. `.wait()` returns the refreshed dataset once it 
+            is published and, if requested, indexed and profiled. `.progress` shows which of these steps are finished.
 
         Raises:
             Exception: If there's an error during the publish process.
@@ -159,19 +223,40 @@ class Dataset:
         Notes:
             - Ensure that the dataset is in a state that can be published before calling this method.
             - The method requires appropriate permissions to publish a dataset.
+            - See 'ingest' for how a returned job is watched. Many datasets can be published concurrently by starting all 
+              of them first and waiting for the handles afterwards.
+            - A job requires the server to report the "isPublished" flag in the dataset document, and the "isIndexed" and 
+              "isProfiled" flags for the requested steps, otherwise it fails with an Exception. A flag that was already set 
+              before publishing only counts once "lastUpdatedOn" of the dataset has changed.
 
         Example:
         ```python
-        dataset = workspace.get_all_datasets()[0]
+        datasets = workspace.get_all_datasets()
         try:
-            is_published = dataset.publish()
-            if is_published is True:
-                print("Dataset published successfully.")
+            jobs = [dataset.publish(index=True, return_job=True) for dataset in datasets]
+            for job in jobs:
+                job.wait(timeout=600)
+            print("Datasets published successfully.")
         except Exception as e:
             print(e)
         ```
         """
-        return self._publish_dataset(self.workspace, self.id, index, with_thread, profile)
+        if not return_job:
+            return self._publish_dataset(self.workspace, self.id, index, with_thread, profile)
+
+        # The state before the request tells a finished step of this publish apart from one of an earlier publish
+        snapshot = self._get_publish_snapshot(self._get_dataset_json(self.workspace, self.id))
+        response = self._publish_dataset(self.workspace, self.id, index, with_thread, profile)
+
+        # Track every requested step of the publish process
+        progress = {"published": False}
+        if index:
+            progress["indexed"] = False
+        if profile:
+            progress["profiled"] = False
+        poll_state = {}
+        return Job(f"publish {self.id}", lambda: self._poll_publish_state(progress, snapshot, poll_state), self.connection.jobs, 
+                   response, progress=progress)
 
     def delete(self) -> bool:
         """
@@ -204,12 +289,18 @@ class Dataset:
         """
         return self._delete_dataset(self.workspace, self.id)
     
-    def ingest(self) -> dict:
+    def ingest(self, return_job: bool = False) -> dict | Job:
         """
         Initiates the ingestion process for the current dataset.
 
+        Args:
+            return_job (bool, optional): If set to True, a Job that follows the ingestion is returned. Defaults to False.
+
         Returns:
             dict: A dictionary containing details about the ingestion process.
+            Job: With "return_job", a handle for the ingestion process instead. `.wait(timeout)` blocks until the ingestion 
+            has finished and returns the refreshed dataset, `.done()` checks it without blocking and the handle can be awaited 
+            in asyncio code. `.response` holds the details returned when the ingestion was started.
 
         Raises:
             Exception: If there's an error with starting the ingestion process
@@ -221,18 +312,36 @@ class Dataset:
         Notes:
             - Ensure that you have the required permissions to start the ingestion process.
             - The ingestion process might take some time to complete, depending on the size and complexity of the dataset. 
+            - All jobs of a connection are polled by one background thread. The time between two polls of a job grows from 
+              1 to 30 seconds while it is running, so many jobs can be watched with a few requests per second.
+            - A job requires the server to list the ingestion records in the dataset document, as "datasource.ingestions" with 
+              the "revision" and "state" of every record. The record of the "currentRevision" returned when the ingestion was 
+              started is followed, or the first new record if no revision is returned. A job without these records fails.
+              A failed ingestion raises an Exception in `.wait()`. A failed request while polling is retried, five failures 
+              in a row end the job with an Exception.
 
         Example:
         ```python
         dataset = workspace.get_all_datasets()[0]
         try:
-            ingestion_info = dataset.ingest()
-            print(ingestion_info["currentRevision"])
+            job = dataset.ingest(return_job=True)
+            print(job.response["currentRevision"])
+            dataset = job.wait(timeout=3600)
         except Exception as e:
             print(e)
         ```
         """
-        return self._ingest_dataset(self.workspace,self.id)
+        if not return_job:
+            return self._ingest_dataset(self.workspace, self.id)
+
+        # The ingestion records that exist before the request are not part of this ingestion
+        datasource = self._get_dataset_json(self.workspace, self.id).get("datasource") or {}
+        previous_count = len(datasource.get("ingestions") or [])
+        response = self._ingest_dataset(self.workspace, self.id)
+        target_revision = response.get("currentRevision") if isinstance(response, dict) else None
+        poll_state = {}
+        return Job(f"ingest {self.id}", lambda: self._poll_ingestion_state(target_revision, previous_count, poll_state), 
+                   self.connection.jobs, response)
     
     def start_profiling(self, dataset_version="CURRENT REVISION") -> bool:
         """
@@ -575,20 +684,60 @@ class Dataset:
         """
         files_info = self._get_all_schema_files_json(self.workspace, self.id)
         return [File(self.connection, self.workspace, self.id, file_info["id"]) for file_info in files_info]
+
+    #--------------------------------------------------------------
+    def download_all(self, dest: str = "./", max_workers: int = 4, skip_existing: bool = True, progress_callback=None) -> list:
+        """
+        Downloads all files of the current unstructured dataset concurrently into a directory.
+
+        Args:
+            dest (str, optional): The directory the files are saved to. It is created if needed. Defaults to the current directory.
+            max_workers (int, optional): The maximum number of downloads at the same time. Defaults to 4.
+            skip_existing (bool, optional): If True, files that already exist in "dest" with the size reported by the server
+                are not downloaded again. Defaults to True.
+            progress_callback (callable, optional): Called with (finished_files, total_files, result) after every file.
+
+        Returns:
+            list[BulkResult]: One result per file, ordered like the files of the dataset. "value" holds the local path.
+
+        Description:
+            The files are listed with a single request for the dataset, instead of one request per File object as in
+            'get_all_files'. Every file is streamed to disk and interrupted downloads are resumed, see 'File.download'.
+            The aggregate throughput is logged at the info level. A failing file does not stop the other downloads,
+            check "ok" of the results.
+
+        Notes:
+            - Only the last part of the file names sent by the server is used, so every file is saved directly in "dest".
+
+        Example:
+        ```python
+        results = dataset.download_all("./images", max_workers=8)
+        failed = [result.key for result in results if not result.ok]
+        ```
+        """
+        files_info = self._get_all_schema_files_json(self.workspace, self.id)
+        plans = _plan_file_downloads(self.workspace, self.id, files_info, dest)
+        return _download_files(self.connection, plans, max_workers, skip_existing, progress_callback)
     
 
     ##############################
     # Advanced Dataset Interface #
     ##############################
-    def get_logs(self) -> List[str]:
+    def get_logs(self, newest: int = None, versions: tuple = None, since=None, until=None, keys=None, records: bool = False) -> List[str]:
         """
             Retrieves the logs associated with the dataset.
 
             Args:
-                None
+                newest (int, optional): Only the newest N matching log entries are returned.
+                versions (tuple, optional): An inclusive (first, last) range of versions. Either bound may be None.
+                since (str or datetime, optional): Only log entries at or after this time are returned.
+                until (str or datetime, optional): Only log entries before this time are returned.
+                keys (list, optional): Only log entries that changed at least one of these keys are returned.
+                records (bool, optional): If True, the entries are returned as DatasetLogRecords instead of formatted strings. Defaults to False.
 
             Returns:
-                List[str]: A list of formatted logs for the dataset. Each log is represented as a string detailing the changes, creation date, user, and description.
+                List[str]: The matching log entries, the oldest first. Each log is represented as a string detailing the changes, creation date, user, and description.
+                List[DatasetLogRecord]: If records is True. Each record holds the version, creation date, user, description and changes of the entry.
 
             Raises:
                 Exception: If there's an error during the logs retrieval process.
@@ -596,6 +745,7 @@ class Dataset:
             Description:
                 This method fetches the logs associated with the dataset by sending a GET request to the '/api/v1/workspaces/{workspace_id}/datasets/{dataset_id}/logs' endpoint. 
                 Each log entry provides details about the changes made, the date of the change, the user responsible for the change, and a description.
+                The filters are applied to the entries as sent by the server, so only the matching entries are turned into records.
 
             Example:
             ```python
@@ -604,11 +754,16 @@ class Dataset:
                 logs = dataset.get_logs()
                 for log in logs:
                     print(log)
+
+                # Only the latest change of the title
+                latest = dataset.get_logs(newest=1, keys=["title"], records=True)
             except Exception as e:
                 print(e)
             ```
         """
-        return self._get_dataset_logs(self.workspace, self.id)
+        logs = self._get_dataset_logs(self.workspace, self.id)
+        selected = filter_dataset_logs(logs, newest, versions, since, until, keys)
+        return selected if records else [str(record) for record in selected]
     
     def update_continuation_timer(self, timer: List[str]) -> bool:
         """
@@ -1128,6 +1283,10 @@ class Dataset:
         Description:
             This method allows users to execute SQL-like queries on the source data of the dataset. The result of the query is returned as a dictionary containing the headers (column names) and the body (matching rows).
 
+        Notes:
+            - Each call checks out a query session id from the connection's session pool. Calls from multiple threads
+              are therefore executed in parallel by the server, up to the configured pool size.
+
         Example:
         ```python
         dataset = workspace.get_all_datasets()[0]
@@ -1153,6 +1312,79 @@ class Dataset:
             raise Exception(f"Failed to fetch Dataset '{dataset_id}'. Set the logger level to \"Error\" or below to get more detailed information.")
 
         return response
+
+    #--------------------------------------------------------------
+    def _poll_ingestion_state(self, target_revision, previous_count, poll_state):
+        # Polled by the job returned from "ingest". Returns a (done, value) tuple.
+        content = self._get_polled_dataset_json(poll_state)
+        if content is None:
+            return False, None
+        datasource = content.get("datasource") or {}
+
+        if "ingestions" not in datasource:
+            raise Exception(f"The state of the ingestion of the Dataset '{self.id}' can not be followed, because the server does not report ingestion records.")
+
+        # Only the records of the started ingestion count, older ones may still be listed after it
+        ingestions = datasource.get("ingestions") or []
+        if target_revision is not None:
+            ingestions = [ingestion for ingestion in ingestions if ingestion.get("revision") == target_revision]
+        else:
+            ingestions = ingestions[previous_count:]
+        if not ingestions:
+            return False, None
+
+        ingestion = ingestions[-1]
+        state = str(ingestion.get("state", "")).upper()
+        if state in ("FAILED", "ERROR"):
+            raise Exception(f"The ingestion of the Dataset '{self.id}' failed: {ingestion.get('error', 'no details given')}")
+        if state not in ("FINISHED", "SUCCESS", "DONE"):
+            return False, None
+
+        self.content = content
+        return True, self
+
+    #--------------------------------------------------------------
+    def _get_polled_dataset_json(self, poll_state, max_errors=5):
+        # A failed request while polling is retried with the next poll, only "max_errors" failures in a row end the job
+        try:
+            content = self._get_dataset_json(self.workspace, self.id)
+        except Exception:
+            poll_state["errors"] = poll_state.get("errors", 0) + 1
+            if poll_state["errors"] >= max_errors:
+                raise Exception(f"The state of the Dataset '{self.id}' could not be fetched {max_errors} times in a row. Set the logger level to \"Error\" or below to get more detailed information.")
+            return None
+        poll_state["errors"] = 0
+        return content
+
+    #--------------------------------------------------------------
+    def _poll_publish_state(self, progress, snapshot, poll_state):
+        # Polled by the job returned from "publish". Updates "progress" and returns a (done, value) tuple.
+        content = self._get_polled_dataset_json(poll_state)
+        if content is None:
+            return False, None
+
+        # A step is finished once its flag is set. A flag that was already set before the request only counts
+        # once the dataset has been updated since, otherwise a republish would be finished with the first poll.
+        current = self._get_publish_snapshot(content)
+        missing = [flag for step, flag in _PUBLISH_FLAGS.items() if step in progress and flag not in content]
+        if missing:
+            raise Exception(f"The publish process of the Dataset '{self.id}' can not be followed, because the server does not report {', '.join(missing)}.")
+
+        updated = current["updated"] is not None and current["updated"] != snapshot["updated"]
+        for step in progress:
+            flag = current["flags"][step]
+            progress[step] = flag is True and (snapshot["flags"][step] is not True or updated)
+
+        if not all(progress.values()):
+            return False, None
+        self.content = content
+        return True, self
+
+    #--------------------------------------------------------------
+    def _get_publish_snapshot(self, content):
+        # The flags of the publish steps and the time of the last update of a dataset document
+        return {"flags": {step: content.get(flag) for step, flag in _PUBLISH_FLAGS.items()},
+                "updated": content.get("lastUpdatedOn", content.get("last_updated_on"))}
     
     #--------------------------------------------------------------
     def _update_dataset(self, workspace_id, dataset_id, title, description, author, longitude, 
@@ -1204,7 +1436,7 @@ class Dataset:
         return response
     
     #--------------------------------------------------------------
-    def _update_datasource(self, workspace_id, dataset_id, datasource_definition, file_paths):
+    def _update_datasource(self, workspace_id, dataset_id, datasource_definition, file_paths, progress_callback=None, shards=None, convert_to=None, validate=False, manifest=None, incremental=False, compression=None):
         resource_path = f"/api/v1/workspaces/{workspace_id}/datasets/{dataset_id}/update-datasource"
 
         # Check if the datasource definition is a file path. 
@@ -1217,58 +1449,70 @@ class Dataset:
                 self.logger.error(f"Datasource definition file not found: {datasource_definition}")
                 return None
 
-        # Create the payload with the datasource definition as a json-object and the title of the dataset
-        payload = {
-            "datasource_definition": json.dumps(datasource_definition)
-        }
-
-        # Check if "file_paths" are either a str (= Single file) or a dictionary (= Multiple files)
-        # If we got a single file_path
-        if isinstance(file_paths, str):
-            file_name = os.path.basename(file_paths)
-            # If it is a valid path, open the file and add it to "files"
-            if os.path.exists(file_paths):
-                files = {self.connection._remove_file_extension(file_name): (file_name, open(file_paths, 'rb'), "application/vnd.ms-excel")}
-            else:
-                self.logger.error(f"Datasource File not found: {file_paths}")
-                return None
-        
-        # If we got a dictionary with multiple file_paths
-        elif isinstance(file_paths, dict):
-            # Open every single file inside "file_paths" and add it to "files"
-            for key, path in file_paths.items():
-                file_name = os.path.basename(path)
-                # If it is a valid path, open the file and add it to "files"
-                if os.path.exists(path):
-                    files[self.connection._remove_file_extension(file_name)] = (file_name, open(path, 'rb'), "application/vnd.ms-excel")
-                else:
-                    self.logger.error(f"Datasource File not found: {path}")
-                    return None
+        # Fail fast, before a broken definition burns a whole ingestion run on the server
+        if validate:
+            validate_datasource_definition(datasource_definition, file_paths)
 
-        # Throw error if we do not get a dict or str as "file_paths"
-        else:
-            self.logger.error(f"Invalid type for files_pats: {type(file_paths)}")
+        # Collect the source files. They are streamed from disk while the request is sent.
+        files = self.connection._collect_upload_files(file_paths)
+        if files is None:
             return None
 
-        response = self.connection._put_resource(resource_path, data=payload, files=files)
-
-        # Close all opened files
-        for file_tuple in files.values():
-            file_obj = file_tuple[1]  # Get the file object from the tuple
-            file_obj.close()
+        if incremental and ((shards is not None and shards > 1) or convert_to is not None):
+            raise Exception("Incremental uploads can not be combined with sharding or a conversion of the source files.")
+
+        # Compare the hashes of this update with the ones stored for the last update of the dataset
+        manifest_key = self.connection.base_url + resource_path
+        if manifest is not None and not incremental:
+            fingerprint = {
+                "definition": hash_json(datasource_definition),
+                "options": {"shards": shards, "convert_to": convert_to, "compression": compression},
+                "files": {key: hash_file(file_path) for key, (_, file_path, _) in files.items()}
+            }
+            if manifest.get(manifest_key) == fingerprint:
+                self.logger.info(f"The Datasource for '{dataset_id}' is unchanged since the last update. Skipping upload and ingestion.")
+                return False
+
+        # Replace the source files by the lines appended since the last incremental update
+        if incremental:
+            manifest_key += "#incremental"
+            previous_states = manifest.get(manifest_key) or {}
+            datasource_definition, files, fingerprint = plan_incremental_upload(datasource_definition, files, previous_states)
+            if previous_states and datasource_definition["write_type"] == "DEFAULT":
+                self.logger.warning(f"The already uploaded part of the source files of '{dataset_id}' has changed. Uploading all files again and replacing the dataset.")
+            if not files:
+                self.logger.info(f"No lines were appended to the Datasource for '{dataset_id}' since the last update. Skipping upload and ingestion.")
+                return False
+
+        # Prepared files (e.g. converted ones) only live until the upload is done
+        with tempfile.TemporaryDirectory(prefix="sedarapi-") as work_dir:
+            # Apply the requested local preparation (e.g. sharding), which may rewrite the datasource definition
+            datasource_definition, files = prepare_upload(datasource_definition, files, work_dir, shards, convert_to, compression)
+
+            # Create the payload with the datasource definition as a json-object
+            payload = {
+                "datasource_definition": json.dumps(datasource_definition)
+            }
+
+            response = self.connection._upload_resource("PUT", resource_path, data=payload, files=files, progress_callback=progress_callback)
 
         if response is None:
             raise Exception(f"The Datasource for Dataset '{dataset_id}' could not be updated. Set the logger level to \"Error\" or below to get more detailed information.")
 
         self.logger.info(f"The Datasource for '{dataset_id}' was updated successfully. Starting ingestion of the new version...")
-        return self._ingest_dataset(workspace_id, dataset_id)
+        response = self._ingest_dataset(workspace_id, dataset_id)
+
+        # Only remember the hashes once the new version was handed over to the ingestion
+        if manifest is not None:
+            manifest.set(manifest_key, fingerprint)
+        return response
     
     #--------------------------------------------------------------
     def _publish_dataset(self, workspace_id, dataset_id, index=False, with_thread=True, profile=False):
         resource_path = f"/api/v1/workspaces/{workspace_id}/datasets/{dataset_id}"
         payload = {
             "index": index,
-            "with_thrad": with_thread,
+            "with_thread": with_thread,
             "profile":profile
         }
 
@@ -1276,8 +1520,11 @@ class Dataset:
         if response is None:
             raise Exception(f"The Dataset '{dataset_id}' could not be published. Set the logger level to \"Error\" or below to get more detailed information.")
 
-        self.logger.info(f"The Dataset '{dataset_id}' was published successfully.")
-        return True
+        if with_thread:
+            self.logger.info(f"The publishing of the Dataset '{dataset_id}' was started successfully.")
+        else:
+            self.logger.info(f"The Dataset '{dataset_id}' was published successfully.")
+        return response
 
     #--------------------------------------------------------------
     def _delete_dataset(self, workspace_id, dataset_id):
@@ -1312,31 +1559,8 @@ class Dataset:
         if response is None:
             raise Exception(f"Failed to fetch Dataset logs for '{dataset_id}'. Set the logger level to \"Error\" or below to get more detailed information.")
 
-        # Initialize an empty list to store the formatted logs
-        formatted_response = []
-        
-        # Loop through each log entry in the logs
-        for log in response:
-            # Extract relevant information
-            changes = log['changes']
-            created_on = log['createdOn']
-            description = log['description']['en']  # Assuming English description
-            user_info = log['user']
-            version = log['version']
-            
-            # Create a formatted string for this log entry
-            formatted_log = f"Version: {version}, Created On: {created_on}, User: {user_info['username']}\n"
-            formatted_log += f"Description: {description}\n"
-            
-            # Add details about each change
-            for change in changes:
-                formatted_log += f"\tChanged '{change['key']}' from '{change['from']}' to '{change['to']}'\n"
-            
-            # Add this formatted log to the list
-            formatted_response.append(formatted_log)
-        
         self.logger.info(f"The Dataset logs for '{dataset_id}' were retrieved successfully.")
-        return formatted_response
+        return response
     
     #--------------------------------------------------------------
     def _update_continuation_timer(self, workspace_id, dataset_id, timer):
@@ -1583,12 +1807,14 @@ class Dataset:
     #--------------------------------------------------------------
     def _query_dataset_sourcedata(self, workspace_id, dataset_id, query):
         resource_path = f"/api/v1/workspaces/{workspace_id}/datasets/{dataset_id}/query"
-        payload = {
-            "session_id": self.connection.session_id,
-            "query": query
-        }
-        print("modified!")
-        response = self.connection._post_resource(resource_path, payload)
+
+        # Every concurrent query gets its own server side session, so they are not serialized by the server
+        with self.connection.query_sessions.checkout() as session_id:
+            payload = {
+                "session_id": session_id,
+                "query": query
+            }
+            response = self.connection._post_resource(resource_path, payload)
         if response is None:
             raise Exception(f"The query '{query}' for Dataset '{dataset_id}' could not be executed. Set the logger level to \"Error\" or below to get more detailed information.")
     
@@ -0,0 +1,373 @@
+# Import needed python modules
+import csv
+import json
+import os
+import re
+
+#--------------------------------------------------------------
+# Local helpers for datasource definitions
+#--------------------------------------------------------------
+_DELIMITERS = ",;\t|"
+_ID_COLUMN_PATTERN = re.compile(r"(^id$|_id$|^id_|identifier|^key$|_key$)", re.IGNORECASE)
+_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_TIMESTAMP_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?$")
+
+# Spark types ordered from the most specific to the most general one
+_TYPE_ORDER = ["BOOLEAN", "INT", "BIGINT", "DOUBLE", "DATE", "TIMESTAMP", "STRING"]
+
+#--------------------------------------------------------------
+def infer_datasource_definition(file_path: str, sample_rows: int = 1000, name: str = None) -> dict:
+    """
+    Infers a datasource definition with an explicit schema from a sample of a local CSV or JSON lines file.
+
+    Args:
+        file_path (str): The path of the local source file.
+        sample_rows (int, optional): The number of rows read to infer the definition. Defaults to 1000.
+        name (str, optional): The name of the dataset. Defaults to the file name without its extension.
+
+    Returns:
+        dict: A datasource definition, that can be passed to 'Workspace.create_dataset' together with the file.
+
+    Raises:
+        Exception: If the file does not exist or is empty.
+
+    Description:
+        Only the first "sample_rows" rows of the file are read. For CSV files the delimiter and the header are
+        detected, for every column the most specific Spark type that fits all sampled values is chosen.
+        The resulting schema is written as a DDL string to the "schema" read option and "inferSchema" is
+        disabled, so the ingestion can skip the additional scan over the whole file.
+        A column whose sampled values are all present and unique is proposed as "id_column", preferring
+        columns with an id-like name.
+
+    Notes:
+        - The definition is based on a sample. Values further down the file may not fit the inferred types,
+          consider 'validate_datasource_definition' and a larger sample for files with irregular content.
+        - For files without a header, the columns are named like Spark does ('_c0', '_c1', ...).
+
+    Example:
+        ```python
+        definition = infer_datasource_definition("username.csv")
+        dataset = workspace.create_dataset(definition, "username.csv")
+        ```
+    """
+    if not os.path.exists(file_path):
+        raise Exception(f"File not found: {file_path}")
+
+    lines = _read_sample_lines(file_path, sample_rows + 1)
+    if not lines:
+        raise Exception(f"The source file '{file_path}' is empty.")
+
+    if _looks_like_json_lines(lines):
+        read_format = "json"
+        columns, rows = _parse_json_lines_sample(lines)
+        read_options = {}
+    else:
+        read_format = "csv"
+        delimiter = _detect_delimiter(lines)
+        rows = list(csv.reader(lines, delimiter=delimiter))
+        has_header = _detect_header(lines, rows)
+        if has_header:
+            columns, rows = rows[0], rows[1:]
+        else:
+            columns = [f"_c{i}" for i in range(len(rows[0]))]
+        read_options = {
+            "delimiter": delimiter,
+            "header": "true" if has_header else "false"
+        }
+
+    rows = rows[:sample_rows]
+    types = [_infer_column_type(row[i] if i < len(row) else None for row in rows) for i in range(len(columns))]
+
+    read_options["inferSchema"] = "false"
+    read_options["schema"] = ", ".join(f"`{column}` {column_type}" for column, column_type in zip(columns, types))
+
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return {
+        "name": name or stem,
+        "read_format": read_format,
+        "read_options": read_options,
+        "write_type": "DEFAULT",
+        "read_type": "SOURCE_FILE",
+        "id_column": _propose_id_column(columns, types, rows),
+        "source_files": [stem]
+    }
+
+#--------------------------------------------------------------
+def validate_datasource_definition(datasource_definition, file_paths, sample_rows: int = 1000) -> bool:
+    """
+    Checks a datasource definition against a sample of the local source files before anything is uploaded.
+
+    Args:
+        datasource_definition (str or dict): It can be a path to a JSON file or a dictionary containing the definition.
+        file_paths (str or dict): Either a single path to a file (str) or a dictionary of datasource names to file paths,
+            exactly as passed to 'Workspace.create_dataset' or 'Dataset.update_datasource'.
+        sample_rows (int, optional): The number of rows parsed per source file. Defaults to 1000.
+
+    Returns:
+        bool: True if no problems were found.
+
+    Raises:
+        Exception: If the definition does not match the source files. The message lists every problem that was found.
+
+    Description:
+        This function parses a streamed sample of every source file with the "read_options" of the definition and checks that
+            - every entry of "source_files" has an uploaded file and every uploaded file is listed in "source_files",
+            - all sampled rows of a CSV file have the same number of fields, which catches a wrong delimiter,
+            - the sampled values fit an explicit "schema" read option, if one is given,
+            - the "id_column" exists and its sampled values are present and unique.
+        A failing ingestion on the server only shows up in the dataset logs after a whole Spark job, 
+        these checks fail within seconds on the client.
+
+    Notes:
+        - Only CSV and JSON lines files are parsed. For other read formats, only the file names are checked.
+        - The checks are based on a sample and can not guarantee a successful ingestion.
+
+    Example:
+        ```python
+        try:
+            validate_datasource_definition("csv_default.json", "username.csv")
+            dataset = workspace.create_dataset("csv_default.json", "username.csv")
+        except Exception as e:
+            print(e)
+        ```
+    """
+    if isinstance(datasource_definition, str):
+        if not os.path.exists(datasource_definition):
+            raise Exception(f"Datasource definition file not found: {datasource_definition}")
+        with open(datasource_definition, "r") as f:
+            datasource_definition = json.load(f)
+
+    if isinstance(file_paths, str):
+        file_paths = {os.path.splitext(os.path.basename(file_paths))[0]: file_paths}
+
+    problems = []
+    read_format = datasource_definition.get("read_format", "csv")
+    read_options = datasource_definition.get("read_options", {})
+    id_column = datasource_definition.get("id_column")
+    source_files = datasource_definition.get("source_files", [])
+
+    # The names in "source_files" have to match the names of the uploaded files
+    for source_file in source_files:
+        if source_file not in file_paths:
+            problems.append(f"The source file '{source_file}' is listed in 'source_files', but no file is uploaded with this name. Uploaded names: {sorted(file_paths)}")
+    for name in file_paths:
+        if name not in source_files:
+            problems.append(f"The file uploaded as '{name}' is not listed in 'source_files' {source_files}.")
+
+    schema = _parse_schema(read_options.get("schema"))
+
+    for name, path in file_paths.items():
+        if not os.path.exists(path):
+            problems.append(f"File not found: {path}")
+            continue
+        if read_format not in ("csv", "json"):
+            continue
+
+        lines = _read_sample_lines(path, sample_rows + 1)
+        if not lines:
+            problems.append(f"The source file '{path}' is empty.")
+            continue
+
+        if read_format == "json":
+            if not _looks_like_json_lines(lines):
+                problems.append(f"The source file '{path}' is not a JSON lines file, but the read format is 'json'.")
+                continue
+            columns, rows = _parse_json_lines_sample(lines)
+        else:
+            delimiter = read_options.get("delimiter", read_options.get("sep", ","))
+            rows = list(csv.reader(lines, delimiter=delimiter))
+            if str(read_options.get("header", "false")).lower() == "true":
+                columns, rows = rows[0], rows[1:]
+            else:
+                columns = [f"_c{i}" for i in range(len(rows[0]))]
+
+            if len(columns) == 1 and any(candidate in lines[0] for candidate in _DELIMITERS if candidate != delimiter):
+                problems.append(f"'{path}' has only one column with the delimiter '{delimiter}'. Detected delimiter: '{_detect_delimiter(lines)}'")
+            ragged_rows = [number for number, row in enumerate(rows, start=2) if len(row) != len(columns)]
+            if ragged_rows:
+                problems.append(f"'{path}' has rows with a different number of fields than the first row (line {ragged_rows[0]} and {len(ragged_rows) - 1} more).")
+
+        rows = rows[:sample_rows]
+
+        # Check the sampled values against an explicit schema
+        if schema is not None:
+            if len(schema) != len(columns):
+                problems.append(f"The schema has {len(schema)} columns, but '{path}' has {len(columns)}.")
+            for i, (column, column_type) in enumerate(schema):
+                for row in rows:
+                    value = row[i] if i < len(row) else None
+                    if value is not None and value.strip() != "" and not _fits_type(value, column_type):
+                        problems.append(f"The value '{value}' of column '{column}' in '{path}' does not fit the schema type {column_type}.")
+                        break
+            # Spark names the columns of a CSV file after the schema, not after the header
+            if read_format == "csv" and len(schema) == len(columns):
+                columns = [column for column, _ in schema]
+
+        # Check the id column
+        if id_column:
+            if id_column not in columns:
+                problems.append(f"The id_column '{id_column}' does not exist in '{path}'. Available columns: {columns}")
+            else:
+                index = columns.index(id_column)
+                values = [row[index] if index < len(row) else None for row in rows]
+                if any(value is None or value.strip() == "" for value in values):
+                    problems.append(f"The id_column '{id_column}' has empty values in '{path}'.")
+                elif len(set(values)) != len(values):
+                    problems.append(f"The id_column '{id_column}' is not unique in the sample of '{path}'.")
+
+    if problems:
+        raise Exception("The datasource definition does not match the source files:\n\t" + "\n\t".join(problems))
+
+    return True
+
+#--------------------------------------------------------------
+# Private helper functions
+#--------------------------------------------------------------
+def _read_sample_lines(file_path, max_lines):
+    # Read line by line, so only the sample is ever held in memory
+    lines = []
+    with open(file_path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        for line in f:
+            if line.strip():
+                lines.append(line)
+            if len(lines) >= max_lines:
+                break
+    return lines
+
+#--------------------------------------------------------------
+def _looks_like_json_lines(lines):
+    if not lines[0].lstrip().startswith("{"):
+        return False
+    try:
+        return isinstance(json.loads(lines[0]), dict)
+    except ValueError:
+        return False
+
+#--------------------------------------------------------------
+def _parse_json_lines_sample(lines):
+    columns = []
+    records = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            # The last line of the sample may be cut off
+            continue
+        for key in record:
+            if key not in columns:
+                columns.append(key)
+        records.append(record)
+
+    rows = [[_json_value_to_text(record.get(column)) for column in columns] for record in records]
+    return columns, rows
+
+#--------------------------------------------------------------
+def _json_value_to_text(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return str(value)
+
+#--------------------------------------------------------------
+def _detect_delimiter(lines):
+    sample = "".join(lines[:50])
+    try:
+        return csv.Sniffer().sniff(sample, delimiters=_DELIMITERS).delimiter
+    except csv.Error:
+        # Fall back to the candidate that appears most consistently in the first lines
+        counts = {delimiter: min(line.count(delimiter) for line in lines[:50]) for delimiter in _DELIMITERS}
+        return max(counts, key=counts.get) if max(counts.values()) > 0 else ","
+
+#--------------------------------------------------------------
+def _detect_header(lines, rows):
+    if len(rows) < 2:
+        return True
+    try:
+        return csv.Sniffer().has_header("".join(lines[:50]))
+    except csv.Error:
+        # A first row without any numeric value above numeric data is most likely a header
+        first_row_types = {_infer_column_type([value]) for value in rows[0]}
+        return first_row_types == {"STRING"}
+
+#--------------------------------------------------------------
+def _value_type(value):
+    text = value.strip()
+    if text.lower() in ("true", "false"):
+        return "BOOLEAN"
+    if re.fullmatch(r"[+-]?\d+", text):
+        return "INT" if -2**31 <= int(text) < 2**31 else "BIGINT"
+    try:
+        float(text)
+        return "DOUBLE"
+    except ValueError:
+        pass
+    if _DATE_PATTERN.match(text):
+        return "DATE"
+    if _TIMESTAMP_PATTERN.match(text):
+        return "TIMESTAMP"
+    return "STRING"
+
+#--------------------------------------------------------------
+def _merge_types(type_a, type_b):
+    if type_a is None or type_a == type_b:
+        return type_b
+    numeric = ("INT", "BIGINT", "DOUBLE")
+    if type_a in numeric and type_b in numeric:
+        return max(type_a, type_b, key=_TYPE_ORDER.index)
+    if {type_a, type_b} == {"DATE", "TIMESTAMP"}:
+        return "TIMESTAMP"
+    return "STRING"
+
+#--------------------------------------------------------------
+def _infer_column_type(values):
+    column_type = None
+    for value in values:
+        # Empty values are treated as null and fit any type
+        if value is None or value.strip() == "":
+            continue
+        column_type = _merge_types(column_type, _value_type(value))
+        if column_type == "STRING":
+            break
+    return column_type or "STRING"
+
+#--------------------------------------------------------------
+def _propose_id_column(columns, types, rows):
+    candidates = []
+    for i, column in enumerate(columns):
+        values = [row[i] if i < len(row) else None for row in rows]
+        if not values or any(value is None or value.strip() == "" for value in values):
+            continue
+        if len(set(values)) != len(values):
+            continue
+        candidates.append((not _ID_COLUMN_PATTERN.search(column), types[i] not in ("INT", "BIGINT"), i, column))
+
+    # Prefer id-like names, then integer columns, then the leftmost column
+    return min(candidates)[3] if candidates else None
+
+#--------------------------------------------------------------
+def _parse_schema(schema):
+    # Parses a DDL string like "`id` INT, name STRING" into a list of (column, type) tuples
+    if not schema:
+        return None
+    columns = []
+    for match in re.finditer(r"\s*(?:`([^`]+)`|([^\s,`]+))\s+([A-Za-z]+(?:\([^)]*\))?)\s*(?:,|$)", schema):
+        columns.append((match.group(1) or match.group(2), match.group(3).upper()))
+    return columns
+
+#--------------------------------------------------------------
+def _fits_type(value, column_type):
+    value_type = _value_type(value)
+    if column_type == "STRING" or column_type == value_type:
+        return True
+    if column_type not in _TYPE_ORDER:
+        # Types like DECIMAL(10,2) are not checked
+        return True
+    widening = {
+        "INT": ("BIGINT", "DOUBLE"),
+        "BIGINT": ("DOUBLE",),
+        "DATE": ("TIMESTAMP",)
+    }
+    return column_type in widening.get(value_type, ())
@@ -1,10 +1,14 @@
 # Import needed python modules
 from __future__ import annotations
 from typing import Type
+import os
+import time
 
 # Import needed SEDAR modules
 from .commons import Commons
 from .ontology import Annotation
+from .bulk import run_bulk
+from .upload import format_transfer_stats
 
 
 class File:
@@ -68,12 +72,18 @@ class File:
         return self._remove_file_annotation(self.workspace, self.dataset, self.id, annotation_id)
 
 
-    def download(self, file_path: str = "./") -> bool:
+    def download(self, file_path: str = "./", checksum: str = None, checksum_algorithm: str = "sha256", resume: bool = True, progress_callback=None) -> bool:
         """
         Downloads the file and saves it to the specified file path.
 
         Args:
-            file_path (str): The path where the ontology should be saved. By default the file is saved in the current directory. 
+            file_path (str): The path where the file should be saved. The file name is appended to it, so a directory has to end 
+                with a separator, e.g. "./downloads/". Otherwise it is used as a prefix of the file name. By default the file is saved 
+                in the current directory. 
+            checksum (str, optional): The expected hex digest of the file. If given, the download is verified before it is saved.
+            checksum_algorithm (str, optional): The hash algorithm of the checksum, as known to 'hashlib'. Defaults to "sha256".
+            resume (bool, optional): If True, the data of an earlier interrupted download is continued. Defaults to True.
+            progress_callback (callable, optional): Called with (bytes_written, total_bytes) while the file is downloaded.
 
         Returns:
             bool: `True` if the file was successfully downloaded and saved.
@@ -85,6 +95,15 @@ class File:
             This method downloads the file from the server using the API endpoint `/api/v1/workspaces/{workspace_id}/datasets/{dataset_id}/files/{file_id}` 
             and saves it to the specified file path.
 
+        Notes:
+            - The file is streamed to '{file_name}.part' in chunks and renamed once it is complete, so the memory footprint 
+              does not grow with the file size and an existing file is only replaced by a complete download.
+            - A dropped connection is continued from the last written byte with a HTTP Range request, up to 3 times. 
+              If the download still fails, the part file is kept and continued by the next call.
+            - A part file the server reports as complete (HTTP 416) is only taken if its size matches the size in the 
+              'Content-Range' header and, if given, the checksum matches. Otherwise it is downloaded again from the beginning.
+            - The directory of the file has to exist, otherwise an Exception is raised before anything is requested.
+
         Example:
             ```python
             ontology_instance = workspace.get_all_ontologies()[0]
@@ -99,7 +118,7 @@ class File:
             ```
 
         """
-        return self._download_file(self.workspace, self.dataset, self.id, self.name, file_path)
+        return self._download_file(self.workspace, self.dataset, self.id, self.name, file_path, checksum, checksum_algorithm, resume, progress_callback)
 
     #--------------------------------------------------------------
     #------------- Private methods (implementations) --------------
@@ -178,18 +197,64 @@ class File:
         return True
     
     #--------------------------------------------------------------
-    def _download_file(self, workspace_id, dataset_id, file_id, file_name, file_path):
+    def _download_file(self, workspace_id, dataset_id, file_id, file_name, file_path, checksum=None, checksum_algorithm="sha256", resume=True, progress_callback=None):
         resource_path = f"/api/v1/workspaces/{workspace_id}/datasets/{dataset_id}/files/{file_id}"
 
-        response = self.connection._get_resource(resource_path)
+        # Append the file-name itself to the path
+        file_path += _get_safe_file_name(file_name, file_id)
+
+        # Stream the contents into the specified file
+        response = self.connection._download_resource(resource_path, file_path, resume=resume, checksum=checksum, 
+                                                      checksum_algorithm=checksum_algorithm, progress_callback=progress_callback)
         if response is None:
             raise Exception(f"Failed to download the file '{file_id}'. Set the logger level to \"Error\" or below to get more detailed information.")
 
-        # Append the file-name itself to the path
-        file_path += file_name
-
-        # Open the file and write the contents into the specified file.
-        with open(file_path, 'wb') as f:
-            f.write(response)
+        return True
 
-        return True
\ No newline at end of file
+#--------------------------------------------------------------
+# Helpers for bulk downloads
+#--------------------------------------------------------------
+def _get_safe_file_name(file_name, fallback):
+    # File names are sent by the server, so any directory part is dropped to keep the file inside the target directory.
+    # Both separators are handled, as a name from a Windows client may contain backslashes.
+    file_name = os.path.basename(str(file_name or "").replace("\\", "/"))
+    return file_name if file_name not in ("", ".", "..") else str(fallback)
+
+#--------------------------------------------------------------
+def _plan_file_downloads(workspace_id, dataset_id, files_info, dest):
+    # Turns the file entries of a dataset schema into (name, resource_path, target_path, expected_size) tuples
+    plans = []
+    for file_info in files_info:
+        file_name = _get_safe_file_name(file_info.get("filename"), file_info["id"])
+        plans.append((file_name, f"/api/v1/workspaces/{workspace_id}/datasets/{dataset_id}/files/{file_info['id']}",
+                      os.path.join(dest, file_name), file_info.get("sizeInBytes")))
+    return plans
+
+#--------------------------------------------------------------
+def _download_files(connection, plans, max_workers=4, skip_existing=True, progress_callback=None):
+    # Downloads the planned files concurrently and logs the aggregate throughput. Returns one BulkResult per file,
+    # holding the target path as value.
+    downloaded_bytes = []
+
+    def download(plan):
+        name, resource_path, target_path, expected_size = plan
+        if skip_existing and expected_size is not None and os.path.exists(target_path) and os.path.getsize(target_path) == expected_size:
+            return target_path
+
+        os.makedirs(os.path.dirname(target_path) or ".", exist_ok=True)
+        if connection._download_resource(resource_path, target_path) is None:
+            raise Exception(f"Failed to download the file '{name}'. Set the logger level to \"Error\" or below to get more detailed information.")
+        downloaded_bytes.append(os.path.getsize(target_path))
+        return target_path
+
+    started = time.monotonic()
+    results = run_bulk(plans, download, max_workers, progress_callback=progress_callback, key=lambda plan: plan[2])
+    seconds = max(time.monotonic() - started, 1e-9)
+
+    failed = [result for result in results if not result.ok]
+    for result in failed:
+        connection.logger.error(f"The file '{result.key}' could not be downloaded: {str(result.error)}")
+    stats = {"bytes_sent": sum(downloaded_bytes), "seconds": seconds, "bytes_per_second": sum(downloaded_bytes) / seconds}
+    connection.logger.info(f"Downloaded {len(downloaded_bytes)} files, skipped {len(results) - len(downloaded_bytes) - len(failed)}, "
+                           f"{len(failed)} failed: {format_transfer_stats(stats)}")
+    return results
@@ -0,0 +1,215 @@
+# Import needed python modules
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+#--------------------------------------------------------------
+# Handles for long running server side jobs
+#--------------------------------------------------------------
+class Job:
+    """
+    A handle for a job that runs on the SEDAR server, e.g. an ingestion.
+
+    The job is watched by the 'JobWatcher' of the connection, which polls its state with an exponential backoff.
+    The handle can be waited for in a blocking way with 'wait', checked with 'done' or awaited in asyncio code.
+
+    Args:
+        name (str): A readable name of the job, used in log messages and errors.
+        poll (callable): Called without arguments to check the job. Returns a (done, value) tuple and raises an
+            Exception if the job failed.
+        watcher (JobWatcher): The watcher that polls the job.
+        response (optional): The response of the request that started the job.
+        progress (dict, optional): Details about the state of the job, updated by the poll function. Defaults to an empty dict.
+        initial_interval (float, optional): Seconds until the first poll. Defaults to 1.
+        max_interval (float, optional): The longest time between two polls. Defaults to 30.
+        backoff (float, optional): The factor the interval grows by after every poll. Defaults to 1.5.
+
+    Example:
+        ```python
+        job = dataset.ingest(return_job=True)
+        dataset = job.wait(timeout=600)
+
+        # or in asyncio code
+        dataset = await dataset.ingest(return_job=True)
+        ```
+    """
+    def __init__(self, name, poll, watcher, response=None, initial_interval=1.0, max_interval=30.0, backoff=1.5, progress=None):
+        self.name = name
+        self.response = response
+        self.progress = progress if progress is not None else {}
+        self.interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.polls = 0
+        self._poll = poll
+        self._value = None
+        self._error = None
+        self._finished = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+        watcher.watch(self)
+
+    #--------------------------------------------------------------
+    def done(self) -> bool:
+        """
+        Returns True if the job has finished, successfully or not.
+        """
+        return self._finished.is_set()
+
+    #--------------------------------------------------------------
+    def wait(self, timeout: float = None):
+        """
+        Blocks until the job has finished.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait. Waits forever by default.
+
+        Returns:
+            The value of the finished job, e.g. the refreshed Dataset.
+
+        Raises:
+            TimeoutError: If the job did not finish within the timeout.
+            Exception: If the job failed.
+        """
+        if not self._finished.wait(timeout):
+            raise TimeoutError(f"The job '{self.name}' did not finish within {timeout} seconds.")
+        return self._get_value()
+
+    #--------------------------------------------------------------
+    def cancel(self):
+        """
+        Stops watching the job. The job on the server is not affected. Waiting for the handle raises an Exception afterwards.
+        """
+        if not self.done():
+            self._finish(error=Exception(f"Watching the job '{self.name}' was cancelled."))
+
+    #--------------------------------------------------------------
+    def add_done_callback(self, callback):
+        """
+        Calls the callback with the job once it has finished. If it has finished already, the callback is called immediately.
+        """
+        with self._lock:
+            if not self.done():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+    #--------------------------------------------------------------
+    def __await__(self):
+        return self._wait_async().__await__()
+
+    #--------------------------------------------------------------
+    def __repr__(self):
+        state = "running" if not self.done() else ("failed" if self._error is not None else "done")
+        return f"Job({self.name!r}, {state}, polls={self.polls})"
+
+    #--------------------------------------------------------------
+    # Private helper methods
+    #--------------------------------------------------------------
+    async def _wait_async(self):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def resolve(_):
+            if not future.done():
+                future.set_result(None)
+
+        self.add_done_callback(lambda job: loop.call_soon_threadsafe(resolve, job))
+        await future
+        return self._get_value()
+
+    #--------------------------------------------------------------
+    def _get_value(self):
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+    #--------------------------------------------------------------
+    def _check(self):
+        # Called by the watcher. Returns True once the job has finished.
+        self.polls += 1
+        try:
+            finished, value = self._poll()
+        except Exception as e:
+            self._finish(error=e)
+            return True
+        if finished:
+            self._finish(value=value)
+            return True
+        self.interval = min(self.interval * self.backoff, self.max_interval)
+        return False
+
+    #--------------------------------------------------------------
+    def _finish(self, value=None, error=None):
+        with self._lock:
+            self._value = value
+            self._error = error
+            self._finished.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                logging.getLogger("SedarAPI-Logger").error(f"A callback of the job '{self.name}' failed: {str(e)}")
+
+
+#--------------------------------------------------------------
+class JobWatcher:
+    """
+    Polls the state of many jobs from a single background thread.
+
+    Every job is polled on its own schedule, which backs off exponentially while the job is running. All polls go
+    through one thread and are spaced by at least 1 / "max_requests_per_second" seconds, so hundreds of running jobs
+    only cause a handful of requests per second. The thread is started with the first job and ends when no job is left.
+
+    Args:
+        max_requests_per_second (float, optional): The upper bound of polls per second over all jobs. Defaults to 5.
+    """
+    def __init__(self, max_requests_per_second=5.0):
+        self.min_spacing = 1.0 / max_requests_per_second
+        self.logger = logging.getLogger("SedarAPI-Logger")
+        self._queue = []                # Heap of (next_poll, sequence, job) tuples
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    #--------------------------------------------------------------
+    def watch(self, job: Job):
+        """
+        Starts watching a job.
+        """
+        with self._condition:
+            heapq.heappush(self._queue, (time.monotonic() + job.interval, next(self._sequence), job))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sedarapi-job-watcher", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    #--------------------------------------------------------------
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if not self._queue:
+                        self._thread = None
+                        return
+                    delay = self._queue[0][0] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._condition.wait(delay)
+                _, _, job = heapq.heappop(self._queue)
+
+            # Cancelled jobs are simply dropped
+            if job.done():
+                continue
+            if not job._check():
+                with self._condition:
+                    heapq.heappush(self._queue, (time.monotonic() + job.interval, next(self._sequence), job))
+            elif job._error is not None:
+                self.logger.error(f"The job '{job.name}' failed: {str(job._error)}")
+
+            # Keep the overall request rate bounded
+            time.sleep(self.min_spacing)
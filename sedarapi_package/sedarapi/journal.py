@@ -0,0 +1,116 @@
+# Import needed python modules
+import json
+import sqlite3
+import threading
+import time
+
+#--------------------------------------------------------------
+# Durable journal for bulk operations
+#--------------------------------------------------------------
+PLANNED = "planned"
+STARTED = "started"
+FINISHED = "finished"
+FAILED = "failed"
+
+class JobJournal:
+    """
+    A SQLite file that records the state of every item of a bulk operation, so the operation can be resumed after a crash.
+
+    Every item goes through the states "planned", "started" and then "finished" or "failed". The state is committed
+    to disk before and after the call to the server, so after a crash an item is either known to be done, known to be
+    open, or "started" with an unknown outcome.
+
+    Args:
+        path (str): The path of the journal file. It is created if it does not exist.
+        operation (str): The name of the bulk operation. One file can hold the journals of several operations.
+
+    Example:
+        ```python
+        journal = JobJournal("onboarding.journal", "create datasets")
+        results = workspace.create_datasets_bulk("/data/onboarding", journal=journal)
+        ```
+    """
+    def __init__(self, path: str, operation: str = "default"):
+        self.path = path
+        self.operation = operation
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS journal (
+                    operation TEXT NOT NULL,
+                    item TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    updated REAL NOT NULL,
+                    PRIMARY KEY (operation, item)
+                )""")
+
+    #--------------------------------------------------------------
+    def get(self, item: str):
+        """
+        Returns the (state, result, error) tuple recorded for an item, or None if the item is not in the journal.
+        The result is decoded from JSON.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT state, result, error FROM journal WHERE operation = ? AND item = ?",
+                                           (self.operation, item)).fetchone()
+        if row is None:
+            return None
+        state, result, error = row
+        return state, json.loads(result) if result is not None else None, error
+
+    #--------------------------------------------------------------
+    def get_items(self, state: str = None) -> list:
+        """
+        Returns the names of all items of the operation, optionally only those in the given state.
+        """
+        query = "SELECT item FROM journal WHERE operation = ?"
+        parameters = [self.operation]
+        if state is not None:
+            query += " AND state = ?"
+            parameters.append(state)
+        with self._lock:
+            return [row[0] for row in self._connection.execute(query, parameters)]
+
+    #--------------------------------------------------------------
+    def plan(self, item: str):
+        """
+        Records an item as planned, unless it is in the journal already.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR IGNORE INTO journal (operation, item, state, updated) VALUES (?, ?, ?, ?)",
+                                     (self.operation, item, PLANNED, time.time()))
+
+    #--------------------------------------------------------------
+    def start(self, item: str):
+        """
+        Records that the call to the server for an item is about to be sent.
+        """
+        self._set(item, STARTED)
+
+    #--------------------------------------------------------------
+    def finish(self, item: str, result=None):
+        """
+        Records an item as finished together with its (JSON serializable) result.
+        """
+        self._set(item, FINISHED, result=json.dumps(result))
+
+    #--------------------------------------------------------------
+    def fail(self, item: str, error: Exception):
+        """
+        Records an item as failed together with its error message.
+        """
+        self._set(item, FAILED, error=str(error))
+
+    #--------------------------------------------------------------
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    #--------------------------------------------------------------
+    def _set(self, item, state, result=None, error=None):
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO journal (operation, item, state, result, error, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                                     (self.operation, item, state, result, error, time.time()))
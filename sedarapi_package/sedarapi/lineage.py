@@ -0,0 +1,103 @@
+# Import needed python modules
+from concurrent.futures import ThreadPoolExecutor
+
+#--------------------------------------------------------------
+# Helpers for the dataset lineage
+#--------------------------------------------------------------
+def _get_node_id(node):
+    attributes = node.get("attributes") or {}
+    return attributes.get("id", node.get("id"))
+
+#--------------------------------------------------------------
+def get_lineage_edges(lineage: dict) -> set:
+    """
+    Extracts all (parent_id, child_id) edges from a lineage tree as returned by 'Dataset.get_lineage'.
+    """
+    edges = set()
+    stack = [lineage]
+    while stack:
+        node = stack.pop()
+        for child in node.get("children") or []:
+            edges.add((_get_node_id(node), _get_node_id(child)))
+            stack.append(child)
+    return edges
+
+#--------------------------------------------------------------
+def build_downstream_graph(root_id: str, fetch_lineage, max_workers: int = 8) -> dict:
+    """
+    Collects every dataset downstream of a dataset, fetching the lineage of each dataset only once.
+
+    Args:
+        root_id (str): The id of the dataset to start from.
+        fetch_lineage (callable): Called with a dataset id, returns its lineage tree.
+        max_workers (int, optional): The maximum number of lineage requests at the same time. Defaults to 8.
+
+    Returns:
+        dict: Maps every dataset id of the graph, including the root, to the set of ids of its direct children.
+
+    Description:
+        The graph is explored breadth first. All datasets found in one round are fetched concurrently, so the number
+        of sequential round trips grows with the depth of the graph instead of the number of datasets.
+    """
+    children = {root_id: set()}
+    fetched = set()
+    frontier = [root_id]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while frontier:
+            for lineage in executor.map(fetch_lineage, frontier):
+                for parent_id, child_id in get_lineage_edges(lineage):
+                    children.setdefault(parent_id, set()).add(child_id)
+                    children.setdefault(child_id, set())
+            fetched.update(frontier)
+
+            # Every dataset that was seen but not fetched yet may have further children
+            frontier = [dataset_id for dataset_id in children if dataset_id not in fetched]
+    return children
+
+#--------------------------------------------------------------
+def get_topological_levels(children: dict, root_id: str) -> list:
+    """
+    Sorts the datasets downstream of a root into levels, so that every dataset comes after all of its parents.
+
+    Args:
+        children (dict): Maps dataset ids to the sets of ids of their direct children, see 'build_downstream_graph'.
+        root_id (str): The id of the root dataset. It is not part of the levels.
+
+    Returns:
+        list: A list of levels, each a sorted list of dataset ids. The datasets of one level do not depend on each other.
+
+    Raises:
+        Exception: If the lineage contains a cycle.
+    """
+    # Only the part of the graph that can be reached from the root is of interest
+    reachable = set()
+    stack = [root_id]
+    while stack:
+        for child_id in children.get(stack.pop(), ()):
+            if child_id not in reachable:
+                reachable.add(child_id)
+                stack.append(child_id)
+    reachable.discard(root_id)
+
+    parent_count = {dataset_id: 0 for dataset_id in reachable}
+    for parent_id in reachable:
+        for child_id in children.get(parent_id, ()):
+            if child_id in parent_count:
+                parent_count[child_id] += 1
+
+    levels = []
+    level = sorted(dataset_id for dataset_id, count in parent_count.items() if count == 0)
+    while level:
+        levels.append(level)
+        next_level = []
+        for parent_id in level:
+            for child_id in children.get(parent_id, ()):
+                if child_id in parent_count:
+                    parent_count[child_id] -= 1
+                    if parent_count[child_id] == 0:
+                        next_level.append(child_id)
+        level = sorted(next_level)
+
+    if sum(len(level) for level in levels) != len(reachable):
+        raise Exception("The lineage contains a cycle, the datasets can not be ordered.")
+    return levels
@@ -0,0 +1,483 @@
+# Import needed python modules
+from collections import deque
+import codecs
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+
+# Import needed SEDAR modules
+from .commons import _parse_time
+
+#--------------------------------------------------------------
+# Helpers for the server logs
+#--------------------------------------------------------------
+def iter_log_records(chunks):
+    """
+    Parses log records from a stream of byte chunks, keeping only the record that is currently parsed in memory.
+
+    Args:
+        chunks (iterable): The body of a log download in byte chunks.
+
+    Returns:
+        generator: The records in the order of the stream. The layout is detected from the first character:
+            - A JSON array ('[') yields its elements.
+            - JSON objects ('{'), one per line or simply concatenated, yield one dict each.
+            - Anything else is treated as plain text and yields one string per non-empty line.
+
+    Raises:
+        ValueError: If the stream ends within a JSON record.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    parser = json.JSONDecoder()
+    buffer = ""
+    layout = None
+    finished = False
+    chunks = iter(chunks)
+
+    while not finished:
+        chunk = next(chunks, None)
+        if chunk is None:
+            finished = True
+            buffer += decoder.decode(b"", final=True)
+        else:
+            buffer += decoder.decode(chunk)
+
+        position = 0
+        while True:
+            # Skip the whitespace and, within an array, the separators between records
+            while position < len(buffer) and (buffer[position].isspace() or (layout == "array" and buffer[position] in ",]")):
+                position += 1
+            if position >= len(buffer):
+                break
+
+            if layout is None:
+                layout = "array" if buffer[position] == "[" else "json" if buffer[position] == "{" else "text"
+                if layout == "array":
+                    position += 1
+                continue
+
+            if layout == "text":
+                end = buffer.find("\n", position)
+                if end == -1 and not finished:
+                    break
+                end = len(buffer) if end == -1 else end
+                yield buffer[position:end].rstrip("\r")
+                position = end + 1
+                continue
+
+            try:
+                record, end = parser.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if finished:
+                    raise ValueError("The log stream ended within a record.")
+                break
+
+            # A number or literal at the end of the buffer may continue in the next chunk
+            if end == len(buffer) and not finished and not isinstance(record, (dict, list, str)):
+                break
+            position = end
+            yield record
+
+        buffer = buffer[position:]
+
+
+#--------------------------------------------------------------
+# Following a growing log
+#--------------------------------------------------------------
+class LogCursor:
+    """
+    The position of a follower within a log file, see 'SedarAPI.follow_error_logs'.
+
+    The cursor is updated while the records are yielded. It can be kept and passed to a later call to continue
+    where the previous one stopped.
+
+    Attributes:
+        offset (int): The number of bytes of the log that have been read.
+        length (int): The number of bytes from the start of the last record to "offset".
+        hash (str): The sha1 hash of the last record, used to check that the log was not replaced.
+        time (str): The timestamp of the latest record as ISO string, if the records carry one.
+        initialized (bool): True once the log has been polled, even if it was empty. Only the first poll yields a backlog.
+    """
+    def __init__(self, offset=0, length=0, hash=None, time=None, initialized=False):
+        self.offset = offset
+        self.length = length
+        self.hash = hash
+        self.time = time
+        self.initialized = initialized or hash is not None
+
+    #--------------------------------------------------------------
+    def __repr__(self):
+        return f"LogCursor(offset={self.offset}, time={self.time!r}, hash={self.hash!r})"
+
+#--------------------------------------------------------------
+def follow_log(connection, resource_path, cursor=None, poll_interval=5.0, max_interval=60.0, backlog=10, sleep=time.sleep):
+    """
+    Polls a line based log file and yields every record that is appended to it. See 'SedarAPI.follow_error_logs'.
+    """
+    cursor = cursor if cursor is not None else LogCursor()
+    interval = poll_interval
+    while True:
+        new_records = 0
+        try:
+            for record in _poll_log(connection, resource_path, cursor, backlog if not cursor.initialized else None):
+                new_records += 1
+                yield record
+            cursor.initialized = True
+
+        # A log that can not be followed at all ends the follower, a failed request is tried again with the next poll
+        except ValueError:
+            raise
+        except Exception as e:
+            connection.logger.warning(f"The log {resource_path} could not be polled, it is tried again with the next poll: {str(e)}")
+
+        # Poll often while the log grows and back off while it is quiet
+        interval = poll_interval if new_records else min(interval * 1.5, max_interval)
+        sleep(interval)
+
+#--------------------------------------------------------------
+def _poll_log(connection, resource_path, cursor, backlog=None, since=None):
+    # Requests the log from the start of the last read record on. That record is compared with the cursor, so a
+    # replaced (e.g. rotated) log is noticed, and everything after it is new.
+    start = max(cursor.offset - cursor.length, 0)
+    response_info = {}
+    lines = _iter_lines(connection._stream_resource(resource_path, offset=start, response_info=response_info))
+    line = next(lines, None)
+
+    position = 0
+    if cursor.hash is not None:
+        # The server may ignore the Range header and send the whole log
+        if response_info.get("status") != 200:
+            position = start
+        while line is not None and position < start:
+            position += len(line)
+            line = next(lines, None)
+
+        if response_info.get("status") == 416 or line is None or position != start or _hash_line(line) != cursor.hash:
+            lines.close()
+            connection.logger.warning(f"The log {resource_path} has been replaced, it is followed from its beginning.")
+            since = cursor.time
+            cursor.offset, cursor.length, cursor.hash = 0, 0, None
+            yield from _poll_log(connection, resource_path, cursor, since=since)
+            return
+
+    elif line is not None and line.lstrip().startswith(b"["):
+        lines.close()
+        raise ValueError(f"The log {resource_path} is a JSON array, only line based logs can be followed.")
+
+    recent = deque(maxlen=backlog) if backlog is not None else None
+    while line is not None:
+        position += len(line)
+        if position - len(line) < start + cursor.length:
+            # The bytes of the last read record and the blank lines after it are known already
+            line = next(lines, None)
+            continue
+
+        if not line.strip():
+            cursor.offset, cursor.length = position, cursor.length + len(line)
+            line = next(lines, None)
+            continue
+
+        record = _parse_line(line)
+        record_time = _get_record_time(record)
+        cursor.offset, cursor.length, cursor.hash = position, len(line), _hash_line(line)
+        if record_time is not None and (cursor.time is None or record_time > cursor.time):
+            cursor.time = record_time
+
+        if since is None or record_time is None or record_time > since:
+            if recent is not None:
+                recent.append(record)
+            else:
+                yield record
+        line = next(lines, None)
+
+    if recent is not None:
+        yield from recent
+
+#--------------------------------------------------------------
+def _iter_lines(chunks):
+    # Yields the complete lines of a byte stream including their line break. An incomplete last line is dropped,
+    # it is read again by the next poll.
+    pending = b""
+    for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line + b"\n"
+
+#--------------------------------------------------------------
+def _hash_line(line):
+    return hashlib.sha1(line.rstrip(b"\r\n")).hexdigest()
+
+#--------------------------------------------------------------
+def _parse_line(line):
+    text = line.decode("utf-8", errors="replace").rstrip("\r\n")
+    if text.lstrip().startswith("{"):
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass
+    return text
+
+
+#--------------------------------------------------------------
+# Local store for the access logs
+#--------------------------------------------------------------
+# The names under which the fields of an access log record are looked up, in order of preference
+_FIELDS = {
+    "time": ("timestamp", "@timestamp", "time", "date", "datetime"),
+    "user": ("user", "username", "user_id", "email"),
+    "method": ("method", "http_method"),
+    "resource": ("resource", "path", "endpoint", "url", "route"),
+    "status": ("status", "status_code", "statusCode"),
+    "latency": ("latency", "duration", "response_time", "responseTime", "elapsed")
+}
+_DATASET_PATTERN = re.compile(r"/datasets/([^/?#]+)")
+
+def _get_field(record, name):
+    for field in _FIELDS[name]:
+        if record.get(field) is not None:
+            return record[field]
+    return None
+
+#--------------------------------------------------------------
+def _get_record_time(record):
+    # The timestamp of an access log record as ISO string in UTC without offset, or None if it has none.
+    # The strings are compared and stored as they are, so all of them have to use the same format.
+    time = _parse_time(_get_field(record, "time")) if isinstance(record, dict) else None
+    return time.replace(tzinfo=None).isoformat() if time is not None else None
+
+#--------------------------------------------------------------
+class AccessLogStore:
+    """
+    A local SQLite file holding the access log records of a SEDAR instance, for repeated usage analyses.
+
+    Every call of 'update' only adds the records that are new since the last update, so the analyses do not have to
+    start from the full log every time. The records are indexed by time, user, resource and dataset, and the store
+    offers aggregations like accesses per dataset and day or latency percentiles.
+
+    Args:
+        path (str): The path of the store file. It is created if it does not exist.
+
+    Example:
+        ```python
+        store = AccessLogStore("usage.db")
+        store.update(sedar)
+        print(store.get_top("dataset", limit=5, since="2024-01-01"))
+        print(store.get_latency_percentile(95))
+        ```
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS access_log (
+                    hash TEXT PRIMARY KEY,
+                    time TEXT,
+                    day TEXT,
+                    user TEXT,
+                    method TEXT,
+                    resource TEXT,
+                    dataset TEXT,
+                    status INTEGER,
+                    latency REAL,
+                    record TEXT NOT NULL
+                )""")
+            for column in ("time", "user", "resource", "dataset, day"):
+                self._connection.execute(f"CREATE INDEX IF NOT EXISTS access_log_{column.split(',')[0]} ON access_log ({column})")
+
+            # The position within the log file up to which the records are stored, see 'LogCursor'
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS access_log_cursor (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    offset INTEGER NOT NULL,
+                    length INTEGER NOT NULL,
+                    hash TEXT,
+                    time TEXT
+                )""")
+
+    #--------------------------------------------------------------
+    def update(self, sedar, batch_size: int = 1000) -> int:
+        """
+        Fetches the part of the access log that was appended since the last update and stores its records.
+
+        Args:
+            sedar (SedarAPI): The connected SedarAPI instance.
+            batch_size (int, optional): The number of records written in one transaction. Defaults to 1000.
+
+        Returns:
+            int: The number of added records.
+
+        Notes:
+            - The store keeps the byte offset within the log file and the hash of the last stored record. An update requests 
+              the log from the start of that record on with a HTTP Range request and only reads what follows it.
+            - If the record at the offset does not match the hash (e.g. the log was rotated), the log is read from its beginning
+              and only records newer than the latest stored one are added. See 'SedarAPI.follow_error_logs'.
+            - Logs that are sent as one JSON array have no line offsets. They are streamed completely and only the timestamp 
+              of older records is read.
+            - Records are identified by their content, so a record is never added twice.
+        """
+        cursor = self._get_cursor()
+        try:
+            added = self._store_records(_poll_log(sedar.connection, "/api/logs/access/download", cursor), batch_size, cursor)
+        except ValueError:
+            added = self._store_records(self._iter_newer_records(sedar.iter_access_logs()), batch_size)
+
+        sedar.logger.info(f"{added} new access log records have been stored in '{self.path}'.")
+        return added
+
+    #--------------------------------------------------------------
+    def get_latest_time(self):
+        """
+        Returns the timestamp of the latest stored record as ISO string, or None if the store is empty.
+        """
+        return self._query("SELECT MAX(time) FROM access_log")[0][0]
+
+    #--------------------------------------------------------------
+    def count_by_dataset_per_day(self, since: str = None, until: str = None) -> list:
+        """
+        Counts the accesses of every dataset per day.
+
+        Args:
+            since (str, optional): Only records at or after this ISO date or timestamp are counted.
+            until (str, optional): Only records before this ISO date or timestamp are counted.
+
+        Returns:
+            list: (day, dataset_id, count) tuples, ordered by day and then by descending count.
+        """
+        where, parameters = self._get_time_filter(since, until, "dataset IS NOT NULL")
+        return self._query(f"SELECT day, dataset, COUNT(*) FROM access_log {where} GROUP BY day, dataset ORDER BY day, COUNT(*) DESC", parameters)
+
+    #--------------------------------------------------------------
+    def get_top(self, column: str, limit: int = 10, since: str = None, until: str = None) -> list:
+        """
+        Returns the most frequent values of a column.
+
+        Args:
+            column (str): One of "dataset", "user", "resource", "method" or "status".
+            limit (int, optional): The number of returned values. Defaults to 10.
+            since (str, optional): Only records at or after this ISO date or timestamp are counted.
+            until (str, optional): Only records before this ISO date or timestamp are counted.
+
+        Returns:
+            list: (value, count) tuples, the most frequent value first.
+        """
+        if column not in ("dataset", "user", "resource", "method", "status"):
+            raise ValueError(f"The column '{column}' can not be aggregated.")
+        where, parameters = self._get_time_filter(since, until, f"{column} IS NOT NULL")
+        return self._query(f"SELECT {column}, COUNT(*) FROM access_log {where} GROUP BY {column} ORDER BY COUNT(*) DESC LIMIT ?", parameters + [limit])
+
+    #--------------------------------------------------------------
+    def get_latency_percentile(self, percentile: float = 95, resource: str = None, since: str = None, until: str = None):
+        """
+        Returns a percentile of the request latencies, if the log records contain them.
+
+        Args:
+            percentile (float, optional): The percentile between 0 and 100. Defaults to 95.
+            resource (str, optional): Only requests to this resource are taken into account.
+            since (str, optional): Only records at or after this ISO date or timestamp are taken into account.
+            until (str, optional): Only records before this ISO date or timestamp are taken into account.
+
+        Returns:
+            float: The latency in the unit of the log records, or None if no record has a latency.
+        """
+        where, parameters = self._get_time_filter(since, until, "latency IS NOT NULL")
+        if resource is not None:
+            where += " AND resource = ?"
+            parameters.append(resource)
+        count = self._query(f"SELECT COUNT(*) FROM access_log {where}", parameters)[0][0]
+        if count == 0:
+            return None
+        # Nearest rank method
+        offset = min(count - 1, max(0, math.ceil(percentile / 100 * count) - 1))
+        return self._query(f"SELECT latency FROM access_log {where} ORDER BY latency LIMIT 1 OFFSET ?", parameters + [offset])[0][0]
+
+    #--------------------------------------------------------------
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    #--------------------------------------------------------------
+    # Private helper methods
+    #--------------------------------------------------------------
+    def _store_records(self, records, batch_size, cursor=None):
+        # The cursor is advanced by the records generator, it is saved together with the records read up to it
+        added = 0
+        batch = []
+        for record in records:
+            batch.append(self._to_row(record))
+            if len(batch) >= batch_size:
+                added += self._insert(batch, cursor)
+                batch = []
+        return added + self._insert(batch, cursor)
+
+    #--------------------------------------------------------------
+    def _iter_newer_records(self, records):
+        # Only the timestamp is read from older records, they are neither serialized nor hashed
+        latest = self.get_latest_time()
+        for record in records:
+            if latest is not None:
+                record_time = _get_record_time(record)
+                if record_time is not None and record_time < latest:
+                    continue
+            yield record
+
+    #--------------------------------------------------------------
+    def _get_cursor(self):
+        row = self._query("SELECT offset, length, hash, time FROM access_log_cursor WHERE id = 0")
+        return LogCursor(*row[0]) if row else LogCursor()
+
+    #--------------------------------------------------------------
+    def _to_row(self, record):
+        raw = json.dumps(record, sort_keys=True, default=str)
+        fields = {name: _get_field(record, name) for name in _FIELDS} if isinstance(record, dict) else {}
+
+        time = _get_record_time(record)
+        resource = fields.get("resource")
+        dataset = _DATASET_PATTERN.search(str(resource)) if resource is not None else None
+        try:
+            status = int(fields["status"]) if fields.get("status") is not None else None
+        except (TypeError, ValueError):
+            status = None
+        try:
+            latency = float(fields["latency"]) if fields.get("latency") is not None else None
+        except (TypeError, ValueError):
+            latency = None
+
+        return (hashlib.sha1(raw.encode("utf-8")).hexdigest(), time, time[:10] if time else None,
+                str(fields["user"]) if fields.get("user") is not None else None, fields.get("method"),
+                str(resource) if resource is not None else None, dataset.group(1) if dataset else None, status, latency, raw)
+
+    #--------------------------------------------------------------
+    def _insert(self, rows, cursor=None):
+        if not rows and cursor is None:
+            return 0
+        with self._lock, self._connection:
+            before = self._connection.total_changes
+            self._connection.executemany("INSERT OR IGNORE INTO access_log VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            added = self._connection.total_changes - before
+            if cursor is not None:
+                self._connection.execute("INSERT OR REPLACE INTO access_log_cursor VALUES (0, ?, ?, ?, ?)",
+                                         (cursor.offset, cursor.length, cursor.hash, cursor.time))
+            return added
+
+    #--------------------------------------------------------------
+    def _query(self, query, parameters=()):
+        with self._lock:
+            return self._connection.execute(query, parameters).fetchall()
+
+    #--------------------------------------------------------------
+    def _get_time_filter(self, since, until, condition):
+        conditions, parameters = [condition], []
+        if since is not None:
+            conditions.append("time >= ?")
+            parameters.append(since)
+        if until is not None:
+            conditions.append("time < ?")
+            parameters.append(until)
+        return "WHERE " + " AND ".join(conditions), parameters
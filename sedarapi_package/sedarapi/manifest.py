@@ -0,0 +1,96 @@
+# Import needed python modules
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+#--------------------------------------------------------------
+# Local upload manifest
+#--------------------------------------------------------------
+DEFAULT_MANIFEST_PATH = os.path.join(os.path.expanduser("~"), ".sedarapi", "upload_manifest.json")
+
+class UploadManifest:
+    """
+    A small JSON file that remembers what was last uploaded for each dataset.
+
+    Args:
+        path (str, optional): The path of the manifest file. Defaults to '~/.sedarapi/upload_manifest.json'.
+
+    Notes:
+        - Every change is written to a temporary file first and then renamed, so an interrupted process never leaves
+          a half written manifest behind.
+        - The manifest can be shared between threads of one process. It is not locked against other processes.
+    """
+    _locks = {}
+    _locks_guard = threading.Lock()
+
+    def __init__(self, path: str = None):
+        self.path = os.path.abspath(path or DEFAULT_MANIFEST_PATH)
+        # All instances for the same file share one lock
+        with UploadManifest._locks_guard:
+            self._lock = UploadManifest._locks.setdefault(self.path, threading.Lock())
+
+    #--------------------------------------------------------------
+    def get(self, key: str) -> dict:
+        """
+        Returns the entry stored under the given key, or None if there is none.
+        """
+        with self._lock:
+            return self._load().get(key)
+
+    #--------------------------------------------------------------
+    def set(self, key: str, entry: dict):
+        """
+        Stores an entry under the given key and writes the manifest to disk.
+        """
+        with self._lock:
+            entries = self._load()
+            entries[key] = entry
+            self._save(entries)
+
+    #--------------------------------------------------------------
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    #--------------------------------------------------------------
+    def _save(self, entries):
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".manifest-")
+        try:
+            with os.fdopen(file_descriptor, "w") as f:
+                json.dump(entries, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+
+#--------------------------------------------------------------
+def hash_file(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Computes the SHA-256 hash of a file, reading it chunk by chunk.
+
+    Args:
+        file_path (str): The path of the file.
+        chunk_size (int, optional): The number of bytes read at once. Defaults to 1 MiB.
+
+    Returns:
+        str: The hex digest of the hash.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+#--------------------------------------------------------------
+def hash_json(value) -> str:
+    """
+    Computes a SHA-256 hash of a JSON serializable value, independent of the order of dictionary keys.
+    """
+    return hashlib.sha256(json.dumps(value, sort_keys=True).encode("utf-8")).hexdigest()
@@ -140,12 +140,18 @@ class Ontology:
         """
         return self._construct(self.workspace, querystring)
     
-    def download(self, file_path: str = "./") -> bool:
+    def download(self, file_path: str = "./", checksum: str = None, checksum_algorithm: str = "sha256", resume: bool = True, progress_callback=None) -> bool:
         """
         Downloads the ontology and saves it to the specified file path.
 
         Args:
-            file_path (str): The path where the ontology should be saved. By default the file is saved in the current directory. 
+            file_path (str): The path where the ontology should be saved. The file name is appended to it, so a directory has to end 
+                with a separator, e.g. "./downloads/". Otherwise it is used as a prefix of the file name. By default the file is saved 
+                in the current directory. 
+            checksum (str, optional): The expected hex digest of the ontology file. If given, the download is verified before it is saved.
+            checksum_algorithm (str, optional): The hash algorithm of the checksum, as known to 'hashlib'. Defaults to "sha256".
+            resume (bool, optional): If True, the data of an earlier interrupted download is continued. Defaults to True.
+            progress_callback (callable, optional): Called with (bytes_written, total_bytes) while the ontology is downloaded.
 
         Returns:
             bool: `True` if the ontology was successfully downloaded and saved.
@@ -157,6 +163,9 @@ class Ontology:
             This method downloads the ontology from the server using the API endpoint `/api/v1/workspaces/{workspace_id}/ontologies/{graph_id}/download` 
             and saves it to the specified file.
 
+        Notes:
+            - The ontology is streamed to disk and can be resumed after an interruption. See 'File.download' for details.
+
         Example:
             ```python
             ontology_instance = workspace.get_all_ontologies()[0]
@@ -171,7 +180,7 @@ class Ontology:
             ```
 
         """
-        return self._download_ontology(self.workspace, self.graph_id, file_path, self.filename)
+        return self._download_ontology(self.workspace, self.graph_id, file_path, self.filename, checksum, checksum_algorithm, resume, progress_callback)
 
     def get_all_annotations(self) -> List[Annotation]:
         """
@@ -258,19 +267,17 @@ class Ontology:
         return response
     
     #--------------------------------------------------------------
-    def _download_ontology(self, workspace_id, graph_id, file_path, file_name):
+    def _download_ontology(self, workspace_id, graph_id, file_path, file_name, checksum=None, checksum_algorithm="sha256", resume=True, progress_callback=None):
         resource_path = f"/api/v1/workspaces/{workspace_id}/ontologies/{graph_id}/download"
 
-        response = self.connection._get_resource(resource_path)
-        if response is None:
-            raise Exception("Failed to download the ontology. Set the logger level to \"Error\" or below to get more detailed information.")
-
         # Append the file name to the path
         file_path += file_name
 
-        # Open the file and write the contents into the specified file.
-        with open(file_path, 'wb') as f:
-            f.write(response)
+        # Stream the contents into the specified file
+        response = self.connection._download_resource(resource_path, file_path, resume=resume, checksum=checksum, 
+                                                      checksum_algorithm=checksum_algorithm, progress_callback=progress_callback)
+        if response is None:
+            raise Exception("Failed to download the ontology. Set the logger level to \"Error\" or below to get more detailed information.")
 
         return True
 
@@ -0,0 +1,153 @@
+# Import needed python modules
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+# Import needed SEDAR modules
+from .bulk import BulkResult
+
+#--------------------------------------------------------------
+# Multi stage pipelines for bulk operations
+#--------------------------------------------------------------
+class PipelineResult(BulkResult):
+    """
+    The outcome of one item of a pipeline.
+
+    Attributes:
+        stage (str): The name of the stage that failed, or None if all stages succeeded.
+        timings (dict): The seconds every finished stage took for this item, by stage name.
+        See 'BulkResult' for the other attributes. "seconds" is the time from the start of the first stage to the end of the last one.
+    """
+    def __init__(self, index, key, value=None, error=None, seconds=0.0, stage=None, timings=None):
+        super().__init__(index, key, value, error, seconds)
+        self.stage = stage
+        self.timings = timings or {}
+
+    #--------------------------------------------------------------
+    def __repr__(self):
+        state = "ok" if self.ok else f"error in {self.stage!r}={str(self.error)!r}"
+        return f"PipelineResult(index={self.index}, key={self.key!r}, {state}, seconds={self.seconds:.2f})"
+
+
+#--------------------------------------------------------------
+class Pipeline:
+    """
+    Runs a chain of operations for many items, with a separate concurrency limit for every stage.
+
+    Every stage has its own thread pool. As soon as an item leaves a stage it is handed to the next one, so different
+    items are processed by different stages at the same time, e.g. one dataset is indexed while the next one is ingested.
+
+    Args:
+        stages (list): The stages in order, as (name, func, max_workers) tuples. "func" is called with the output of the
+            previous stage (the input item for the first stage) and returns the input of the next one.
+        max_in_flight (int, optional): The maximum number of items inside the pipeline at the same time.
+            Defaults to the sum of the workers of all stages.
+
+    Example:
+        ```python
+        pipeline = Pipeline([
+            ("create", lambda spec: workspace.create_dataset(*spec), 4),
+            ("index", lambda dataset: dataset.create_index_data(), 8)
+        ])
+        results = pipeline.run(specs)
+        print(pipeline.get_stage_stats())
+        ```
+    """
+    def __init__(self, stages: list, max_in_flight: int = None):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage.")
+        for name, _, max_workers in stages:
+            if max_workers < 1:
+                raise ValueError(f"The stage '{name}' needs at least 1 worker.")
+        self.stages = list(stages)
+        self.max_in_flight = max_in_flight or sum(max_workers for _, _, max_workers in self.stages)
+        self._timings = {name: [] for name, _, _ in self.stages}
+        self._lock = threading.Lock()
+
+    #--------------------------------------------------------------
+    def run(self, items, stop_on_error: bool = False, progress_callback=None, key=None) -> list:
+        """
+        Runs all stages for every item.
+
+        Args:
+            items (iterable): The input items. The iterable is consumed lazily.
+            stop_on_error (bool, optional): If True, no new items enter the pipeline after the first failure.
+                Items that are already inside are finished. Defaults to False.
+            progress_callback (callable, optional): Called with (finished_items, total_items, result) after every item.
+                "total_items" is None if "items" has no length.
+            key (callable, optional): Returns the readable name of an item. Defaults to 'str'.
+
+        Returns:
+            list: One PipelineResult per started item, ordered like the input. "value" holds the output of the last stage.
+        """
+        total = len(items) if hasattr(items, "__len__") else None
+        key = key or str
+        results = []
+        stopped = threading.Event()
+        slots = threading.BoundedSemaphore(self.max_in_flight)
+        executors = [ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"sedarapi-{name}")
+                     for name, _, max_workers in self.stages]
+
+        def finish(result):
+            with self._lock:
+                results.append(result)
+                finished = len(results)
+            if not result.ok and stop_on_error:
+                stopped.set()
+            try:
+                if progress_callback is not None:
+                    progress_callback(finished, total, result)
+            finally:
+                slots.release()
+
+        def run_stage(position, result, value, pipeline_started):
+            name, func, _ = self.stages[position]
+            started = time.monotonic()
+            try:
+                value = func(value)
+            except Exception as e:
+                result.error, result.stage = e, name
+            seconds = time.monotonic() - started
+            result.timings[name] = seconds
+            with self._lock:
+                self._timings[name].append(seconds)
+
+            if result.ok and position + 1 < len(self.stages):
+                executors[position + 1].submit(run_stage, position + 1, result, value, pipeline_started)
+                return
+            if result.ok:
+                result.value = value
+            result.seconds = time.monotonic() - pipeline_started
+            finish(result)
+
+        try:
+            for index, item in enumerate(items):
+                slots.acquire()
+                if stopped.is_set():
+                    slots.release()
+                    break
+                executors[0].submit(run_stage, 0, PipelineResult(index, key(item)), item, time.monotonic())
+
+            # Wait until every admitted item left the pipeline
+            for _ in range(self.max_in_flight):
+                slots.acquire()
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=True)
+
+        return sorted(results, key=lambda result: result.index)
+
+    #--------------------------------------------------------------
+    def get_stage_stats(self) -> dict:
+        """
+        Returns the timings of every stage over all runs of the pipeline.
+
+        Returns:
+            dict: Per stage name a dictionary with the number of processed 'items' and the 'total', 'mean' and 'max' seconds.
+        """
+        with self._lock:
+            return {name: {"items": len(timings),
+                           "total": sum(timings),
+                           "mean": sum(timings) / len(timings) if timings else 0.0,
+                           "max": max(timings, default=0.0)}
+                    for name, timings in self._timings.items()}
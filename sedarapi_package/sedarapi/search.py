@@ -0,0 +1,100 @@
+# Import needed python modules
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+import time
+
+#--------------------------------------------------------------
+# Searches over several workspaces
+#--------------------------------------------------------------
+class SearchResults:
+    """
+    The merged outcome of a search over several workspaces, see 'SedarAPI.search_all'.
+
+    Attributes:
+        datasets (list): The found Datasets of all workspaces, in the merged ranking.
+        errors (dict): Maps the ids of the workspaces whose search failed or timed out to the Exception.
+        seconds (float): The wall clock time of the search.
+
+    Iterating over the results or taking their length refers to "datasets".
+    """
+    def __init__(self, datasets, errors, seconds):
+        self.datasets = datasets
+        self.errors = errors
+        self.seconds = seconds
+
+    #--------------------------------------------------------------
+    @property
+    def complete(self) -> bool:
+        """
+        True if the search succeeded in every workspace.
+        """
+        return not self.errors
+
+    #--------------------------------------------------------------
+    def __iter__(self):
+        return iter(self.datasets)
+
+    #--------------------------------------------------------------
+    def __len__(self):
+        return len(self.datasets)
+
+    #--------------------------------------------------------------
+    def __repr__(self):
+        return f"SearchResults({len(self.datasets)} datasets, {len(self.errors)} errors, seconds={self.seconds:.2f})"
+
+#--------------------------------------------------------------
+def _get_score(dataset):
+    for field in ("score", "_score"):
+        if isinstance(dataset.content.get(field), (int, float)):
+            return dataset.content[field]
+    return None
+
+#--------------------------------------------------------------
+def merge_ranked_results(results: list) -> list:
+    """
+    Merges the ranked hit lists of several workspaces into one ranking.
+
+    Args:
+        results (list): (workspace_title, datasets) tuples, every list of datasets in the order of the server.
+
+    Returns:
+        list: All datasets. If every hit carries a relevance score, they are ordered by it. Otherwise the lists are
+        interleaved by rank, so the best hit of every workspace comes before the second best of any. Ties are broken by
+        the workspace title and the dataset title, so the same hits always give the same order.
+    """
+    ranked = [(rank, workspace_title, dataset) for workspace_title, datasets in results for rank, dataset in enumerate(datasets)]
+    if ranked and all(_get_score(dataset) is not None for _, _, dataset in ranked):
+        ranked.sort(key=lambda entry: (-_get_score(entry[2]), entry[0], entry[1], entry[2].title or ""))
+    else:
+        ranked.sort(key=lambda entry: (entry[0], entry[1], entry[2].title or ""))
+    return [dataset for _, _, dataset in ranked]
+
+#--------------------------------------------------------------
+def search_workspaces(workspaces: list, search, max_workers: int = 4, timeout: float = None) -> SearchResults:
+    """
+    Runs a search in several workspaces concurrently and merges the results. See 'SedarAPI.search_all'.
+
+    Args:
+        workspaces (list): The Workspace objects to search in.
+        search (callable): Called with a Workspace, returns its list of found Datasets.
+        max_workers (int, optional): The maximum number of searches at the same time. Defaults to 4.
+        timeout (float, optional): Seconds after which the searches that are still running are given up.
+    """
+    started = time.monotonic()
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sedarapi-search")
+    futures = {executor.submit(search, workspace): workspace for workspace in workspaces}
+    _, running = wait(futures, timeout=timeout)
+
+    # Searches that are still running finish in the background, their results are dropped
+    executor.shutdown(wait=False)
+
+    results, errors = [], {}
+    for future, workspace in futures.items():
+        if future in running:
+            future.cancel()
+            errors[workspace.id] = TimeoutError(f"The search in workspace '{workspace.title}' did not finish within {timeout} seconds.")
+        elif future.exception() is not None:
+            errors[workspace.id] = future.exception()
+        else:
+            results.append((workspace.title or "", future.result()))
+    return SearchResults(merge_ranked_results(results), errors, time.monotonic() - started)
@@ -1,5 +1,4 @@
 # Import needed python modules
-import json
 import os
 from typing import Type
 from typing import List
@@ -9,18 +8,25 @@ from .commons import Commons
 from .user import User
 from .workspace import Workspace
 from .wiki import Wiki
+from .logs import iter_log_records
+from .logs import follow_log
+from .logs import LogCursor
+from .search import search_workspaces
+from .search import SearchResults
 
 #------------------------------------------------------------------
 #-------------------------- Main Class ----------------------------
 #------------------------------------------------------------------
 class SedarAPI:
     #--------------------------------------------------------------
-    def __init__(self, base_url):
+    def __init__(self, base_url, query_session_pool_size=4, query_session_idle_expiry=300):
         """
         Initializes an instance of the SedarAPI class.
 
         Args:
             base_url (str): The base URL of the SEDAR API.
+            query_session_pool_size (int, optional): The number of query sessions that can run concurrently. Defaults to 4.
+            query_session_idle_expiry (float, optional): Seconds after which an unused query session is replaced. Defaults to 300.
 
         Returns:
             None
@@ -34,12 +40,14 @@ class SedarAPI:
         Notes:
             - Please assign base_url with the complete url, including the "http://" part.
               See the example for more help.
+            - Source data queries (see 'Dataset.query_sourcedata') from multiple threads run in parallel,
+              up to 'query_session_pool_size' at a time.
 
         Example:
             base_url = "http://127.0.0.1:5000"
             sedar = SedarAPI(base_url)
         """
-        self.connection = Commons(base_url)
+        self.connection = Commons(base_url, query_session_pool_size, query_session_idle_expiry)
         self.logger = self.connection.logger
 
     #--------------------------------------------------------------
@@ -284,7 +292,7 @@ class SedarAPI:
         Retrieves the access logs from the SEDAR system.
 
         Args:
-            download_path (str, optional): The path where the logs should be downloaded and saved as a JSON file. If not provided, the logs are returned directly.
+            download_path (str, optional): The path where the logs should be saved. If not provided, the logs are returned directly.
 
         Returns:
             dict or bool: 
@@ -296,7 +304,9 @@ class SedarAPI:
             None
 
         Description:
-            This method fetches the access logs by sending a GET request to the '/api/logs/access' endpoint. If a download path is provided, the logs are saved as a JSON file at the specified location. 
+            This method fetches the access logs by sending a GET request to the '/api/logs/access' endpoint. If a download path is provided, 
+            the log file is streamed from the '/api/logs/access/download' endpoint to the specified location in chunks, so it is never held in memory.
+            To process large logs record by record, use 'iter_access_logs'.
 
         Notes:
             - If no logs are available, a warning is logged, indicating that no accesses have been logged yet.
@@ -310,19 +320,19 @@ class SedarAPI:
             # To save logs to a file
             sedar.get_access_logs(download_path="path/to/save/logs.json")
         """
+        # If a download path is given, the log file is streamed to disk
+        if download_path is not None:
+            os.makedirs(os.path.dirname(download_path) or ".", exist_ok=True)
+            if self.connection._download_resource("/api/logs/access/download", download_path) is None:
+                return self.logger.warning("There are currently no access logs available. Most likely no accesses have been logged yet.")
+            self.logger.info("Access logs downloaded successfully.")
+            return True
+
         resource_path = "/api/logs/access"
 
         response = self.connection._get_resource(resource_path)
         if response is None:
             return self.logger.warning("There are currently no access logs available. Most likely no accesses have been logged yet.")
-
-        # If a download path is given, the information is stored in a file
-        if download_path is not None:
-            os.makedirs(os.path.dirname(download_path), exist_ok=True)
-            with open(download_path, "w") as f:
-                json.dump(response, f)
-            self.logger.info("Access logs downloaded successfully.")
-            return True
             
         return response
     
@@ -332,7 +342,7 @@ class SedarAPI:
         Retrieves the error logs from the SEDAR system.
 
         Args:
-            download_path (str, optional): The path where the logs should be downloaded and saved as a JSON file. If not provided, the logs are returned directly.
+            download_path (str, optional): The path where the logs should be saved. If not provided, the logs are returned directly.
 
         Returns:
             dict or bool: 
@@ -344,7 +354,9 @@ class SedarAPI:
             None
 
         Description:
-            This method fetches the error logs by sending a GET request to the '/api/logs/error' endpoint. If a download path is provided, the logs are saved as a JSON file at the specified location. 
+            This method fetches the error logs by sending a GET request to the '/api/logs/error' endpoint. If a download path is provided, 
+            the log file is streamed from the '/api/logs/error/download' endpoint to the specified location in chunks, so it is never held in memory.
+            To process large logs record by record, use 'iter_error_logs'.
 
         Notes:
             - If no logs are available, a warning is logged, indicating that no errors have been logged yet.
@@ -358,21 +370,101 @@ class SedarAPI:
             # To save logs to a file
             sedar.get_error_logs(download_path="path/to/save/logs.json")
         """
+        # If a download path is given, the log file is streamed to disk
+        if download_path is not None:
+            os.makedirs(os.path.dirname(download_path) or ".", exist_ok=True)
+            if self.connection._download_resource("/api/logs/error/download", download_path) is None:
+                return self.logger.warning("There are currently no error logs available. Most likely no errors have been logged yet.")
+            self.logger.info("Error logs downloaded successfully.")
+            return True
+
         resource_path = "/api/logs/error"
 
         response = self.connection._get_resource(resource_path)
         if response is None:
-            return self.logger.warning("There are currently no access logs available. Most likely no accesses have been logged yet.")
-
-        # If a download path is given, the information is stored in a file
-        if download_path is not None:
-            os.makedirs(os.path.dirname(download_path), exist_ok=True)
-            with open(download_path, "w") as f:
-                json.dump(response, f)
-            self.logger.info("Access logs downloaded successfully.")
-            return True
+            return self.logger.warning("There are currently no error logs available. Most likely no errors have been logged yet.")
         
         return response
+
+    #--------------------------------------------------------------
+    def iter_access_logs(self):
+        """
+        Streams the access logs from the SEDAR system and yields them record by record.
+
+        Returns:
+            generator: The log records in the order of the log file. JSON records are yielded as dictionaries, 
+            plain text logs as one string per line.
+
+        Raises:
+            Exception: If the logs could not be retrieved.
+
+        Description:
+            This method streams the log file from the '/api/logs/access/download' endpoint. Only the record that is
+            currently parsed is held in memory, so logs of any size can be processed on the fly.
+
+        Example:
+            sedar = SedarAPI(base_url)
+            failed_logins = sum(1 for record in sedar.iter_access_logs() if "login" in str(record) and "401" in str(record))
+        """
+        return iter_log_records(self.connection._stream_resource("/api/logs/access/download"))
+
+    #--------------------------------------------------------------
+    def iter_error_logs(self):
+        """
+        Streams the error logs from the SEDAR system and yields them record by record.
+
+        Returns:
+            generator: The log records in the order of the log file. JSON records are yielded as dictionaries, 
+            plain text logs as one string per line.
+
+        Raises:
+            Exception: If the logs could not be retrieved.
+
+        Description:
+            This method streams the log file from the '/api/logs/error/download' endpoint. Only the record that is
+            currently parsed is held in memory, so logs of any size can be processed on the fly.
+
+        Example:
+            sedar = SedarAPI(base_url)
+            for record in sedar.iter_error_logs():
+                print(record)
+        """
+        return iter_log_records(self.connection._stream_resource("/api/logs/error/download"))
+
+    #--------------------------------------------------------------
+    def follow_error_logs(self, poll_interval: float = 5.0, max_interval: float = 60.0, backlog: int = 10, cursor: LogCursor = None):
+        """
+        Follows the error logs of the SEDAR system like 'tail -f' and yields every new record.
+
+        Args:
+            poll_interval (float, optional): Seconds between two polls while new errors are logged. Defaults to 5.
+            max_interval (float, optional): The longest time between two polls while no errors are logged. Defaults to 60.
+            backlog (int, optional): The number of already logged records yielded at the start. Defaults to 10.
+            cursor (LogCursor, optional): The cursor of an earlier call, to continue where it stopped. It is updated 
+                in place while the records are yielded. Without a cursor, the follower starts at the end of the log.
+
+        Returns:
+            generator: The new log records, without end. JSON records are yielded as dictionaries, plain text logs 
+            as one string per line.
+
+        Raises:
+            ValueError: If the logs are not line based.
+
+        Description:
+            This method polls the '/api/logs/error/download' endpoint with HTTP Range requests. Each poll only
+            transfers the bytes from the last read record on, so old records are neither transferred nor parsed again.
+            The last read record is compared with the hash in the cursor; if the log was replaced (e.g. by a log 
+            rotation), it is read from its beginning and only records newer than the timestamp in the cursor are yielded.
+            The interval between two polls grows by a factor of 1.5 while no errors are logged and is reset with the next error.
+            A poll that fails, e.g. because the server is not reachable for a moment, is logged and tried again after the next interval.
+
+        Example:
+            sedar = SedarAPI(base_url)
+            cursor = LogCursor()
+            for record in sedar.follow_error_logs(poll_interval=2, cursor=cursor):
+                print(record)
+        """
+        return follow_log(self.connection, "/api/logs/error/download", cursor, poll_interval, max_interval, backlog)
     
 
     #--------------------------------------------------------------
@@ -413,8 +505,52 @@ class SedarAPI:
         if response is None:
             raise Exception("Failed to fetch Workspaces. Set the logger level to \"Error\" or below to get more detailed information.")
 
-        return [Workspace(self.connection, workspace["id"]) for workspace in response]
+        return [Workspace(self.connection, workspace["id"], content=workspace) for workspace in response]
     
+    #--------------------------------------------------------------
+    def search_all(self, query: str, max_workers: int = 4, limit: int = 50, timeout: float = None, workspaces: List[Workspace] = None, **filters) -> SearchResults:
+        """
+        Searches for datasets in all workspaces concurrently and merges the results into one ranking.
+
+        Args:
+            query (str): A typical query string for a text based search.
+            max_workers (int, optional): The maximum number of workspace searches at the same time. Defaults to 4.
+            limit (int, optional): The maximum number of hits per workspace. Defaults to 50.
+            timeout (float, optional): Seconds after which the searches that are still running are given up. Waits for all by default.
+            workspaces (list, optional): The workspaces to search in. Defaults to all workspaces of the user.
+            **filters: Advanced search parameters, see 'Workspace.search_datasets'.
+
+        Returns:
+            SearchResults: The found datasets in "datasets" and the failed or timed out workspaces in "errors".
+
+        Raises:
+            Exception: If the workspaces can not be retrieved.
+
+        Description:
+            Every workspace is searched with a single request, up to "max_workers" at the same time. A failing or slow
+            workspace does not fail the whole search: its error is recorded in the results and the hits of all other 
+            workspaces are returned. If the hits carry a relevance score they are ranked by it, otherwise the hits of
+            the workspaces are interleaved by their rank, so the order of the results is always the same.
+
+        Example:
+            sedar = SedarAPI(base_url)
+            results = sedar.search_all("sensor", max_workers=8, timeout=10)
+            for dataset in results:
+                print(dataset.workspace, dataset.title)
+            for workspace_id, error in results.errors.items():
+                print(f"{workspace_id}: {error}")
+        """
+        workspaces = workspaces if workspaces is not None else self.get_all_workspaces()
+
+        def search(workspace):
+            return list(workspace.iter_search(query, page_size=limit, max_results=limit, **filters))
+
+        results = search_workspaces(workspaces, search, max_workers, timeout)
+        for workspace_id, error in results.errors.items():
+            self.logger.warning(f"The search in workspace '{workspace_id}' failed: {str(error)}")
+        self.logger.info(f"Found {len(results)} datasets in {len(workspaces) - len(results.errors)} of {len(workspaces)} workspaces in {results.seconds:.2f} s.")
+        return results
+
     #--------------------------------------------------------------
     def get_workspace(self, workspace_id: str) -> Workspace:
         """
@@ -0,0 +1,680 @@
+# Import needed python modules
+import copy
+import hashlib
+import io
+import os
+import re
+import zlib
+
+#--------------------------------------------------------------
+# Helpers to prepare source files before they are uploaded
+#--------------------------------------------------------------
+def _has_header(datasource_definition):
+    read_options = datasource_definition.get("read_options", {})
+    return str(read_options.get("header", "false")).lower() == "true"
+
+#--------------------------------------------------------------
+def plan_shards(file_path: str, shards: int, has_header: bool = False, quote: str = None, escape: str = None) -> list:
+    """
+    Splits a line based source file (CSV or JSON lines) into record-aligned byte ranges.
+
+    Args:
+        file_path (str): The path of the source file.
+        shards (int): The number of shards the file should be split into.
+        has_header (bool, optional): If True, the first record of the file is repeated at the start of every shard.
+        quote (str, optional): The quote character of a CSV file whose quoted fields may contain line breaks. If given, 
+            line breaks within quoted fields are not used as boundaries. By default every line break ends a record.
+        escape (str, optional): The character that escapes a quote within a quoted field. Only used with "quote". 
+            Defaults to the quote character itself, i.e. doubled quotes.
+
+    Returns:
+        list: One list of segments per shard, as accepted by "MultipartStream". Nothing is copied, the shards
+            reference byte ranges of the original file. Empty shards of very small files are left out.
+
+    Raises:
+        Exception: If the number of shards is smaller than 1.
+
+    Notes:
+        - With "quote", the file is scanned once from the start to track whether a line break is within a quoted field.
+          Without it, only the lines around the boundaries are read.
+    """
+    if shards < 1:
+        raise Exception(f"A file can not be split into {shards} shards.")
+
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as f:
+        if quote is not None:
+            header_end = _find_record_starts(f, 0, size, [1], quote, escape)[0] if has_header else 0
+            f.seek(0)
+            header = f.read(header_end)
+        else:
+            header = f.readline() if has_header else b""
+        data_start = len(header)
+
+        # Move every boundary forward to the start of the next record
+        targets = [max(data_start + (size - data_start) * i // shards, data_start + 1) for i in range(1, shards)]
+        if quote is not None:
+            boundaries = [data_start] + _find_record_starts(f, data_start, size, targets, quote, escape)
+        else:
+            boundaries = [data_start]
+            for target in targets:
+                f.seek(target - 1)
+                f.readline()
+                boundaries.append(max(f.tell(), boundaries[-1]))
+        boundaries.append(size)
+
+    planned_shards = []
+    for start, end in zip(boundaries, boundaries[1:]):
+        if start >= end:
+            continue
+        segments = [(file_path, start, end)]
+        if header:
+            segments.insert(0, header)
+        planned_shards.append(segments)
+
+    return planned_shards
+
+#--------------------------------------------------------------
+def _find_record_starts(f, start, size, targets, quote, escape=None, chunk_size=1024 * 1024):
+    # Returns, for every (ascending) target offset, the start of the first record at or after it. Only the quotes,
+    # escapes and line breaks of the file are looked at, line breaks within quoted fields do not end a record.
+    quote = quote.encode("utf-8")
+    escape = escape.encode("utf-8") if escape and escape != quote.decode("utf-8") else None
+    token = re.compile(b"[" + re.escape(quote + (escape or b"")) + b"\n]")
+
+    record_starts = []
+    in_quotes = False
+    skipped = None
+    position = start
+    f.seek(start)
+    while len(record_starts) < len(targets):
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        for match in token.finditer(chunk):
+            offset = position + match.start()
+            character = match.group()
+            if offset == skipped:
+                continue
+            if escape is not None and character == escape:
+                # The escape character takes the next character out of the quote handling
+                if in_quotes:
+                    skipped = offset + 1
+            elif character == quote:
+                in_quotes = not in_quotes
+            elif not in_quotes:
+                while len(record_starts) < len(targets) and offset + 1 >= targets[len(record_starts)]:
+                    record_starts.append(offset + 1)
+        position += len(chunk)
+
+    # Targets after the last record break start at the end of the file
+    return record_starts + [size] * (len(targets) - len(record_starts))
+
+#--------------------------------------------------------------
+def shard_upload_files(datasource_definition: dict, files: dict, shards: int):
+    """
+    Splits every source file of an upload into shards and rewrites the datasource definition accordingly.
+
+    Args:
+        datasource_definition (dict): The datasource definition of the upload.
+        files (dict): The file fields of the upload, mapping datasource names to (file_name, file_path, mime_type) tuples.
+        shards (int): The number of shards per source file.
+
+    Returns:
+        tuple: The rewritten datasource definition (a copy) and the new file fields, in which every source file
+            is replaced by its shards named '{datasource name}_part{n}'.
+
+    Raises:
+        Exception: If the read format of the datasource is not line based.
+
+    Notes:
+        - With the read option "multiLine", a CSV file is split on record boundaries, honouring the "quote" and "escape" 
+          read options (Spark defaults '"' and '\\'). Multi-line JSON can not be split and is rejected.
+        - The shards are separate source files of the same upload. They are still sent one after another in a single
+          request, as the API takes all source files of a dataset at once. They let Spark read the file in parallel tasks,
+          which matters most for compressed files, that Spark can not split itself.
+    """
+    read_format = datasource_definition.get("read_format", "csv")
+    if read_format not in ("csv", "json"):
+        raise Exception(f"Sharding is only supported for 'csv' and 'json' (JSON lines) source files, not for '{read_format}'.")
+
+    read_options = datasource_definition.get("read_options", {})
+    multi_line = str(read_options.get("multiLine", "false")).lower() == "true"
+    if multi_line and read_format == "json":
+        raise Exception("Sharding is not supported for JSON source files with the read option 'multiLine', only for JSON lines.")
+    quote = read_options.get("quote", '"') if multi_line else None
+    escape = read_options.get("escape", "\\") if multi_line else None
+
+    has_header = read_format == "csv" and _has_header(datasource_definition)
+    datasource_definition = copy.deepcopy(datasource_definition)
+    source_files = list(datasource_definition.get("source_files", list(files)))
+
+    sharded_files = {}
+    for key, (file_name, file_path, mime_type) in files.items():
+        stem, extension = os.path.splitext(file_name)
+        shard_names = []
+        for number, segments in enumerate(plan_shards(file_path, shards, has_header, quote, escape)):
+            shard_name = f"{key}_part{number:03d}"
+            sharded_files[shard_name] = (f"{stem}_part{number:03d}{extension}", segments, mime_type)
+            shard_names.append(shard_name)
+
+        # Replace the original entry in "source_files" by the names of its shards
+        if key in source_files:
+            position = source_files.index(key)
+            source_files[position:position + 1] = shard_names
+        else:
+            source_files.extend(shard_names)
+
+    datasource_definition["source_files"] = source_files
+    return datasource_definition, sharded_files
+
+#--------------------------------------------------------------
+def plan_tail(file_path: str, state: dict = None, has_header: bool = False, chunk_size: int = 1024 * 1024):
+    """
+    Plans the upload of the lines that were appended to a source file since its last upload.
+
+    Args:
+        file_path (str): The path of the source file.
+        state (dict, optional): The state returned for the last upload of this file. Without a state the whole file is planned.
+        has_header (bool, optional): If True, the first line of the file is put in front of the appended lines.
+        chunk_size (int, optional): The number of bytes read at once. Defaults to 1 MiB.
+
+    Returns:
+        tuple: The segments to upload (as accepted by "MultipartStream"), or None if no complete line was appended,
+            and the new state of the file. The state holds the uploaded byte "offset", the number of uploaded "lines",
+            the SHA-256 hash of the uploaded prefix and the byte offset this upload "start"s at.
+
+    Description:
+        The file is read once. The already uploaded prefix is verified against the stored hash on the way. If it does
+        not match anymore (e.g. the file was rewritten or rotated), the whole file is planned again. A last line that
+        is not terminated yet is left for the next upload.
+    """
+    state = state or {}
+    size = os.path.getsize(file_path)
+    digest = hashlib.sha256()
+
+    with open(file_path, "rb") as f:
+        end = _last_line_end(f, size, chunk_size)
+        offset = state.get("offset", 0)
+        if offset > end:
+            offset = 0
+        prefix_lines = _hash_range(f, digest, 0, offset, chunk_size)
+
+        # Upload everything again if the already uploaded part of the file was changed
+        start = offset
+        if digest.hexdigest() != state.get("prefix_sha256", digest.hexdigest()) or prefix_lines != state.get("lines", prefix_lines):
+            start = 0
+
+        tail_lines = _hash_range(f, digest, offset, end, chunk_size)
+        f.seek(0)
+        header = f.readline() if has_header and start > 0 else b""
+
+    new_state = {"offset": end, "lines": prefix_lines + tail_lines, "prefix_sha256": digest.hexdigest(), "start": start}
+    if start >= end:
+        return None, new_state
+
+    segments = [(file_path, start, end)]
+    if header:
+        segments.insert(0, header)
+    return segments, new_state
+
+#--------------------------------------------------------------
+def _last_line_end(f, size, chunk_size):
+    # Searches backwards for the last line break and returns the position after it
+    position = size
+    while position > 0:
+        f.seek(max(position - chunk_size, 0))
+        block = f.read(position - f.tell())
+        index = block.rfind(b"\n")
+        if index >= 0:
+            return position - len(block) + index + 1
+        position -= len(block)
+    return 0
+
+#--------------------------------------------------------------
+def _hash_range(f, digest, start, end, chunk_size):
+    # Feeds a byte range of the file into the digest and returns the number of line breaks in it
+    lines = 0
+    f.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        chunk = f.read(min(chunk_size, remaining))
+        if not chunk:
+            break
+        digest.update(chunk)
+        lines += chunk.count(b"\n")
+        remaining -= len(chunk)
+    return lines
+
+#--------------------------------------------------------------
+def plan_incremental_upload(datasource_definition: dict, files: dict, states: dict = None):
+    """
+    Replaces every source file of an upload by the lines appended to it since the last upload.
+
+    Args:
+        datasource_definition (dict): The datasource definition of the upload.
+        files (dict): The file fields of the upload, mapping datasource names to (file_name, file_path, mime_type) tuples.
+        states (dict, optional): The states of the last upload, mapping datasource names to the states returned by "plan_tail".
+
+    Returns:
+        tuple: The rewritten datasource definition (a copy), the file fields of the appended parts and the new states
+            of all source files. Files without appended lines are left out of the file fields and of "source_files".
+
+    Raises:
+        Exception: If the read format is not line based or the definition has no "id_column".
+
+    Description:
+        The appended lines are merged into the dataset with the "DELTA" write type. If the already uploaded part of
+        any file has changed, or none of the files was uploaded before, all files are uploaded completely with the
+        "DEFAULT" write type instead, so rows that were removed from the files do not stay in the dataset.
+    """
+    read_format = datasource_definition.get("read_format", "csv")
+    if read_format not in ("csv", "json"):
+        raise Exception(f"Incremental uploads are only supported for 'csv' and 'json' (JSON lines) source files, not for '{read_format}'.")
+    if not datasource_definition.get("id_column"):
+        raise Exception("Incremental uploads are merged into the dataset by its 'id_column', but the datasource definition has none.")
+
+    has_header = read_format == "csv" and _has_header(datasource_definition)
+    states = states or {}
+
+    plans = {key: plan_tail(file_path, states.get(key), has_header) for key, (_, file_path, _) in files.items()}
+    rewritten = [key for key, (_, state) in plans.items() if state["start"] == 0 and states.get(key, {}).get("offset", 0) > 0]
+    full_upload = bool(rewritten) or not any(key in states for key in files)
+    if rewritten:
+        # The other files are planned from their beginning as well, the whole dataset is replaced
+        plans = {key: plan_tail(file_path, None, has_header) for key, (_, file_path, _) in files.items()}
+
+    tail_files = {}
+    new_states = {}
+    for key, (file_name, file_path, mime_type) in files.items():
+        segments, new_states[key] = plans[key]
+        if segments is not None:
+            stem, extension = os.path.splitext(file_name)
+            tail_name = file_name if full_upload else f"{stem}_from{new_states[key]['start']}{extension}"
+            tail_files[key] = (tail_name, segments, mime_type)
+
+    datasource_definition = copy.deepcopy(datasource_definition)
+    datasource_definition["write_type"] = "DEFAULT" if full_upload else "DELTA"
+    if "source_files" in datasource_definition:
+        datasource_definition["source_files"] = [key for key in datasource_definition["source_files"] if key in tail_files]
+    return datasource_definition, tail_files, new_states
+
+#--------------------------------------------------------------
+def _import_pyarrow():
+    # pyarrow is an optional dependency, it is only needed for the Parquet conversion
+    try:
+        import pyarrow
+        import pyarrow.csv
+        import pyarrow.json
+        import pyarrow.parquet
+    except ImportError:
+        raise Exception("Converting source files to Parquet requires the 'pyarrow' package. Install it with 'pip install pyarrow'.")
+    return pyarrow
+
+#--------------------------------------------------------------
+def convert_to_parquet(file_path: str, datasource_definition: dict, target_path: str, compression: str = "snappy", block_size: int = 16 * 1024 * 1024) -> str:
+    """
+    Converts a CSV or JSON lines source file into a compressed Parquet file.
+
+    Args:
+        file_path (str): The path of the source file.
+        datasource_definition (dict): The datasource definition, used for "read_format" and the CSV "read_options".
+        target_path (str): The path of the Parquet file to be written.
+        compression (str, optional): The Parquet compression codec. Defaults to "snappy".
+        block_size (int, optional): The number of bytes converted at once. Defaults to 16 MiB.
+
+    Returns:
+        str: The path of the written Parquet file.
+
+    Raises:
+        Exception: If pyarrow is not installed, the read format is not supported or the file can not be parsed.
+
+    Description:
+        The file is read twice, block by block, so the memory footprint only depends on the block size. The first
+        pass infers the column types over the whole file and widens them where blocks disagree: integers and floats
+        become floats, other conflicts and columns without any value become strings. The second pass converts the
+        file with these types.
+
+    Notes:
+        - A JSON field that holds numbers in some lines and strings in others can not be parsed by pyarrow and
+          raises an Exception.
+        - CSV files are parsed with the "delimiter", "quote", "escape" and "multiLine" read options and the Spark defaults
+          for missing ones. Without a header, the columns are named like Spark does ('_c0', '_c1', ...).
+    """
+    pyarrow = _import_pyarrow()
+    read_format = datasource_definition.get("read_format", "csv")
+    if read_format not in ("csv", "json"):
+        raise Exception(f"Only 'csv' and 'json' (JSON lines) source files can be converted to Parquet, not '{read_format}'.")
+
+    try:
+        if read_format == "csv":
+            schema = _infer_csv_schema(pyarrow, file_path, datasource_definition, block_size)
+            batches = _open_csv(pyarrow, file_path, datasource_definition, block_size, column_types=schema)
+        else:
+            schema = _infer_json_lines_schema(pyarrow, file_path, block_size)
+            batches = _read_json_lines_batches(pyarrow, file_path, block_size, schema)
+
+        with pyarrow.parquet.ParquetWriter(target_path, schema, compression=compression) as writer:
+            for batch in batches:
+                writer.write_batch(batch.cast(schema) if batch.schema != schema else batch)
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowNotImplementedError, pyarrow.ArrowTypeError) as e:
+        raise Exception(f"The source file '{file_path}' could not be converted to Parquet: {str(e)}")
+
+    return target_path
+
+#--------------------------------------------------------------
+def _open_csv(pyarrow, file_path, datasource_definition, block_size, column_types=None, strings_can_be_null=False):
+    read_options = datasource_definition.get("read_options", {})
+
+    # The read options of Spark, with its defaults. An empty "quote" turns quoting off.
+    quote = read_options.get("quote", '"')
+    escape = read_options.get("escape", "\\")
+    parse_options = pyarrow.csv.ParseOptions(
+        delimiter=read_options.get("delimiter", read_options.get("sep", ",")),
+        quote_char=quote or False,
+        double_quote=bool(quote) and escape == quote,
+        escape_char=escape if quote and escape and escape != quote else False,
+        newlines_in_values=str(read_options.get("multiLine", "false")).lower() == "true"
+    )
+    convert_options = pyarrow.csv.ConvertOptions(column_types=column_types, strings_can_be_null=strings_can_be_null)
+
+    if _has_header(datasource_definition):
+        csv_read_options = pyarrow.csv.ReadOptions(block_size=block_size)
+    else:
+        # Name the columns like Spark does ('_c0', '_c1', ...) instead of pyarrow's 'f0', 'f1', ...
+        columns = len(pyarrow.csv.open_csv(file_path, read_options=pyarrow.csv.ReadOptions(block_size=block_size, autogenerate_column_names=True),
+                                           parse_options=parse_options).schema)
+        csv_read_options = pyarrow.csv.ReadOptions(block_size=block_size, column_names=[f"_c{i}" for i in range(columns)])
+    return pyarrow.csv.open_csv(file_path, read_options=csv_read_options, parse_options=parse_options, convert_options=convert_options)
+
+#--------------------------------------------------------------
+def _infer_csv_schema(pyarrow, file_path, datasource_definition, block_size):
+    # Every column is read as string and checked block by block against the candidate types, the narrowest
+    # candidate that fits all values of the file wins
+    candidates = [pyarrow.int64(), pyarrow.float64(), pyarrow.bool_(), pyarrow.timestamp("s")]
+
+    # The column names are needed up front to read every column as string
+    names = _open_csv(pyarrow, file_path, datasource_definition, block_size).schema.names
+    reader = _open_csv(pyarrow, file_path, datasource_definition, block_size, column_types={name: pyarrow.string() for name in names}, strings_can_be_null=True)
+
+    remaining = {name: list(candidates) for name in names}
+    has_values = {name: False for name in names}
+    for batch in reader:
+        for name, column in zip(batch.schema.names, batch.columns):
+            if column.null_count == len(column):
+                continue
+            has_values[name] = True
+            remaining[name] = [data_type for data_type in remaining[name] if _can_cast(pyarrow, column, data_type)]
+
+    return pyarrow.schema([(name, remaining[name][0] if has_values[name] and remaining[name] else pyarrow.string()) for name in names])
+
+#--------------------------------------------------------------
+def _can_cast(pyarrow, column, data_type):
+    try:
+        column.cast(data_type)
+        return True
+    except (pyarrow.ArrowInvalid, pyarrow.ArrowNotImplementedError):
+        return False
+
+#--------------------------------------------------------------
+def _iter_json_lines_blocks(file_path, block_size):
+    with open(file_path, "rb") as f:
+        while True:
+            # Read roughly "block_size" bytes, completed to the end of the current line
+            block = f.read(block_size) + f.readline()
+            if not block.strip():
+                break
+            yield block
+
+#--------------------------------------------------------------
+def _infer_json_lines_schema(pyarrow, file_path, block_size):
+    fields = {}
+    for block in _iter_json_lines_blocks(file_path, block_size):
+        for field in pyarrow.json.read_json(io.BytesIO(block)).schema:
+            fields[field.name] = _widen_type(pyarrow, fields[field.name], field.type) if field.name in fields else field.type
+    if not fields:
+        raise Exception(f"The source file '{file_path}' is empty.")
+
+    # A column without any value has no type to infer
+    return pyarrow.schema([(name, pyarrow.string() if pyarrow.types.is_null(data_type) else data_type) for name, data_type in fields.items()])
+
+#--------------------------------------------------------------
+def _widen_type(pyarrow, a, b):
+    # Returns a type that can hold the values of both types
+    types = pyarrow.types
+    if a == b or types.is_null(b):
+        return a
+    if types.is_null(a):
+        return b
+    if (types.is_integer(a) or types.is_floating(a)) and (types.is_integer(b) or types.is_floating(b)):
+        return pyarrow.float64() if types.is_floating(a) or types.is_floating(b) else pyarrow.int64()
+    return pyarrow.string()
+
+#--------------------------------------------------------------
+def _read_json_lines_batches(pyarrow, file_path, block_size, schema):
+    parse_options = pyarrow.json.ParseOptions(explicit_schema=schema)
+    for block in _iter_json_lines_blocks(file_path, block_size):
+        for batch in pyarrow.json.read_json(io.BytesIO(block), parse_options=parse_options).to_batches():
+            yield batch
+
+#--------------------------------------------------------------
+def convert_upload_files(datasource_definition: dict, files: dict, target_format: str, work_dir: str):
+    """
+    Converts every source file of an upload and rewrites the datasource definition to the new format.
+
+    Args:
+        datasource_definition (dict): The datasource definition of the upload.
+        files (dict): The file fields of the upload, mapping datasource names to (file_name, file_path, mime_type) tuples.
+        target_format (str): The format to convert to. Currently only "parquet" is supported.
+        work_dir (str): The directory the converted files are written to.
+
+    Returns:
+        tuple: The rewritten datasource definition (a copy) and the file fields of the converted files.
+
+    Raises:
+        Exception: If the target format is not supported or a file can not be converted.
+    """
+    if target_format != "parquet":
+        raise Exception(f"Source files can only be converted to 'parquet', not to '{target_format}'.")
+
+    converted_files = {}
+    for key, (file_name, file_path, _) in files.items():
+        target_name = os.path.splitext(file_name)[0] + ".parquet"
+        target_path = convert_to_parquet(file_path, datasource_definition, os.path.join(work_dir, target_name))
+        converted_files[key] = (target_name, target_path, "application/octet-stream")
+
+    # Parquet files carry their own schema, so none of the text based read options apply anymore
+    datasource_definition = copy.deepcopy(datasource_definition)
+    datasource_definition["read_format"] = "parquet"
+    datasource_definition["read_options"] = {}
+    return datasource_definition, converted_files
+
+#--------------------------------------------------------------
+# File extensions and mime-types of the supported compression codecs
+_COMPRESSIONS = {
+    "gzip": (".gz", "application/gzip"),
+    "zstd": (".zst", "application/zstd")
+}
+
+def compressed_file_name(file_name: str, compression: str) -> str:
+    """
+    Returns the file name with the extension of the compression codec appended, e.g. 'data.csv.gz'.
+
+    Raises:
+        Exception: If the compression is unknown.
+    """
+    if compression not in _COMPRESSIONS:
+        raise Exception(f"Unknown compression '{compression}'. Supported are: {list(_COMPRESSIONS)}")
+    return file_name + _COMPRESSIONS[compression][0]
+
+#--------------------------------------------------------------
+def _create_compressor(compression, level):
+    if compression == "gzip":
+        # wbits 31 writes a gzip header, whose mtime is 0, so identical input gives identical output
+        return zlib.compressobj(6 if level is None else level, zlib.DEFLATED, 31)
+
+    if compression == "zstd":
+        # zstandard is an optional dependency, it is only needed for zstd compression
+        try:
+            import zstandard
+        except ImportError:
+            raise Exception("Compressing source files with zstd requires the 'zstandard' package. Install it with 'pip install zstandard'.")
+        return zstandard.ZstdCompressor(level=3 if level is None else level).compressobj()
+
+    raise Exception(f"Unknown compression '{compression}'. Supported are: {list(_COMPRESSIONS)}")
+
+#--------------------------------------------------------------
+class CompressingReader:
+    """
+    A file-like object that compresses a file, or a list of segments, while it is being read.
+
+    Nothing is written to disk and only about one block of raw and compressed data is held in memory. The compressed 
+    length is not known before the end is reached, so "MultipartStream" sends a body containing a reader with chunked 
+    transfer encoding.
+
+    Args:
+        source (str or list): A file path or a list of segments as accepted by "MultipartStream".
+        compression (str, optional): Either "gzip" or "zstd". Defaults to "gzip".
+        level (int, optional): The compression level. Defaults to 6 for gzip and 3 for zstd.
+        chunk_size (int, optional): The number of raw bytes compressed at once. Defaults to 1 MiB.
+
+    Raises:
+        Exception: If the compression is unknown or its package is not installed.
+    """
+    def __init__(self, source, compression: str = "gzip", level: int = None, chunk_size: int = 1024 * 1024):
+        if isinstance(source, str):
+            source = [(source, 0, os.path.getsize(source))]
+        self.chunk_size = chunk_size
+        self._compressor = _create_compressor(compression, level)
+        self._chunks = self._read_source(source)
+        self._buffer = b""
+        self._finished = False
+
+    #--------------------------------------------------------------
+    def read(self, size=-1):
+        while not self._finished and (size is None or size < 0 or len(self._buffer) < size):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._buffer += self._compressor.flush()
+                self._finished = True
+            else:
+                self._buffer += self._compressor.compress(chunk)
+
+        if size is None or size < 0:
+            size = len(self._buffer)
+        block, self._buffer = self._buffer[:size], self._buffer[size:]
+        return block
+
+    #--------------------------------------------------------------
+    def close(self):
+        self._chunks.close()
+
+    #--------------------------------------------------------------
+    def _read_source(self, source):
+        for segment in source:
+            if isinstance(segment, bytes):
+                yield segment
+                continue
+
+            file_path, start, end = segment
+            with open(file_path, "rb") as f:
+                f.seek(start)
+                remaining = end - start
+                while remaining > 0:
+                    chunk = f.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    yield chunk
+
+#--------------------------------------------------------------
+def compress_file(source, target_path: str, compression: str = "gzip", level: int = None, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Compresses a file, or a list of segments, into a new file.
+
+    Args:
+        source (str or list): A file path or a list of segments as accepted by "MultipartStream".
+        target_path (str): The path of the compressed file to be written.
+        compression (str, optional): Either "gzip" or "zstd". Defaults to "gzip".
+        level (int, optional): The compression level. Defaults to 6 for gzip and 3 for zstd.
+        chunk_size (int, optional): The number of bytes compressed at once. Defaults to 1 MiB.
+
+    Returns:
+        str: The path of the written file.
+
+    Raises:
+        Exception: If the compression is unknown or its package is not installed.
+
+    Notes:
+        - Uploads do not use this function, they compress while sending with 'CompressingReader'.
+    """
+    reader = CompressingReader(source, compression, level, chunk_size)
+    try:
+        with open(target_path, "wb") as target:
+            for block in iter(lambda: reader.read(chunk_size), b""):
+                target.write(block)
+    finally:
+        reader.close()
+    return target_path
+
+#--------------------------------------------------------------
+def compress_upload_files(datasource_definition: dict, files: dict, compression: str):
+    """
+    Sets up every source file of an upload to be compressed while it is sent.
+
+    Args:
+        datasource_definition (dict): The datasource definition of the upload.
+        files (dict): The file fields of the upload, mapping datasource names to (file_name, source, mime_type) tuples.
+        compression (str): Either "gzip" or "zstd".
+
+    Returns:
+        tuple: The datasource definition and the file fields of the compressed files. The sources are 'CompressingReader' segments
+            and the file names get the extension of the codec (e.g. 'data.csv.gz'), from which Spark picks the decompression.
+            No read option is needed for that, "compression" is only a write option in Spark.
+
+    Raises:
+        Exception: If the compression is unknown or the source files are Parquet files.
+    """
+    if datasource_definition.get("read_format") == "parquet":
+        raise Exception("Parquet files are compressed already and can not be compressed again.")
+
+    compressed_files = {}
+    for key, (file_name, source, _) in files.items():
+        target_name = compressed_file_name(file_name, compression)
+        mime_type = _COMPRESSIONS[compression][1]
+        compressed_files[key] = (target_name, [CompressingReader(source, compression)], mime_type)
+
+    return datasource_definition, compressed_files
+
+#--------------------------------------------------------------
+def prepare_upload(datasource_definition: dict, files: dict, work_dir: str, shards: int = None, convert_to: str = None, compression: str = None):
+    """
+    Applies all requested local preparation steps to the source files of an upload.
+
+    Args:
+        datasource_definition (dict): The datasource definition of the upload.
+        files (dict): The file fields of the upload, mapping datasource names to (file_name, file_path, mime_type) tuples.
+        work_dir (str): A temporary directory for files written during the preparation. It has to exist until the upload is done.
+        shards (int, optional): Splits every source file into this number of line-aligned shards.
+        convert_to (str, optional): Converts every source file into this format. Currently only "parquet" is supported.
+        compression (str, optional): Compresses every (sharded) source file with "gzip" or "zstd" while it is uploaded.
+
+    Returns:
+        tuple: The datasource definition and the file fields that should be uploaded.
+
+    Raises:
+        Exception: If a preparation step is not possible for the given source files.
+    """
+    if convert_to is not None:
+        # Parquet files are not line based and can therefore not be sharded afterwards
+        if shards is not None and shards > 1:
+            raise Exception("Sharding can not be combined with a conversion of the source files.")
+        datasource_definition, files = convert_upload_files(datasource_definition, files, convert_to, work_dir)
+
+    if shards is not None and shards > 1:
+        datasource_definition, files = shard_upload_files(datasource_definition, files, shards)
+
+    if compression is not None:
+        datasource_definition, files = compress_upload_files(datasource_definition, files, compression)
+
+    return datasource_definition, files
@@ -0,0 +1,138 @@
+# Import needed python modules
+import math
+import re
+import statistics
+
+#--------------------------------------------------------------
+# Planner for staggered continuation timers
+#--------------------------------------------------------------
+MINUTES_PER_DAY = 24 * 60
+
+def to_timer(period: int, offset: int) -> list:
+    """
+    Builds a periodic continuation timer whose first run starts "offset" minutes after the timer is set and whose
+    following runs repeat every "period" minutes.
+
+    Args:
+        period (int): The minutes between two runs. Has to divide a day.
+        offset (int): The minute of the first run, between 0 and period - 1.
+
+    Returns:
+        list: The durations in milliseconds as strings, the delay until the first run followed by the interval between
+        all following runs, e.g. ['300000', '900000'] for every 15 minutes starting after 5 minutes.
+
+    Raises:
+        Exception: If the period does not divide a day.
+
+    Notes:
+        - The timer does not list the runs of a single day, as the server documents no repetition of such a list.
+          An interval that divides a day keeps the planned offsets between datasets from day to day.
+    """
+    if period < 1 or MINUTES_PER_DAY % period != 0:
+        raise Exception(f"A period of {period} minutes can not be planned as a continuation timer. Use a divisor of 1440.")
+    return [str(offset * 60 * 1000), str(period * 60 * 1000)]
+
+#--------------------------------------------------------------
+def get_load(schedule: dict) -> list:
+    """
+    Returns the number of concurrently running jobs for every minute of a day.
+
+    Args:
+        schedule (dict): Maps job names to (period, cost, offset) tuples, all in minutes.
+    """
+    load = [0] * MINUTES_PER_DAY
+    for period, cost, offset in schedule.values():
+        _add_load(load, period, cost, offset)
+    return load
+
+#--------------------------------------------------------------
+def _add_load(load, period, cost, offset):
+    for start in range(offset, MINUTES_PER_DAY, period):
+        for minute in range(start, start + cost):
+            load[minute % MINUTES_PER_DAY] += 1
+
+#--------------------------------------------------------------
+def plan_staggered_offsets(jobs: dict) -> dict:
+    """
+    Chooses a start offset for every periodic job, so that the peak number of concurrently running jobs stays low.
+
+    Args:
+        jobs (dict): Maps job names to (period, cost) tuples in minutes. The periods have to divide a day.
+
+    Returns:
+        dict: Maps job names to their offsets in minutes, between 0 and period - 1.
+
+    Description:
+        The jobs are placed greedily, the most expensive ones first. The load of one day is folded onto the period
+        of the job, so the peak of every possible offset can be computed without walking the whole day. The offset with
+        the lowest resulting peak wins, ties are broken by the lowest overlap with already placed jobs.
+    """
+    for name, (period, _) in jobs.items():
+        if MINUTES_PER_DAY % period != 0:
+            raise Exception(f"The period of '{name}' ({period} minutes) does not divide a day.")
+
+    load = [0] * MINUTES_PER_DAY
+    offsets = {}
+    for name, (period, cost) in sorted(jobs.items(), key=lambda job: (-job[1][1], job[1][0], str(job[0]))):
+        # The highest load at every minute within the period
+        folded = [max(load[residue::period]) for residue in range(period)]
+        highest = max(folded)
+        full_periods, rest = divmod(cost, period)
+
+        best = None
+        for offset in range(period):
+            window = [folded[(offset + minute) % period] for minute in range(rest)]
+            peak = max(highest + full_periods, max(window, default=-1) + 1 + full_periods)
+            candidate = (peak, sum(window), offset)
+            if best is None or candidate < best:
+                best = candidate
+
+        offsets[name] = best[2]
+        _add_load(load, period, cost, best[2])
+    return offsets
+
+#--------------------------------------------------------------
+# Words in the description of a change log entry that mark the start and the end of an ingestion
+_INGESTION_START = re.compile(r"\b(start|began|begun|running)")
+_INGESTION_END = re.compile(r"\b(finish|complet|succe|done|ended)")
+
+def estimate_ingestion_minutes(records: list, default: int = 5, last_runs: int = 5) -> int:
+    """
+    Estimates the duration of an ingestion from the past runs recorded in the change log of a dataset.
+
+    Args:
+        records (list): The change log of the dataset as DatasetLogRecords, see 'Dataset.get_logs(records=True)'.
+        default (int, optional): The minutes returned if no complete run is recorded. Defaults to 5.
+        last_runs (int, optional): The number of recent runs taken into account. Defaults to 5.
+
+    Returns:
+        int: The median duration of the recent runs in whole minutes, at least 1.
+
+    Description:
+        Entries whose English description mentions an ingestion are read as its start (e.g. "Ingestion started") or 
+        its end (e.g. "Ingestion finished"). Every end is paired with the latest unpaired start before it, the time 
+        between the two is the duration of the run.
+    """
+    events = []
+    for record in records:
+        description = str(record.description.get("en") or "").lower()
+        time = record.get_time()
+        if "ingest" not in description or time is None:
+            continue
+        if _INGESTION_START.search(description):
+            events.append((time, "start"))
+        elif _INGESTION_END.search(description):
+            events.append((time, "end"))
+
+    durations = []
+    started = None
+    for time, kind in sorted(events, key=lambda event: event[0]):
+        if kind == "start":
+            started = time
+        elif started is not None:
+            durations.append((time - started).total_seconds() / 60)
+            started = None
+
+    if not durations:
+        return default
+    return max(1, math.ceil(statistics.median(durations[-last_runs:])))
@@ -0,0 +1,187 @@
+# Import needed python modules
+import os
+import sys
+import time
+import uuid
+
+#--------------------------------------------------------------
+# Streaming multipart encoder
+#--------------------------------------------------------------
+class MultipartStream:
+    """
+    A file-like multipart/form-data body that is generated while it is being sent.
+
+    The body is never built in memory. File contents are read chunk by chunk from disk when the HTTP client
+    asks for the next block, so the memory footprint stays constant regardless of the upload size.
+    The total length is known up front, which allows sending a regular 'Content-Length' header, unless a segment is 
+    a reader whose length is unknown (e.g. a 'CompressingReader'). Then "length" is None and the body has to be sent
+    with chunked transfer encoding by passing an iterator over it.
+
+    Args:
+        fields (dict): Plain form fields, mapping field names to string values.
+        files (dict): File fields, mapping field names to (file_name, source, mime_type) tuples.
+            The source is either a file path or a list of segments. A segment is either a bytes object,
+            a (file_path, start, end) tuple describing a byte range of a file or a file-like object with "read" and "close".
+        chunk_size (int, optional): The block size used when reading files. Defaults to 1 MiB.
+        progress_callback (callable, optional): Called with (bytes_sent, total_bytes) after each block. 
+            total_bytes is None if the length is unknown.
+    """
+    def __init__(self, fields=None, files=None, chunk_size=1024 * 1024, progress_callback=None):
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.chunk_size = chunk_size
+        self.progress_callback = progress_callback
+        self.bytes_sent = 0
+        self.started_at = None
+        self.finished_at = None
+
+        self._segments = self._build_segments(fields or {}, files or {})
+        lengths = [self._segment_length(segment) for segment in self._segments]
+        self.length = None if None in lengths else sum(lengths)
+        self._index = 0
+        self._position = 0
+        self._file = None
+
+    #--------------------------------------------------------------
+    def __len__(self):
+        if self.length is None:
+            raise TypeError("The length of a multipart body with streamed readers is unknown.")
+        return self.length
+
+    #--------------------------------------------------------------
+    def __iter__(self):
+        while True:
+            block = self.read(self.chunk_size)
+            if not block:
+                break
+            yield block
+
+    #--------------------------------------------------------------
+    def read(self, size=-1):
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+        if size is None or size < 0:
+            size = self.length if self.length is not None else sys.maxsize
+
+        blocks = []
+        remaining = size
+        while remaining > 0 and self._index < len(self._segments):
+            block = self._read_segment(self._segments[self._index], remaining)
+            if block:
+                blocks.append(block)
+                remaining -= len(block)
+            else:
+                # The current segment is exhausted, continue with the next one
+                self._close_file()
+                self._index += 1
+                self._position = 0
+
+        data = b"".join(blocks)
+        self.bytes_sent += len(data)
+        if self._index >= len(self._segments) and self.finished_at is None:
+            self.finished_at = time.monotonic()
+        if data and self.progress_callback is not None:
+            self.progress_callback(self.bytes_sent, self.length)
+        return data
+
+    #--------------------------------------------------------------
+    def close(self):
+        self._close_file()
+        for segment in self._segments:
+            if hasattr(segment, "close"):
+                segment.close()
+
+    #--------------------------------------------------------------
+    def get_stats(self) -> dict:
+        """
+        Returns the transfer statistics of the stream.
+
+        Returns:
+            dict: The sent and total bytes, the elapsed seconds and the throughput in bytes per second. 
+                The total is None if the length is unknown.
+        """
+        started = self.started_at if self.started_at is not None else time.monotonic()
+        finished = self.finished_at if self.finished_at is not None else time.monotonic()
+        elapsed = max(finished - started, 1e-9)
+        return {
+            "bytes_sent": self.bytes_sent,
+            "total_bytes": self.length,
+            "seconds": elapsed,
+            "bytes_per_second": self.bytes_sent / elapsed
+        }
+
+    #--------------------------------------------------------------
+    # Private helper methods
+    #--------------------------------------------------------------
+    def _build_segments(self, fields, files):
+        segments = []
+        for name, value in fields.items():
+            segments.append((f"--{self.boundary}\r\n"
+                             f"Content-Disposition: form-data; name=\"{name}\"\r\n\r\n").encode("utf-8"))
+            segments.append(str(value).encode("utf-8"))
+            segments.append(b"\r\n")
+
+        for name, (file_name, source, mime_type) in files.items():
+            header = (f"--{self.boundary}\r\n"
+                      f"Content-Disposition: form-data; name=\"{name}\"; filename=\"{file_name}\"\r\n")
+            if mime_type:
+                header += f"Content-Type: {mime_type}\r\n"
+            segments.append((header + "\r\n").encode("utf-8"))
+
+            # A plain path is uploaded as a whole
+            if isinstance(source, str):
+                source = [(source, 0, os.path.getsize(source))]
+            segments.extend(source)
+            segments.append(b"\r\n")
+
+        segments.append(f"--{self.boundary}--\r\n".encode("utf-8"))
+        return segments
+
+    #--------------------------------------------------------------
+    @staticmethod
+    def _segment_length(segment):
+        if isinstance(segment, bytes):
+            return len(segment)
+        if hasattr(segment, "read"):
+            return None
+        _, start, end = segment
+        return end - start
+
+    #--------------------------------------------------------------
+    def _read_segment(self, segment, size):
+        if isinstance(segment, bytes):
+            block = segment[self._position:self._position + size]
+            self._position += len(block)
+            return block
+        if hasattr(segment, "read"):
+            return segment.read(size)
+
+        file_path, start, end = segment
+        if self._file is None:
+            self._file = open(file_path, "rb")
+            self._file.seek(start)
+        block = self._file.read(min(size, end - start - self._position))
+        self._position += len(block)
+        return block
+
+    #--------------------------------------------------------------
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+#--------------------------------------------------------------
+def format_transfer_stats(stats: dict) -> str:
+    """
+    Formats the statistics of a transfer as a short human readable string.
+
+    Args:
+        stats (dict): A dictionary with the keys 'bytes_sent', 'seconds' and 'bytes_per_second'.
+
+    Returns:
+        str: A string like '12.30 MB in 4.50 s (2.73 MB/s)'.
+    """
+    megabytes = stats["bytes_sent"] / (1024 * 1024)
+    rate = stats["bytes_per_second"] / (1024 * 1024)
+    return f"{megabytes:.2f} MB in {stats['seconds']:.2f} s ({rate:.2f} MB/s)"
@@ -4,23 +4,43 @@ from typing import Type
 from typing import List
 import json
 import os
+import tempfile
 
 # Import needed SEDAR modules
 from .commons import Commons
 from .dataset import Dataset
+from .file import _plan_file_downloads
+from .file import _download_files
 from .user import User
 from .ontology import Ontology
 from .ontology import Annotation
 from .mlflow import Experiment
 from .mlflow import ExperimentModel
+from .sourcefiles import prepare_upload
+from .datasource import validate_datasource_definition
+from .datasource import infer_datasource_definition
+from .bulk import run_bulk
+from .bulk import BulkResult
+from .journal import FINISHED
+from .lineage import build_downstream_graph
+from .lineage import get_topological_levels
+from .timers import estimate_ingestion_minutes
+from .timers import get_load
+from .timers import plan_staggered_offsets
+from .timers import to_timer
+from .pipeline import Pipeline
 
 class Workspace:
     #--------------------------------------------------------------
-    def __init__(self, connection: Type[Commons], workspace_id: str):
+    def __init__(self, connection: Type[Commons], workspace_id: str, content: dict = None):
         self.id = workspace_id
         self.connection = connection
         self.logger = self.connection.logger
-        self.content = self._get_workspace_json(self.id)
+
+        # A document that is known already (e.g. from the workspace list) saves the request, if it holds all members
+        if content is None or any(key not in content for key in ("title", "description")):
+            content = self._get_workspace_json(self.id)
+        self.content = content
 
         # Extract some members from the "content" attribute
         self.title = self.content["title"]
@@ -271,13 +291,21 @@ class Workspace:
         """
         return Dataset(self.connection, self.id, dataset_id)
     
-    def create_dataset(self, datasource_definition: any, file_paths: str) -> Dataset:
+    def create_dataset(self, datasource_definition: any, file_paths: str, progress_callback=None, shards: int = None, convert_to: str = None, validate: bool = False, compression: str = None) -> Dataset:
         """
         Creates a new datasource definition in the SEDAR system attached to the specified workspace.
 
         Args:
             datasource definition (str or dict): It can be a path to a JSON file or a dictionary containing the definition.
-            file_paths (str or dict): Either a single path to a file (str) or a dictionary of file names to file paths. 
+            file_paths (str or dict): Either a single path to a file (str) or a dictionary of datasource names 
+                (as listed in "source_files") to file paths. 
+            progress_callback (callable, optional): Called with (bytes_sent, total_bytes) while the files are uploaded. 
+                total_bytes is None when compressing, as the compressed size is not known in advance.
+            shards (int, optional): If set, every CSV or JSON lines source file is split into this number of record-aligned shards.
+            convert_to (str, optional): If set to "parquet", CSV and JSON lines source files are converted to compressed Parquet before the upload.
+            validate (bool, optional): If True, the definition is checked against a sample of the source files before the upload. 
+                See 'validate_datasource_definition'. Defaults to False.
+            compression (str, optional): If set to "gzip" or "zstd", the source files are compressed while they are uploaded.
 
         Returns:
             Dataset: An instance of the Dataset class representing the newly created dataset. 
@@ -293,6 +321,21 @@ class Workspace:
         Notes:
             - Ensure the provided datasource definition is valid and aligns with the expected format.
             - Currently the API can only process single files. Use a str file_path for now.
+            - The files are streamed from disk, so the memory footprint does not grow with the file size.
+              The upload throughput is logged on the 'INFO' level.
+            - When sharding, the header line of a CSV file (read option "header") is repeated in every shard and 
+              "source_files" of the datasource definition is rewritten to list the shards ('{name}_part000', ...).
+              The shards reference byte ranges of the original file, no copies are written to disk. They are still sent one 
+              after another in this single request, the gain is that Spark reads them in parallel. CSV files with the read option
+              "multiLine" are split outside of quoted fields, multi-line JSON is rejected. See 'shard_upload_files'.
+            - The Parquet conversion requires the optional 'pyarrow' package. It streams the source files in blocks, 
+              writes the column types inferred from the first block as an explicit schema and rewrites "read_format" 
+              and "read_options" of the datasource definition. Spark then reads a smaller columnar file without 
+              inferring the schema. The converted files are removed after the upload.
+            - The compression streams every (sharded) source file through the codec while the request is sent, no compressed copy
+              is written to disk. As the compressed size is not known in advance, the request uses chunked transfer encoding.
+              The file names get the extension of the codec (e.g. 'data.csv.gz'), from which Spark picks the decompression, 
+              so the read options stay unchanged. zstd requires the optional 'zstandard' package and a Spark installation with zstd support.
 
         Example:
             workspace = sedar.get_all_workspaces()[0]
@@ -302,8 +345,333 @@ class Workspace:
             except Exception as e:
                 print(e)
         """
-        return Dataset(self.connection,self.id, self._create_dataset(self.id, datasource_definition, file_paths)["id"])
+        return Dataset(self.connection,self.id, self._create_dataset(self.id, datasource_definition, file_paths, progress_callback, shards, convert_to, validate, compression)["id"])
     
+    def create_datasets_bulk(self, specs, max_workers: int = 4, naming_rule=None, stop_on_error: bool = False, progress_callback=None, journal=None, **upload_options) -> list:
+        """
+        Creates many datasets in the workspace, uploading up to "max_workers" of them at the same time.
+
+        Args:
+            specs (iterable or str): Either an iterable of (datasource_definition, file_paths) tuples, as accepted by 'create_dataset', 
+                or the path of a directory. For a directory, a definition is inferred for every file in it. See 'infer_datasource_definition'.
+            max_workers (int, optional): The maximum number of concurrent uploads. Defaults to 4.
+            naming_rule (callable, optional): Only for directories. Called with the path of a file, returns the name of its dataset.
+                Defaults to the file name without its extension.
+            stop_on_error (bool, optional): If True, no further datasets are started after the first failed one. Defaults to False.
+            progress_callback (callable, optional): Called with (finished_items, total_items, result) after every dataset.
+            journal (JobJournal, optional): Records every dataset, so an interrupted run can be resumed by calling the method 
+                again with the same specs and journal.
+            **upload_options: Further keyword arguments for 'create_dataset', e.g. "shards", "compression" or "validate".
+
+        Returns:
+            list: One BulkResult per started dataset, in the order of the specs. A successful result holds the new Dataset in `.value`,
+            a failed one the exception in `.error`. `.resumed` is True for datasets created in an earlier run.
+
+        Raises:
+            Exception: If "specs" is a path that is not a directory.
+
+        Description:
+            This method runs 'create_dataset' for every spec in a bounded thread pool. Errors of single datasets do not 
+            interrupt the others, they are returned in the results instead.
+
+        Notes:
+            - Hidden files in a directory are ignored. Subdirectories are not searched.
+            - The specs are consumed lazily, so a generator can be used for very large numbers of datasets.
+            - With a journal, the datasets are identified by their names, which therefore have to be unique. Datasets that were 
+              being uploaded when the last run died are looked up by their title in the workspace before they are created again. 
+              Datasets whose ids are recorded in the journal for other names are not taken for them.
+
+        Example:
+            ```python
+            results = workspace.create_datasets_bulk("/data/onboarding", max_workers=8, compression="gzip")
+            for result in results:
+                print(result.key, result.value.id if result.ok else result.error)
+            ```
+        """
+        specs = self._list_dataset_specs(specs)
+        create = lambda spec: self._create_dataset_from_spec(spec, naming_rule, upload_options)
+        key = lambda spec: self._get_dataset_spec_name(spec, naming_rule)
+
+        results = run_bulk(specs, create, max_workers, stop_on_error, progress_callback, key, journal=journal,
+                           record=lambda dataset: {"id": dataset.id},
+                           restore=lambda spec, stored: Dataset(self.connection, self.id, stored["id"]),
+                           reconcile=lambda spec: self._find_dataset_record(key(spec), journal))
+        failed = [result for result in results if not result.ok]
+        for result in failed:
+            self.logger.error(f"The Dataset '{result.key}' could not be created: {str(result.error)}")
+        self.logger.info(f"{len(results) - len(failed)} of {len(results)} Datasets were created successfully.")
+        return results
+
+    def run_ingestion_pipeline(self, specs, stage_workers: dict = None, naming_rule=None, stop_on_error: bool = False, progress_callback=None, 
+                               stage_timeouts: dict = None, **upload_options) -> list:
+        """
+        Onboards many datasets by running create, ingest, publish, profile and index for each of them.
+
+        Args:
+            specs (iterable or str): The datasets to create. See 'create_datasets_bulk'.
+            stage_workers (dict, optional): The maximum number of datasets processed at the same time per stage, by stage name 
+                ("create", "ingest", "publish", "profile", "index"). Missing stages use the defaults 
+                {"create": 4, "ingest": 2, "publish": 2, "profile": 2, "index": 8}.
+            naming_rule (callable, optional): Only for directories. See 'create_datasets_bulk'.
+            stop_on_error (bool, optional): If True, no further datasets are started after the first failed one. Defaults to False.
+            progress_callback (callable, optional): Called with (finished_items, total_items, result) after every dataset.
+            stage_timeouts (dict, optional): The maximum seconds to wait for the server job of a dataset, by stage name ("ingest", "publish").
+                Missing stages wait forever.
+            **upload_options: Further keyword arguments for 'create_dataset', e.g. "shards", "compression" or "validate".
+
+        Returns:
+            list: One PipelineResult per started dataset, in the order of the specs. A successful result holds the Dataset in `.value`,
+            a failed one the exception in `.error` and the name of the failed stage in `.stage`. 
+            `.timings` holds the seconds of every finished stage.
+
+        Raises:
+            Exception: If "specs" is a path that is not a directory.
+
+        Description:
+            The stages run strictly in sequence for every dataset, but overlap across datasets: while one dataset is ingested,
+            the next one can already be uploaded and the previous one indexed. Every stage has its own concurrency limit, 
+            so the Spark heavy ingestion can be kept low while the cheap index creation runs wider.
+            The ingest and publish stages wait until the server has finished the job, see 'Dataset.ingest'.
+            The publish stage calls 'Dataset.publish(index=True, profile=True, return_job=True)'.
+
+        Notes:
+            - The timings of all stages are logged on the 'INFO' level once all datasets are finished.
+            - A dataset whose job does not finish within the timeout of its stage fails in that stage with a TimeoutError. 
+              The job is no longer watched, but it is not stopped on the server.
+
+        Example:
+            ```python
+            results = workspace.run_ingestion_pipeline("/data/onboarding", stage_workers={"ingest": 1})
+            for result in results:
+                print(result.key, result.timings if result.ok else f"{result.stage}: {result.error}")
+            ```
+        """
+        workers = {"create": 4, "ingest": 2, "publish": 2, "profile": 2, "index": 8}
+        workers.update(stage_workers or {})
+        timeouts = stage_timeouts or {}
+
+        def wait(job, stage):
+            try:
+                return job.wait(timeouts.get(stage))
+            except TimeoutError:
+                job.cancel()
+                raise
+
+        def ingest(dataset):
+            return wait(dataset.ingest(return_job=True), "ingest")
+
+        def publish(dataset):
+            return wait(dataset.publish(index=True, profile=True, return_job=True), "publish")
+
+        def profile(dataset):
+            dataset.start_profiling()
+            return dataset
+
+        def index(dataset):
+            dataset.create_index_data()
+            return dataset
+
+        pipeline = Pipeline([
+            ("create", lambda spec: self._create_dataset_from_spec(spec, naming_rule, upload_options), workers["create"]),
+            ("ingest", ingest, workers["ingest"]),
+            ("publish", publish, workers["publish"]),
+            ("profile", profile, workers["profile"]),
+            ("index", index, workers["index"])
+        ])
+        results = pipeline.run(self._list_dataset_specs(specs), stop_on_error, progress_callback,
+                               lambda spec: self._get_dataset_spec_name(spec, naming_rule))
+
+        failed = [result for result in results if not result.ok]
+        for result in failed:
+            self.logger.error(f"The Dataset '{result.key}' failed in the stage '{result.stage}': {str(result.error)}")
+        for name, stats in pipeline.get_stage_stats().items():
+            self.logger.info(f"Stage '{name}': {stats['items']} Datasets, {stats['total']:.2f} s in total, {stats['mean']:.2f} s on average, {stats['max']:.2f} s at most.")
+        self.logger.info(f"{len(results) - len(failed)} of {len(results)} Datasets were onboarded successfully.")
+        return results
+
+    def reingest_downstream(self, dataset: Type[Dataset], max_workers: int = 4, timeout: float = None) -> list:
+        """
+        Re-ingests every dataset downstream of a dataset, level by level in the order of the lineage.
+
+        Args:
+            dataset (Dataset): The changed upstream dataset. It is not re-ingested itself.
+            max_workers (int, optional): The maximum number of ingestions running at the same time within one level. Defaults to 4.
+            timeout (float, optional): Maximum seconds to wait for a single ingestion. Waits forever by default.
+
+        Returns:
+            list: One list of BulkResults per level, in the order the levels were run. A successful result holds the 
+            refreshed Dataset in `.value`.
+
+        Raises:
+            Exception: If the lineage can not be fetched or contains a cycle.
+
+        Description:
+            The lineage of the dataset and of every dataset found in it is fetched concurrently, each one only once.
+            The resulting graph is sorted into levels, in which no dataset depends on another one of the same level.
+            The ingestions of one level run in parallel and the next level starts once all of them have finished.
+
+        Notes:
+            - Datasets downstream of a failed ingestion are skipped and returned as failed results.
+
+        Example:
+            ```python
+            dataset = workspace.get_dataset(dataset_id)
+            dataset.update_datasource("definition.json", "data.csv")
+            for level in workspace.reingest_downstream(dataset, max_workers=8):
+                print([(result.key, result.ok) for result in level])
+            ```
+        """
+        children = build_downstream_graph(dataset.id, lambda dataset_id: dataset._get_dataset_lineage(self.id, dataset_id))
+        levels = get_topological_levels(children, dataset.id)
+
+        parents = {}
+        for parent_id, child_ids in children.items():
+            for child_id in child_ids:
+                parents.setdefault(child_id, set()).add(parent_id)
+
+        def ingest(dataset_id):
+            return Dataset(self.connection, self.id, dataset_id).ingest(return_job=True).wait(timeout)
+
+        results = []
+        failed = set()
+        for number, level in enumerate(levels):
+            self.logger.info(f"Re-ingesting level {number + 1} of {len(levels)} with {len(level)} Datasets...")
+            blocked = [dataset_id for dataset_id in level if parents.get(dataset_id, set()) & failed]
+            level_results = run_bulk([dataset_id for dataset_id in level if dataset_id not in blocked], ingest, max_workers)
+            level_results += [BulkResult(len(level_results) + i, dataset_id, error=Exception("An upstream Dataset could not be ingested."))
+                              for i, dataset_id in enumerate(blocked)]
+            failed.update(result.key for result in level_results if not result.ok)
+            results.append(level_results)
+
+        self.logger.info(f"{sum(len(level) for level in levels) - len(failed)} downstream Datasets were re-ingested successfully, {len(failed)} failed.")
+        return results
+
+    def download_datasets(self, datasets: list, dest: str = "./", max_workers: int = 4, skip_existing: bool = True, progress_callback=None) -> list:
+        """
+        Downloads all files of several unstructured datasets concurrently, each one into its own subdirectory.
+
+        Args:
+            datasets (list): The datasets, as Dataset objects or dataset ids.
+            dest (str, optional): The directory the subdirectories are created in. Defaults to the current directory.
+            max_workers (int, optional): The maximum number of downloads at the same time, over all datasets. Defaults to 4.
+            skip_existing (bool, optional): If True, files that already exist with the size reported by the server
+                are not downloaded again. Defaults to True.
+            progress_callback (callable, optional): Called with (finished_files, total_files, result) after every file.
+
+        Returns:
+            list[BulkResult]: One result per file, grouped by dataset. "value" holds the local path.
+
+        Raises:
+            Exception: If the files of a dataset can not be listed.
+
+        Description:
+            The files of every dataset are listed with one request per dataset. All files then share a single pool of
+            workers, so a dataset with many small files and one with a few large ones are downloaded at the same time.
+            The files of a dataset are saved to "dest/<dataset_id>/". See 'Dataset.download_all' for the details.
+
+        Example:
+            ```python
+            results = workspace.download_datasets(workspace.get_all_datasets(), "./export", max_workers=8)
+            ```
+        """
+        def list_files(dataset):
+            # A freshly loaded Dataset already holds its files, a given one is refreshed
+            if not isinstance(dataset, Dataset):
+                dataset = Dataset(self.connection, self.id, dataset)
+                files_info = dataset.content["schema"]["files"]
+            else:
+                files_info = dataset._get_all_schema_files_json(self.id, dataset.id)
+            return _plan_file_downloads(self.id, dataset.id, files_info, os.path.join(dest, dataset.id))
+
+        listings = run_bulk(datasets, list_files, max_workers, key=lambda dataset: dataset.id if isinstance(dataset, Dataset) else dataset)
+        for listing in listings:
+            if not listing.ok:
+                raise Exception(f"The Files of Dataset '{listing.key}' could not be listed: {str(listing.error)}")
+
+        plans = [plan for listing in listings for plan in listing.value]
+        return _download_files(self.connection, plans, max_workers, skip_existing, progress_callback)
+
+    def plan_continuation_timers(self, frequencies: dict, costs: dict = None, default_cost: int = 5) -> dict:
+        """
+        Computes staggered continuation timers for many datasets, so that their ingestions do not all start at the same time.
+
+        Args:
+            frequencies (dict): Maps datasets (Dataset objects or dataset ids) to the minutes between two ingestions. 
+                The minutes have to divide a day (e.g. 15, 60, 360, 1440).
+            costs (dict, optional): Maps datasets (Dataset objects or dataset ids) to the expected minutes of one ingestion.
+                Datasets without a cost are estimated from the durations of their past ingestions.
+            default_cost (int, optional): The minutes assumed for datasets without any recorded ingestion. Defaults to 5.
+
+        Returns:
+            dict: Maps dataset ids to their planned timer in the format of 'Dataset.update_continuation_timer', the delay 
+            until the first run and the interval between the runs in milliseconds, e.g. {"id": ["1200000", "3600000"]} for 
+            every hour starting after 20 minutes.
+
+        Raises:
+            Exception: If a frequency does not divide a day.
+
+        Description:
+            Every dataset keeps its frequency, only the minute its ingestions start at is moved. The datasets are placed
+            one after another, the most expensive first, at the offset that keeps the peak number of concurrent 
+            ingestions lowest. The peak before (all starting at once) and after the planning is logged.
+
+        Notes:
+            - The durations of past ingestions are read from the change logs of the datasets, see 'estimate_ingestion_minutes'.
+              The logs are fetched concurrently. A dataset whose log can not be fetched is planned with "default_cost".
+            - The offsets are counted from the moment the timers are set. Apply all timers of a plan together with 
+              'apply_continuation_timers', so the offsets between the datasets are kept.
+
+        Example:
+            ```python
+            datasets = workspace.get_all_datasets()
+            plan = workspace.plan_continuation_timers({dataset: 60 for dataset in datasets}, costs={datasets[0]: 20})
+            workspace.apply_continuation_timers(plan)
+            ```
+        """
+        costs = {getattr(dataset, "id", dataset): cost for dataset, cost in (costs or {}).items()}
+        datasets = {getattr(dataset, "id", dataset): dataset for dataset in frequencies}
+        frequencies = {getattr(dataset, "id", dataset): frequency for dataset, frequency in frequencies.items()}
+
+        # Only datasets without a given cost need their change log for the estimation
+        def estimate(dataset_id):
+            dataset = datasets[dataset_id]
+            if not isinstance(dataset, Dataset):
+                dataset = Dataset(self.connection, self.id, dataset)
+            return estimate_ingestion_minutes(dataset.get_logs(records=True), default_cost)
+
+        for result in run_bulk([dataset_id for dataset_id in frequencies if dataset_id not in costs], estimate, max_workers=8):
+            if not result.ok:
+                self.logger.warning(f"The ingestion time of Dataset '{result.key}' could not be estimated, {default_cost} minutes are assumed: {str(result.error)}")
+            costs[result.key] = result.value if result.ok else default_cost
+
+        jobs = {dataset_id: (frequency, costs[dataset_id]) for dataset_id, frequency in frequencies.items()}
+        offsets = plan_staggered_offsets(jobs)
+
+        peak_before = max(get_load({dataset_id: (frequency, cost, 0) for dataset_id, (frequency, cost) in jobs.items()}), default=0)
+        peak_after = max(get_load({dataset_id: (frequency, cost, offsets[dataset_id]) for dataset_id, (frequency, cost) in jobs.items()}), default=0)
+        self.logger.info(f"Planned continuation timers for {len(jobs)} Datasets. Peak of concurrent ingestions: {peak_before} unstaggered, {peak_after} staggered.")
+        return {dataset_id: to_timer(jobs[dataset_id][0], offset) for dataset_id, offset in offsets.items()}
+
+    def apply_continuation_timers(self, plan: dict, max_workers: int = 8) -> list:
+        """
+        Sets the continuation timers of many datasets at once.
+
+        Args:
+            plan (dict): Maps dataset ids to their timers, as returned by 'plan_continuation_timers'.
+            max_workers (int, optional): The maximum number of requests at the same time. Defaults to 8.
+
+        Returns:
+            list: One BulkResult per dataset. See 'Dataset.update_continuation_timer'.
+        """
+        def apply(dataset_id):
+            return Dataset(self.connection, self.id, dataset_id).update_continuation_timer(plan[dataset_id])
+
+        results = run_bulk(list(plan), apply, max_workers)
+        for result in results:
+            if not result.ok:
+                self.logger.error(f"The continuation timer for Dataset '{result.key}' could not be updated: {str(result.error)}")
+        return results
+
     def search_datasets(self, query, advanced_search_parameters: dict=None, ignore_errors: bool = False) -> List[Dataset]:
         """
         Searches for datasets in the SEDAR system inside the specified workspace.
@@ -368,7 +736,63 @@ class Workspace:
                 print(e)
         """
         search_results = self._search_datasets(self.id, query, advanced_search_parameters, ignore_errors)
-        return [Dataset(self.connection,self.id, dataset_info["id"]) for dataset_info in search_results]
+        return [Dataset(self.connection,self.id, dataset_info["id"], content=dataset_info) for dataset_info in search_results]
+
+    def iter_search(self, query, page_size: int = 50, max_results: int = None, ignore_errors: bool = False, **filters):
+        """
+        Searches for datasets inside the workspace and yields the hits one by one, requesting further results only when needed.
+
+        Args:
+            query (str): A typical query string for a text based search.
+            page_size (int, optional): The number of hits requested by the first request. Defaults to 50.
+            max_results (int, optional): Stops after this many hits. By default all hits are yielded.
+            ignore_errors (bool, optional): If True, a failing search request ends the iteration instead of raising. Defaults to False.
+            **filters: Advanced search parameters, see 'search_datasets'. The "limit" is managed by the iterator.
+
+        Returns:
+            generator: Dataset instances, built from the search hits.
+
+        Raises:
+            Exception: If a search request fails and "ignore_errors" is False.
+
+        Description:
+            The search endpoint only accepts a "limit" and no offset, so every further request doubles the limit and only 
+            the hits that were not yielded yet are passed on. As every request transfers the earlier hits again, consuming 
+            more than one page transfers fewer than four times the consumed hits, e.g. 101 hits with the default page size 
+            cost 50 + 100 + 200 = 350 transferred hits. Consuming at most one page costs one page. The iteration ends as soon as the server returns fewer hits than requested, or when the caller
+            stops consuming it, so no request is sent for hits that are never used. The Datasets are built from the 
+            documents in the hits, without a further request per hit.
+
+        Notes:
+            - If the index changes during the iteration, hits may move between the pages. Hits are never yielded twice,
+              but a hit that moves before the already consumed ones can be missed.
+
+        Example:
+            workspace = sedar.get_all_workspaces()[0]
+            for dataset in workspace.iter_search("sensor", zone="processed", max_results=500):
+                print(dataset.title)
+        """
+        if "limit" in filters:
+            self.logger.warning("The parameter 'limit' is managed by 'iter_search' and is therefore not being sent. Use 'max_results' instead.")
+            filters.pop("limit")
+
+        seen = set()
+        limit = page_size
+        while True:
+            search_results = self._search_datasets(self.id, query, dict(filters, limit=str(limit)), ignore_errors)
+            if search_results is None:
+                return
+            for dataset_info in search_results:
+                if dataset_info["id"] in seen:
+                    continue
+                seen.add(dataset_info["id"])
+                yield Dataset(self.connection, self.id, dataset_info["id"], content=dataset_info)
+                if max_results is not None and len(seen) >= max_results:
+                    return
+
+            if len(search_results) < limit:
+                return
+            limit *= 2
     
     ######################
     # Ontology Interface #
@@ -466,6 +890,7 @@ class Workspace:
             - Ensure that the ontology file at the provided path exists and is accessible.
             - The ontology file should be in a valid format for the creation to be successful.
             - Ensure that the user has the necessary permissions to create an ontology in the workspace.
+            - The ontology file is streamed from disk while it is uploaded. It is sent uncompressed, as the server parses it as it is.
 
         Example:
             ```python
@@ -853,12 +1278,12 @@ class Workspace:
             raise Exception("Failed to search Datasets. Set the logger level to \"Error\" or below to get more detailed information.")
         
         if response is None and ignore_errors is True:
-            self.warning("The server could not handle the search reqeust, but the 'ignore_errors' parameter is set.")
+            self.logger.warning("The server could not handle the search reqeust, but the 'ignore_errors' parameter is set.")
         
         return response
     
     #--------------------------------------------------------------
-    def _create_dataset(self, workspace_id, datasource_definition, file_paths):
+    def _create_dataset(self, workspace_id, datasource_definition, file_paths, progress_callback=None, shards=None, convert_to=None, validate=False, compression=None):
         resource_path = f"/api/v1/workspaces/{workspace_id}/datasets/create"
 
         # Check if the datasource definition is a file path. 
@@ -871,47 +1296,27 @@ class Workspace:
                 self.logger.error(f"File not found: {datasource_definition}")
                 return None
 
-        # Create the payload with the datasource definition as a json-object and the title of the dataset
-        payload = {
-            "title": datasource_definition.get("name", "Untitled"),
-            "datasource_definition": json.dumps(datasource_definition)
-        }
-
-        # Check if "file_paths" are either a str (= Single file) or a dictionary (= Multiple files)
-        # If we got a single file_path
-        if isinstance(file_paths, str):
-            file_name = os.path.basename(file_paths)
-            # If it is a valid path, open the file and add it to "files"
-            if os.path.exists(file_paths):
-                print(file_name)
-                files = {os.path.splitext(file_name)[0]: (file_name, open(file_paths, 'rb'), "application/vnd.ms-excel")}
-            else:
-                self.logger.error(f"File not found: {file_paths}")
-                return None
-        
-        # If we got a dictionary with multiple file_paths
-        elif isinstance(file_paths, dict):
-            # Open every single file inside "file_paths" and add it to "files"
-            for key, path in file_paths.items():
-                file_name = os.path.basename(path)
-                # If it is a valid path, open the file and add it to "files"
-                if os.path.exists(path):
-                    files[os.path.splitext(file_name)[0]] = (file_name, open(path, 'rb'), "application/vnd.ms-excel")
-                else:
-                    self.logger.error(f"File not found: {path}")
-                    return None
+        # Fail fast, before a broken definition burns a whole ingestion run on the server
+        if validate:
+            validate_datasource_definition(datasource_definition, file_paths)
 
-        # Throw error if we do not get a dict or str as "file_paths"
-        else:
-            self.logger.error(f"Invalid type for files_pats: {type(file_paths)}")
+        # Collect the source files. They are streamed from disk while the request is sent.
+        files = self.connection._collect_upload_files(file_paths)
+        if files is None:
             return None
 
-        response = self.connection._post_resource(resource_path, data=payload, files=files)
+        # Prepared files (e.g. converted ones) only live until the upload is done
+        with tempfile.TemporaryDirectory(prefix="sedarapi-") as work_dir:
+            # Apply the requested local preparation (e.g. sharding), which may rewrite the datasource definition
+            datasource_definition, files = prepare_upload(datasource_definition, files, work_dir, shards, convert_to, compression)
+
+            # Create the payload with the datasource definition as a json-object and the title of the dataset
+            payload = {
+                "title": datasource_definition.get("name", "Untitled"),
+                "datasource_definition": json.dumps(datasource_definition)
+            }
 
-        # Close all opened files
-        for file_tuple in files.values():
-            file_obj = file_tuple[1]  # Get the file object from the tuple
-            file_obj.close()
+            response = self.connection._upload_resource("POST", resource_path, data=payload, files=files, progress_callback=progress_callback)
 
         if response is None:
             raise Exception("The Dataset could not be created. Set the logger level to \"Error\" or below to get more detailed information.")
@@ -919,6 +1324,49 @@ class Workspace:
         self.logger.info("Dataset was created successfully.")
         return response
 
+    #--------------------------------------------------------------
+    # Helpers for bulk dataset creation
+    #--------------------------------------------------------------
+    def _list_dataset_specs(self, specs):
+        # A directory is turned into one spec (a file path) per file
+        if isinstance(specs, str):
+            if not os.path.isdir(specs):
+                raise Exception(f"Directory not found: {specs}")
+            specs = [os.path.join(specs, file_name) for file_name in sorted(os.listdir(specs))
+                     if not file_name.startswith(".") and os.path.isfile(os.path.join(specs, file_name))]
+        return specs
+
+    #--------------------------------------------------------------
+    def _create_dataset_from_spec(self, spec, naming_rule, upload_options):
+        if isinstance(spec, str):
+            # The definition is inferred inside the worker, so the sampling runs in parallel as well
+            spec = (infer_datasource_definition(spec, name=naming_rule(spec) if naming_rule is not None else None), spec)
+        datasource_definition, file_paths = spec
+        return self.create_dataset(datasource_definition, file_paths, **upload_options)
+
+    #--------------------------------------------------------------
+    def _find_dataset_record(self, title, journal):
+        # Looks for a dataset created by an interrupted bulk run. Returns its journal record or None.
+        # Datasets whose ids are recorded for other items were created by those, even if they have the same title.
+        recorded_ids = set()
+        for item in journal.get_items(FINISHED):
+            entry = journal.get(item)
+            if entry is not None and isinstance(entry[1], dict):
+                recorded_ids.add(entry[1].get("id"))
+
+        for dataset_info in self._get_all_datasets_json(self.id):
+            if dataset_info.get("title") == title and dataset_info.get("id") not in recorded_ids:
+                return {"id": dataset_info["id"]}
+        return None
+
+    #--------------------------------------------------------------
+    def _get_dataset_spec_name(self, spec, naming_rule):
+        if isinstance(spec, str):
+            return naming_rule(spec) if naming_rule is not None else self.connection._remove_file_extension(os.path.basename(spec))
+        if isinstance(spec[0], dict):
+            return spec[0].get("name", str(spec[1]))
+        return str(spec[0])
+
     #--------------------------------------------------------------
     # Ontology related Operations
     #--------------------------------------------------------------
@@ -950,21 +1398,20 @@ class Workspace:
         }
         
         # Check if the given file_path is valid
-        if os.path.exists(file_path):
-            # Open the Ontology file and save it as "ontology_file"
-            with open(file_path, 'rb') as file:
-                mimetype = Commons._check_mimetype(file_path)
-                ontology_file = {'file': (os.path.basename(file_path), file, mimetype)}
-                
-                response = self.connection._post_resource(resource_path, data=payload, files=ontology_file)
-                if response is None:
-                    raise Exception("The Ontology could not be created. Set the logger level to \"Error\" or below to get more detailed information.")
-
-                self.logger.info(f"The Ontology '{title}' was created successfully.")
-                return response
-        else:
+        if not os.path.exists(file_path):
             self.logger.error(f"File not found: {file_path}")
             return None
+
+        # The ontology file is streamed from disk while the request is sent
+        mimetype = Commons._check_mimetype(file_path)
+        ontology_file = {'file': (os.path.basename(file_path), file_path, mimetype)}
+        response = self.connection._upload_resource("POST", resource_path, data=payload, files=ontology_file)
+
+        if response is None:
+            raise Exception("The Ontology could not be created. Set the logger level to \"Error\" or below to get more detailed information.")
+
+        self.logger.info(f"The Ontology '{title}' was created successfully.")
+        return response
     
     #--------------------------------------------------------------
     def _search_ontologies(self, workspace_id, querystring, graph_name, is_query):
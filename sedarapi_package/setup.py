@@ -7,6 +7,10 @@ setup(
     install_requires=[
         "requests"
     ],
+    extras_require={
+        "parquet": ["pyarrow"],
+        "zstd": ["zstandard"]
+    },
     author="Nico Kuth",
     author_email="nico.kuth@stud.hn.de",
     description="Eine abstrahierende Schnittstelle für die Interaktion mit der API des Data Lakes 'SEDAR'",
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+import requests
+
+from sedarapi.commons import Commons
+
+#--------------------------------------------------------------
+# An in-process stand-in for the SEDAR server
+#--------------------------------------------------------------
+class FakeResponse:
+    def __init__(self, status_code=200, body=None, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        if isinstance(body, (bytes, type(None))):
+            self.content = body or b""
+        else:
+            self.content = json.dumps(body).encode("utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error", response=self)
+
+    def iter_content(self, chunk_size=1):
+        for position in range(0, len(self.content), chunk_size):
+            yield self.content[position:position + chunk_size]
+
+
+class FakeSession:
+    """
+    Answers the requests of a connection from registered routes and records every request.
+
+    A route maps (method, path) to a response body, a FakeResponse or a callable that is called with
+    (method, path, json, headers, body) and returns one of them. Streamed request bodies are read completely.
+    """
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.routes = {}
+        self.requests = []
+
+    def route(self, method, path, answer):
+        self.routes[(method, path)] = answer
+
+    def request(self, method, url, json=None, data=None, headers=None, stream=False, files=None):
+        path = url[len(self.base_url):]
+        body = b"".join(data) if data is not None and not isinstance(data, (bytes, str, dict)) else data
+        self.requests.append((method, path, json, headers or {}, body))
+        if (method, path) not in self.routes:
+            return FakeResponse(404, {"error": f"No route for {method} {path}"})
+
+        answer = self.routes[(method, path)]
+        if callable(answer):
+            answer = answer(method, path, json, headers or {}, body)
+        return answer if isinstance(answer, FakeResponse) else FakeResponse(200, answer)
+
+    def get(self, url, json=None, headers=None, stream=False):
+        return self.request("GET", url, json=json, headers=headers, stream=stream)
+
+    def post(self, url, json=None, data=None, files=None):
+        return self.request("POST", url, json=json, data=data, files=files)
+
+    def put(self, url, json=None, data=None, files=None):
+        return self.request("PUT", url, json=json, data=data, files=files)
+
+    def patch(self, url, json=None):
+        return self.request("PATCH", url, json=json)
+
+    def delete(self, url, json=None):
+        return self.request("DELETE", url, json=json)
+
+
+@pytest.fixture
+def connection():
+    connection = Commons("http://sedar")
+    connection.session = FakeSession(connection.base_url)
+    return connection
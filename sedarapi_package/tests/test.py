@@ -184,12 +184,12 @@ if __name__ == "__main__":
 
         # Ingest our updated Dataset
         print("Ingest our updated Dataset...")
-        ingest_res = new_dataset.ingest()
+        ingest_res = new_dataset.ingest(return_job=True).wait(timeout=3600)
         print("Success!\n")
 
         # Publish our Dataset
         print("Publish our Dataset...")
-        new_dataset.publish()
+        new_dataset.publish(return_job=True).wait(timeout=3600)
         print("Success!\n")
 
         # Get the logs of our Dataset
@@ -0,0 +1,57 @@
+from sedarapi.bulk import run_bulk
+from sedarapi.journal import FAILED
+from sedarapi.journal import FINISHED
+from sedarapi.journal import JobJournal
+from sedarapi.journal import STARTED
+
+#--------------------------------------------------------------
+# Bulk operations with a journal
+#--------------------------------------------------------------
+class _Created:
+    def __init__(self, id):
+        self.id = id
+
+def test_run_bulk_records_objects_by_id_and_resumes(tmp_path):
+    journal = JobJournal(str(tmp_path / "journal.db"))
+    results = run_bulk(["a", "b"], lambda item: _Created(f"id-{item}"), journal=journal)
+    assert all(result.ok for result in results)
+    assert journal.get("a") == (FINISHED, "id-a", None)
+
+    calls = []
+    results = run_bulk(["a", "b"], lambda item: calls.append(item), journal=journal)
+    assert calls == []
+    assert [result.value for result in results] == ["id-a", "id-b"]
+    assert all(result.resumed for result in results)
+
+def test_run_bulk_keeps_result_if_journal_write_fails(tmp_path):
+    journal = JobJournal(str(tmp_path / "journal.db"))
+
+    def record(value):
+        raise TypeError("not serializable")
+
+    results = run_bulk(["a"], lambda item: item.upper(), journal=journal, record=record)
+    assert results[0].ok and results[0].value == "A"
+    assert journal.get("a")[0] == STARTED
+
+def test_run_bulk_reconciles_started_items(tmp_path):
+    journal = JobJournal(str(tmp_path / "journal.db"))
+    journal.start("a")
+    journal.start("b")
+
+    calls = []
+    results = run_bulk(["a", "b"], lambda item: calls.append(item) or item, journal=journal,
+                       reconcile=lambda item: {"id": "found"} if item == "a" else None)
+    assert calls == ["b"]
+    assert results[0].resumed and results[0].value == {"id": "found"}
+    assert journal.get("b") == (FINISHED, "b", None)
+
+def test_run_bulk_records_failures(tmp_path):
+    journal = JobJournal(str(tmp_path / "journal.db"))
+
+    def fail(item):
+        raise Exception("server error")
+
+    results = run_bulk(["a", "b"], fail, journal=journal, stop_on_error=True, max_workers=1)
+    assert len(results) == 1 and not results[0].ok
+    assert journal.get("a") == (FAILED, None, "server error")
+    assert journal.get_items(FAILED) == ["a"]
@@ -0,0 +1,76 @@
+import logging
+
+from sedarapi.catalog import CatalogIndex
+from sedarapi.catalog import tokenize
+
+#--------------------------------------------------------------
+# Local catalog index
+#--------------------------------------------------------------
+def _dataset(id, title, description="", tags=(), updated="1"):
+    return {"id": id, "title": title, "description": description, "isPublic": False, "isFavorite": False, "author": "",
+            "longitude": "", "latitude": "", "license": "", "language": "", "tags": list(tags), "lastUpdatedOn": updated,
+            "datasource": {"currentRevision": 0}}
+
+class _Server:
+    # Answers the dataset requests of 'CatalogIndex.refresh'
+    def __init__(self, datasets):
+        self.datasets = datasets
+        self.logger = logging.getLogger("SedarAPI-Logger")
+
+    def _get_resource(self, resource_path):
+        return self.datasets[resource_path.rsplit("/", 1)[1]]
+
+class _Workspace:
+    def __init__(self, id, server, dataset_ids):
+        self.id = id
+        self.connection = server
+        self.logger = server.logger
+        self.content = {"id": id, "title": f"Workspace {id}", "description": ""}
+        self.dataset_ids = dataset_ids
+
+    def _get_all_datasets_json(self, workspace_id):
+        return [{"id": dataset_id, "lastUpdatedOn": self.connection.datasets[dataset_id]["lastUpdatedOn"]} for dataset_id in self.dataset_ids]
+
+def _index():
+    index = CatalogIndex()
+    index.add_dataset(_dataset("1", "Temperature sensors", "Hourly readings of the roof sensors", tags=["weather"]), "w")
+    index.add_dataset(_dataset("2", "Sales", "Monthly sales per region, with temperature"), "w")
+    index.add_dataset(_dataset("3", "Customer orders", tags=[{"title": "sales"}]), "w")
+    return index
+
+def test_tokenize_splits_camel_and_snake_case():
+    assert tokenize("sensorReadings_v2 HTTPServer") == ["sensor", "readings", "v", "2", "httpserver"]
+
+def test_search_ranks_title_matches_first():
+    hits = _index().search("temperature")
+    assert [hit.id for hit in hits] == ["1", "2"]
+
+def test_search_indexes_string_and_document_tags():
+    index = _index()
+    assert [hit.id for hit in index.search("weather")] == ["1"]
+    assert "3" in [hit.id for hit in index.search("sales")]
+
+def test_search_matches_prefixes_and_typos():
+    index = _index()
+    assert [hit.id for hit in index.search("temperature sens")][0] == "1"
+    assert [hit.id for hit in index.search("custmer", prefix=False)] == ["3"]
+    assert index.search("custmer", prefix=False, fuzzy=False) == []
+
+def test_save_and_load_keep_the_results(tmp_path):
+    index = _index()
+    index.save(str(tmp_path / "catalog.json"))
+    loaded = CatalogIndex.load(str(tmp_path / "catalog.json"))
+    assert [(hit.id, round(hit.score, 6)) for hit in loaded.search("sales")] == [(hit.id, round(hit.score, 6)) for hit in index.search("sales")]
+
+def test_refresh_fetches_changes_and_drops_missing_workspaces():
+    server = _Server({"1": _dataset("1", "Temperature"), "2": _dataset("2", "Sales"), "3": _dataset("3", "Orders")})
+    first, second = _Workspace("a", server, ["1", "2"]), _Workspace("b", server, ["3"])
+    index = CatalogIndex()
+    assert index.refresh([first, second]) == {"added": 3, "updated": 0, "removed": 0, "unchanged": 0}
+
+    server.datasets["2"] = _dataset("2", "Revenue", updated="2")
+    first.dataset_ids = ["2"]
+    assert index.refresh([first]) == {"added": 0, "updated": 1, "removed": 2, "unchanged": 0}
+    assert [hit.id for hit in index.search("revenue")] == ["2"]
+    assert index.search("orders") == [] and index.search("temperature") == []
+    assert len(index) == 2
@@ -0,0 +1,53 @@
+from datetime import datetime
+from datetime import timezone
+
+from sedarapi.changelog import filter_dataset_logs
+from sedarapi.dataset import Dataset
+
+#--------------------------------------------------------------
+# Dataset change logs
+#--------------------------------------------------------------
+LOGS = [
+    {"version": 1, "createdOn": "2024-01-01T10:00:00", "user": {"username": "ann"}, "changes": [{"key": "title", "from": "a", "to": "b"}]},
+    {"version": 3, "createdOn": "2024-03-01T10:00:00", "user": {"username": "bob"}, "changes": [{"key": "description", "from": "", "to": "x"}]},
+    {"version": 2, "createdOn": "2024-02-01T10:00:00", "user": {"username": "ann"}, "changes": [{"key": "title", "from": "b", "to": "c"}]}
+]
+
+def test_filter_dataset_logs_orders_by_version():
+    assert [record.version for record in filter_dataset_logs(LOGS)] == [1, 2, 3]
+
+def test_filter_dataset_logs_by_newest_versions_time_and_keys():
+    assert [record.version for record in filter_dataset_logs(LOGS, newest=2)] == [2, 3]
+    assert [record.version for record in filter_dataset_logs(LOGS, versions=(2, None))] == [2, 3]
+    assert [record.version for record in filter_dataset_logs(LOGS, since="2024-02-01T10:00:00", until=datetime(2024, 3, 1, 10))] == [2]
+    assert [record.version for record in filter_dataset_logs(LOGS, keys=["title"], newest=1)] == [2]
+
+def test_dataset_log_record_is_readable():
+    record = filter_dataset_logs(LOGS, versions=(1, 1))[0]
+    assert record.username == "ann" and record.changed_keys == ["title"]
+    assert "Changed 'title' from 'a' to 'b'" in str(record)
+
+def test_filter_dataset_logs_skips_entries_without_version_for_a_version_range():
+    logs = LOGS + [{"createdOn": "2024-04-01T10:00:00", "user": {"username": "ann"}, "changes": []}]
+    assert [record.version for record in filter_dataset_logs(logs, versions=(2, None))] == [2, 3]
+    assert len(filter_dataset_logs(logs)) == 4
+
+def test_filter_dataset_logs_compares_aware_and_naive_times():
+    logs = LOGS + [{"version": 4, "createdOn": "2024-04-01T12:00:00+02:00", "user": {"username": "ann"}, "changes": []}]
+    since = datetime(2024, 3, 1, 10, tzinfo=timezone.utc)
+    assert [record.version for record in filter_dataset_logs(logs, since=since)] == [3, 4]
+    assert [record.version for record in filter_dataset_logs(logs, since="2024-04-01T10:00:00")] == [4]
+    assert [record.version for record in filter_dataset_logs(logs, until="2024-04-01T10:00:00")] == [1, 2, 3]
+
+#--------------------------------------------------------------
+# Dataset.get_logs
+#--------------------------------------------------------------
+def test_get_logs_returns_formatted_strings_by_default(connection):
+    connection.session.route("GET", "/api/v1/workspaces/w/datasets/d/logs", [dict(log, description={"en": "Edited"}) for log in LOGS])
+    content = {"title": "t", "description": "", "isPublic": False, "isFavorite": False, "author": "", "longitude": "", "latitude": "",
+               "license": "", "language": "", "datasource": {"currentRevision": 0}}
+    dataset = Dataset(connection, "w", "d", content=content)
+
+    logs = dataset.get_logs()
+    assert logs[0] == "Version: 1, Created On: 2024-01-01T10:00:00, User: ann\nDescription: Edited\n\tChanged 'title' from 'a' to 'b'\n"
+    assert [record.version for record in dataset.get_logs(keys=["title"], records=True)] == [1, 2]
@@ -0,0 +1,67 @@
+import gzip
+
+import pytest
+
+from sedarapi.sourcefiles import CompressingReader
+from sedarapi.sourcefiles import compress_file
+from sedarapi.sourcefiles import prepare_upload
+from sedarapi.upload import MultipartStream
+
+#--------------------------------------------------------------
+# Compression while uploading
+#--------------------------------------------------------------
+DEFINITION = {"read_format": "csv", "read_options": {"header": "true"}}
+
+def test_reader_compresses_files_and_segments(tmp_path):
+    source = tmp_path / "data.csv"
+    source.write_bytes(b"id\n" + b"1\n" * 10000)
+
+    reader = CompressingReader([b"id\n", (str(source), 3, 9)], chunk_size=4)
+    blocks = list(iter(lambda: reader.read(5), b""))
+    assert all(len(block) <= 5 for block in blocks)
+    assert gzip.decompress(b"".join(blocks)) == b"id\n1\n1\n1\n"
+    assert gzip.decompress(CompressingReader(str(source)).read()) == source.read_bytes()
+
+def test_compressed_file_is_deterministic(tmp_path):
+    source = tmp_path / "data.csv"
+    source.write_bytes(b"id\n1\n")
+
+    first = compress_file(str(source), str(tmp_path / "first.csv.gz"))
+    second = compress_file(str(source), str(tmp_path / "second.csv.gz"))
+    assert open(first, "rb").read() == open(second, "rb").read()
+    assert gzip.decompress(open(first, "rb").read()) == b"id\n1\n"
+
+def test_upload_files_are_compressed_without_copies(tmp_path):
+    source = tmp_path / "data.csv"
+    source.write_bytes(b"id\n1\n")
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+
+    definition, files = prepare_upload(DEFINITION, {"data": ("data.csv", str(source), "text/csv")}, str(work_dir), compression="gzip")
+    assert definition["read_options"] == {"header": "true"}
+    assert files["data"][0] == "data.csv.gz" and files["data"][2] == "application/gzip"
+    assert list(work_dir.iterdir()) == []
+
+    stream = MultipartStream({}, files)
+    assert stream.length is None
+    with pytest.raises(TypeError):
+        len(stream)
+    body = b"".join(stream)
+    start = body.index(b"\r\n\r\n") + 4
+    assert gzip.decompress(body[start:body.rindex(b"\r\n--")]) == b"id\n1\n"
+    assert stream.get_stats()["total_bytes"] is None
+
+def test_compressed_upload_is_sent_chunked(connection, tmp_path):
+    source = tmp_path / "data.csv"
+    source.write_bytes(b"id\n1\n")
+    connection.session.route("POST", "/api/v1/workspaces/w/datasets", {"id": "new"})
+    progress = []
+
+    _, files = prepare_upload(DEFINITION, {"data": ("data.csv", str(source), "text/csv")}, str(tmp_path), compression="gzip")
+    assert connection._upload_resource("POST", "/api/v1/workspaces/w/datasets", {}, files, lambda sent, total: progress.append(total)) == {"id": "new"}
+    assert b'filename="data.csv.gz"' in connection.session.requests[0][4]
+    assert progress and set(progress) == {None}
+
+def test_parquet_files_are_not_compressed(tmp_path):
+    with pytest.raises(Exception):
+        prepare_upload({"read_format": "parquet"}, {"data": ("data.parquet", str(tmp_path), None)}, str(tmp_path), compression="gzip")
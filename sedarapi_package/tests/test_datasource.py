@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from sedarapi.datasource import infer_datasource_definition
+from sedarapi.datasource import validate_datasource_definition
+
+#--------------------------------------------------------------
+# Inference and validation of datasource definitions
+#--------------------------------------------------------------
+def test_infer_csv_definition(tmp_path):
+    source = tmp_path / "sensors.csv"
+    source.write_text("sensor_id;value;day;active\n1;0.5;2024-01-01;true\n2;3;2024-01-02;false\n3;7;2024-01-03;true\n")
+    definition = infer_datasource_definition(str(source))
+
+    assert definition["name"] == "sensors" and definition["source_files"] == ["sensors"]
+    assert definition["read_format"] == "csv"
+    assert definition["read_options"]["delimiter"] == ";"
+    assert definition["read_options"]["header"] == "true"
+    assert definition["read_options"]["schema"] == "`sensor_id` INT, `value` DOUBLE, `day` DATE, `active` BOOLEAN"
+    assert definition["id_column"] == "sensor_id"
+
+def test_infer_json_lines_definition(tmp_path):
+    source = tmp_path / "events.json"
+    source.write_text("\n".join(json.dumps(record) for record in [{"key": "a", "count": 1}, {"key": "b", "count": 2**40}]) + "\n")
+    definition = infer_datasource_definition(str(source), name="Events")
+
+    assert definition["name"] == "Events"
+    assert definition["read_format"] == "json"
+    assert definition["read_options"]["schema"] == "`key` STRING, `count` BIGINT"
+    assert definition["id_column"] == "key"
+
+def test_validate_accepts_the_inferred_definition(tmp_path):
+    source = tmp_path / "sensors.csv"
+    source.write_text("id,value\n1,0.5\n2,1.5\n")
+    assert validate_datasource_definition(infer_datasource_definition(str(source)), str(source))
+
+def test_validate_lists_every_problem(tmp_path):
+    source = tmp_path / "sensors.csv"
+    source.write_text("id;value\n1;x\n1;2\n")
+    definition = {"read_format": "csv", "read_options": {"header": "true", "delimiter": ";", "schema": "id INT, value INT"},
+                  "id_column": "id", "source_files": ["other"]}
+
+    with pytest.raises(Exception) as error:
+        validate_datasource_definition(definition, str(source))
+    message = str(error.value)
+    assert "'other' is listed in 'source_files'" in message
+    assert "'sensors' is not listed" in message
+    assert "The value 'x' of column 'value'" in message
+    assert "is not unique" in message
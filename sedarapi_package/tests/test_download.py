@@ -0,0 +1,123 @@
+import hashlib
+import os
+
+import pytest
+from conftest import FakeResponse
+
+from sedarapi.file import _download_files
+from sedarapi.file import _plan_file_downloads
+
+#--------------------------------------------------------------
+# Resumable downloads
+#--------------------------------------------------------------
+DATA = b"0123456789" * 10
+PATH = "/api/v1/workspaces/w/datasets/d/files/f"
+
+def _serve(connection, data=DATA, validator='"v1"'):
+    # Answers Range requests like a HTTP server, including 416 for ranges at or behind the end
+    def answer(method, path, json, headers, body):
+        if "Range" in headers:
+            offset = int(headers["Range"][len("bytes="):-1])
+            if offset >= len(data):
+                return FakeResponse(416, b"", {"Content-Range": f"bytes */{len(data)}"})
+            if headers.get("If-Range", validator) == validator:
+                return FakeResponse(206, data[offset:], {"Content-Range": f"bytes {offset}-{len(data) - 1}/{len(data)}",
+                                                         "Content-Length": str(len(data) - offset), "ETag": validator})
+        return FakeResponse(200, data, {"Content-Length": str(len(data)), "ETag": validator})
+    connection.session.route("GET", PATH, answer)
+
+def _ranges(connection):
+    return [request[3].get("Range") for request in connection.session.requests]
+
+def test_download_is_written_completely(connection, tmp_path):
+    _serve(connection)
+    target = str(tmp_path / "file.bin")
+    progress = []
+
+    assert connection._download_resource(PATH, target, progress_callback=lambda written, total: progress.append((written, total)), chunk_size=30) == target
+    assert open(target, "rb").read() == DATA
+    assert progress[-1] == (len(DATA), len(DATA))
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["file.bin"]
+
+def test_part_file_is_continued_with_a_range_request(connection, tmp_path):
+    _serve(connection)
+    target = str(tmp_path / "file.bin")
+    (tmp_path / "file.bin.part").write_bytes(DATA[:40])
+    (tmp_path / "file.bin.part.validator").write_text('"v1"')
+
+    assert connection._download_resource(PATH, target) == target
+    assert open(target, "rb").read() == DATA
+    assert _ranges(connection) == ["bytes=40-"]
+    assert connection.session.requests[0][3]["If-Range"] == '"v1"'
+
+def test_changed_resource_is_downloaded_again(connection, tmp_path):
+    _serve(connection, validator='"v2"')
+    target = str(tmp_path / "file.bin")
+    (tmp_path / "file.bin.part").write_bytes(b"x" * 40)
+    (tmp_path / "file.bin.part.validator").write_text('"v1"')
+
+    assert connection._download_resource(PATH, target) == target
+    assert open(target, "rb").read() == DATA
+
+def test_complete_part_file_is_verified_on_416(connection, tmp_path):
+    _serve(connection)
+    target = str(tmp_path / "file.bin")
+    (tmp_path / "file.bin.part").write_bytes(DATA)
+
+    assert connection._download_resource(PATH, target, checksum=hashlib.sha256(DATA).hexdigest()) == target
+    assert open(target, "rb").read() == DATA
+    assert _ranges(connection) == [f"bytes={len(DATA)}-"]
+
+def test_part_file_with_a_wrong_size_is_restarted_on_416(connection, tmp_path):
+    _serve(connection)
+    target = str(tmp_path / "file.bin")
+    (tmp_path / "file.bin.part").write_bytes(DATA + b"garbage")
+
+    assert connection._download_resource(PATH, target) == target
+    assert open(target, "rb").read() == DATA
+    assert _ranges(connection) == [f"bytes={len(DATA) + 7}-", None]
+
+def test_part_file_with_a_wrong_checksum_is_restarted_on_416(connection, tmp_path):
+    _serve(connection)
+    target = str(tmp_path / "file.bin")
+    (tmp_path / "file.bin.part").write_bytes(b"x" * len(DATA))
+
+    assert connection._download_resource(PATH, target, checksum=hashlib.sha256(DATA).hexdigest()) == target
+    assert open(target, "rb").read() == DATA
+    assert _ranges(connection) == [f"bytes={len(DATA)}-", None]
+
+def test_wrong_checksum_removes_the_download(connection, tmp_path):
+    _serve(connection)
+    target = str(tmp_path / "file.bin")
+
+    with pytest.raises(Exception, match="checksum"):
+        connection._download_resource(PATH, target, checksum="0" * 64)
+    assert list(tmp_path.iterdir()) == []
+
+def test_missing_directory_and_http_errors_return_none(connection, tmp_path):
+    assert connection._download_resource(PATH, str(tmp_path / "missing" / "file.bin")) is None
+    assert connection._download_resource("/api/v1/unknown", str(tmp_path / "file.bin")) is None
+    assert connection.session.requests == [("GET", "/api/v1/unknown", None, {}, None)]
+
+#--------------------------------------------------------------
+# Bulk downloads
+#--------------------------------------------------------------
+def test_planned_targets_stay_inside_the_directory(tmp_path):
+    files_info = [{"id": "1", "filename": "../../etc/passwd"}, {"id": "2", "filename": "..\\..\\evil.txt"},
+                  {"id": "3", "filename": ".."}, {"id": "4", "filename": "image.png", "sizeInBytes": 3}, {"id": "5"}]
+    plans = _plan_file_downloads("w", "d", files_info, str(tmp_path))
+
+    assert [os.path.relpath(target_path, tmp_path) for _, _, target_path, _ in plans] == ["passwd", "evil.txt", "3", "image.png", "5"]
+    assert plans[3] == ("image.png", "/api/v1/workspaces/w/datasets/d/files/4", str(tmp_path / "image.png"), 3)
+
+def test_download_files_skips_existing_and_reports_failures(connection, tmp_path):
+    _serve(connection)
+    (tmp_path / "existing.bin").write_bytes(b"abc")
+    plans = [("new.bin", PATH, str(tmp_path / "sub" / "new.bin"), len(DATA)),
+             ("existing.bin", "/api/v1/unknown", str(tmp_path / "existing.bin"), 3),
+             ("missing.bin", "/api/v1/unknown", str(tmp_path / "missing.bin"), None)]
+
+    results = _download_files(connection, plans, max_workers=2)
+    assert [result.ok for result in results] == [True, True, False]
+    assert open(tmp_path / "sub" / "new.bin", "rb").read() == DATA
+    assert [request[1] for request in connection.session.requests].count("/api/v1/unknown") == 1
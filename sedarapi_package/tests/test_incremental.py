@@ -0,0 +1,67 @@
+from sedarapi.sourcefiles import plan_incremental_upload
+from sedarapi.sourcefiles import plan_tail
+
+#--------------------------------------------------------------
+# Incremental uploads
+#--------------------------------------------------------------
+DEFINITION = {"read_format": "csv", "read_options": {"header": "true"}, "id_column": "id", "source_files": ["a", "b"]}
+
+def _files(tmp_path):
+    return {"a": ("a.csv", str(tmp_path / "a.csv"), "text/csv"), "b": ("b.csv", str(tmp_path / "b.csv"), "text/csv")}
+
+def _read(segments):
+    data = b""
+    for segment in segments:
+        if isinstance(segment, bytes):
+            data += segment
+        else:
+            path, start, end = segment
+            with open(path, "rb") as f:
+                f.seek(start)
+                data += f.read(end - start)
+    return data
+
+def test_plan_tail_keeps_header_and_skips_unterminated_line(tmp_path):
+    source = tmp_path / "a.csv"
+    source.write_bytes(b"id,v\n1,a\n")
+    _, state = plan_tail(str(source), has_header=True)
+
+    source.write_bytes(b"id,v\n1,a\n2,b\n3,")
+    segments, state = plan_tail(str(source), state, has_header=True)
+    assert _read(segments) == b"id,v\n2,b\n"
+    assert state["lines"] == 3
+
+def test_first_upload_replaces_the_dataset(tmp_path):
+    (tmp_path / "a.csv").write_bytes(b"id\n1\n")
+    (tmp_path / "b.csv").write_bytes(b"id\n2\n")
+    definition, files, _ = plan_incremental_upload(DEFINITION, _files(tmp_path))
+
+    assert definition["write_type"] == "DEFAULT"
+    assert files["a"][0] == "a.csv"
+
+def test_files_without_tail_are_dropped_from_source_files(tmp_path):
+    (tmp_path / "a.csv").write_bytes(b"id\n1\n")
+    (tmp_path / "b.csv").write_bytes(b"id\n2\n")
+    _, _, states = plan_incremental_upload(DEFINITION, _files(tmp_path))
+
+    with open(tmp_path / "a.csv", "ab") as f:
+        f.write(b"3\n")
+    definition, files, _ = plan_incremental_upload(DEFINITION, _files(tmp_path), states)
+
+    assert definition["write_type"] == "DELTA"
+    assert definition["source_files"] == ["a"]
+    assert list(files) == ["a"]
+    assert _read(files["a"][1]) == b"id\n3\n"
+
+def test_changed_prefix_uploads_all_files_with_overwrite(tmp_path):
+    (tmp_path / "a.csv").write_bytes(b"id\n1\n")
+    (tmp_path / "b.csv").write_bytes(b"id\n2\n")
+    _, _, states = plan_incremental_upload(DEFINITION, _files(tmp_path))
+
+    (tmp_path / "a.csv").write_bytes(b"id\n9\n4\n")
+    definition, files, _ = plan_incremental_upload(DEFINITION, _files(tmp_path), states)
+
+    assert definition["write_type"] == "DEFAULT"
+    assert definition["source_files"] == ["a", "b"]
+    assert _read(files["a"][1]) == b"id\n9\n4\n"
+    assert _read(files["b"][1]) == b"id\n2\n"
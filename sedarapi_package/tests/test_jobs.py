@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from sedarapi.dataset import Dataset
+from sedarapi.jobs import Job
+
+#--------------------------------------------------------------
+# Job handles
+#--------------------------------------------------------------
+def test_wait_returns_the_value_and_times_out(connection):
+    job = Job("test", lambda: (False, None), connection.jobs, initial_interval=60)
+    with pytest.raises(TimeoutError):
+        job.wait(timeout=0.01)
+
+    job._finish(value="done")
+    assert job.wait(timeout=0.01) == "done"
+    assert asyncio.run(_await(job)) == "done"
+
+async def _await(job):
+    return await job
+
+def test_failed_poll_ends_the_job(connection):
+    def poll():
+        raise Exception("Ingestion failed")
+
+    job = Job("test", poll, connection.jobs, initial_interval=60)
+    assert job._check() is True
+    with pytest.raises(Exception, match="Ingestion failed"):
+        job.wait(timeout=0.01)
+
+#--------------------------------------------------------------
+# Following ingestions
+#--------------------------------------------------------------
+DATASET = {"id": "d", "title": "Sensors", "description": "", "isPublic": False, "isFavorite": False, "author": "", "longitude": "",
+           "latitude": "", "license": "", "language": "", "datasource": {"currentRevision": 1, "ingestions": [{"revision": 1, "state": "FINISHED"}]}}
+
+def _serve_states(connection, *datasources):
+    # Every poll of the dataset document gets the next datasource, the last one is repeated
+    states = list(datasources)
+    def answer(*request):
+        return dict(DATASET, datasource=states.pop(0) if len(states) > 1 else states[0])
+    connection.session.route("GET", "/api/v1/workspaces/w/datasets/d", answer)
+    connection.session.route("GET", "/api/v1/workspaces/w/datasets/d/run-ingestion", {"currentRevision": 2})
+
+def test_ingest_returns_the_response_by_default(connection):
+    _serve_states(connection, DATASET["datasource"])
+
+    assert Dataset(connection, "w", "d", content=DATASET).ingest() == {"currentRevision": 2}
+    assert [request[1] for request in connection.session.requests] == ["/api/v1/workspaces/w/datasets/d/run-ingestion"]
+
+def test_ingestion_job_follows_the_started_revision(connection):
+    started = {"ingestions": [{"revision": 1, "state": "FINISHED"}, {"revision": 2, "state": "RUNNING"}]}
+    finished = {"ingestions": [{"revision": 1, "state": "FINISHED"}, {"revision": 2, "state": "FINISHED"}]}
+    _serve_states(connection, DATASET["datasource"], started, finished)
+
+    job = Dataset(connection, "w", "d", content=DATASET).ingest(return_job=True)
+    assert job.response == {"currentRevision": 2}
+    assert job._check() is False
+    assert job._check() is True
+    assert job.wait(timeout=0.01).content["datasource"] == finished
+
+def test_failed_ingestion_raises(connection):
+    failed = {"ingestions": [{"revision": 2, "state": "FAILED", "error": "Spark died"}]}
+    _serve_states(connection, DATASET["datasource"], failed)
+
+    job = Dataset(connection, "w", "d", content=DATASET).ingest(return_job=True)
+    job._check()
+    with pytest.raises(Exception, match="Spark died"):
+        job.wait(timeout=0.01)
+
+def test_ingestion_without_records_can_not_be_followed(connection):
+    _serve_states(connection, {"currentRevision": 1})
+
+    job = Dataset(connection, "w", "d", content=DATASET).ingest(return_job=True)
+    job._check()
+    with pytest.raises(Exception, match="does not report ingestion records"):
+        job.wait(timeout=0.01)
+
+#--------------------------------------------------------------
+# Following publish processes
+#--------------------------------------------------------------
+def _serve_documents(connection, *documents):
+    documents = list(documents)
+    connection.session.route("GET", "/api/v1/workspaces/w/datasets/d", lambda *request: documents.pop(0) if len(documents) > 1 else documents[0])
+    connection.session.route("PATCH", "/api/v1/workspaces/w/datasets/d", {"id": "d"})
+
+def test_publish_job_tracks_every_requested_step(connection):
+    before = dict(DATASET, isPublished=True, isIndexed=False, lastUpdatedOn="1")
+    published = dict(DATASET, isPublished=True, isIndexed=False, lastUpdatedOn="2")
+    indexed = dict(DATASET, isPublished=True, isIndexed=True, lastUpdatedOn="3")
+    _serve_documents(connection, before, before, published, indexed)
+
+    job = Dataset(connection, "w", "d", content=DATASET).publish(index=True, return_job=True)
+    assert job._check() is False and job.progress == {"published": False, "indexed": False}
+    assert job._check() is False and job.progress == {"published": True, "indexed": False}
+    assert job._check() is True and job.progress == {"published": True, "indexed": True}
+
+def test_publish_job_fails_without_the_requested_flags(connection):
+    _serve_documents(connection, dict(DATASET, isPublished=False))
+
+    job = Dataset(connection, "w", "d", content=DATASET).publish(index=True, profile=True, return_job=True)
+    job._check()
+    with pytest.raises(Exception, match="does not report isIndexed, isProfiled"):
+        job.wait(timeout=0.01)
@@ -0,0 +1,69 @@
+import pytest
+
+import sedarapi.workspace
+from sedarapi.lineage import build_downstream_graph
+from sedarapi.lineage import get_lineage_edges
+from sedarapi.lineage import get_topological_levels
+
+#--------------------------------------------------------------
+# Dataset lineage
+#--------------------------------------------------------------
+GRAPH = {"root": {"a", "b"}, "a": {"c"}, "b": {"c"}, "c": {"d"}, "d": set()}
+
+def _lineage(dataset_id):
+    return {"attributes": {"id": dataset_id}, "children": [{"attributes": {"id": child_id}} for child_id in sorted(GRAPH[dataset_id])]}
+
+def test_get_lineage_edges_walks_nested_children():
+    lineage = {"id": "root", "children": [{"id": "a", "children": [{"attributes": {"id": "c"}}]}]}
+    assert get_lineage_edges(lineage) == {("root", "a"), ("a", "c")}
+
+def test_build_downstream_graph_fetches_every_dataset_once():
+    fetched = []
+    children = build_downstream_graph("root", lambda dataset_id: fetched.append(dataset_id) or _lineage(dataset_id))
+    assert children == GRAPH
+    assert sorted(fetched) == sorted(GRAPH)
+
+def test_get_topological_levels_orders_children_after_all_parents():
+    assert get_topological_levels(GRAPH, "root") == [["a", "b"], ["c"], ["d"]]
+    assert get_topological_levels(GRAPH, "c") == [["d"]]
+
+def test_get_topological_levels_rejects_cycles():
+    with pytest.raises(Exception):
+        get_topological_levels({"root": {"a"}, "a": {"b"}, "b": {"a"}}, "root")
+
+#--------------------------------------------------------------
+# Re-ingestion in lineage order
+#--------------------------------------------------------------
+class _Ingestion:
+    def __init__(self, dataset_id, ingested):
+        self.dataset_id = dataset_id
+        self.ingested = ingested
+
+    def wait(self, timeout=None):
+        if self.dataset_id == "a":
+            raise Exception("Ingestion failed")
+        self.ingested.append(self.dataset_id)
+        return self.dataset_id
+
+class _Upstream:
+    id = "root"
+
+    def _get_dataset_lineage(self, workspace_id, dataset_id):
+        return _lineage(dataset_id)
+
+def test_reingest_downstream_skips_datasets_below_a_failure(connection, monkeypatch):
+    ingested = []
+
+    class _Dataset:
+        def __init__(self, connection, workspace_id, dataset_id):
+            self.id = dataset_id
+
+        def ingest(self, return_job=False):
+            return _Ingestion(self.id, ingested)
+
+    monkeypatch.setattr(sedarapi.workspace, "Dataset", _Dataset)
+    workspace = sedarapi.workspace.Workspace(connection, "w", content={"title": "Workspace", "description": ""})
+    levels = workspace.reingest_downstream(_Upstream(), max_workers=2)
+
+    assert [[(result.key, result.ok) for result in level] for level in levels] == [[("a", False), ("b", True)], [("c", False)], [("d", False)]]
+    assert ingested == ["b"]
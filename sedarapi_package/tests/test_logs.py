@@ -0,0 +1,174 @@
+import itertools
+import json
+import logging
+
+import pytest
+from conftest import FakeResponse
+
+from sedarapi.logs import AccessLogStore
+from sedarapi.logs import LogCursor
+from sedarapi.logs import follow_log
+from sedarapi.logs import iter_log_records
+from sedarapi.sedarapi import SedarAPI
+
+#--------------------------------------------------------------
+# Parsing and following the server logs
+#--------------------------------------------------------------
+class _LogServer:
+    # Serves a growing log with HTTP Range semantics, like '_stream_resource' of the connection
+    def __init__(self, data=b""):
+        self.data = data
+        self.failures = 0
+        self.logger = logging.getLogger("SedarAPI-Logger")
+
+    def _stream_resource(self, resource_path, offset=0, response_info=None, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise Exception("The resource could not be streamed.")
+        if offset > 0 and offset >= len(self.data):
+            response_info["status"] = 416
+            return iter([])
+        response_info["status"] = 206 if offset > 0 else 200
+        return iter([self.data[offset:]])
+
+def _record(number):
+    return json.dumps({"time": f"2024-01-01T00:00:{number:02d}", "message": f"error {number}"}).encode() + b"\n"
+
+def _messages(records):
+    return [record["message"] for record in records]
+
+def test_iter_log_records_detects_layouts_across_chunks():
+    assert list(iter_log_records([b'[{"a": 1},', b' {"a": 2}]'])) == [{"a": 1}, {"a": 2}]
+    assert list(iter_log_records([b'{"a": 1}\n{"a"', b': 2}\n'])) == [{"a": 1}, {"a": 2}]
+    assert list(iter_log_records([b"first\r\nsec", b"ond\n\nthird"])) == ["first", "second", "third"]
+
+def test_iter_log_records_raises_on_truncated_json():
+    with pytest.raises(ValueError):
+        list(iter_log_records([b'{"a": 1}\n{"a": ']))
+
+def test_follow_log_yields_backlog_and_new_records():
+    server = _LogServer(b"".join(_record(number) for number in range(5)))
+    cursor = LogCursor()
+    follower = follow_log(server, "/log", cursor, backlog=2, sleep=lambda seconds: server.__setattr__("data", server.data + _record(5)))
+    assert _messages(itertools.islice(follower, 3)) == ["error 3", "error 4", "error 5"]
+
+def test_follow_log_keeps_records_after_an_empty_first_poll():
+    server = _LogServer()
+    cursor = LogCursor()
+    follower = follow_log(server, "/log", cursor, backlog=1, sleep=lambda seconds: server.__setattr__("data", b"".join(_record(number) for number in range(3))))
+    assert _messages(itertools.islice(follower, 3)) == ["error 0", "error 1", "error 2"]
+    assert cursor.initialized
+
+def test_follow_log_continues_after_a_failed_poll():
+    server = _LogServer(_record(0))
+    server.failures = 1
+    follower = follow_log(server, "/log", LogCursor(), backlog=5, sleep=lambda seconds: None)
+    assert _messages(itertools.islice(follower, 1)) == ["error 0"]
+
+def test_follow_log_rereads_a_replaced_log():
+    server = _LogServer(_record(0) + _record(1))
+    cursor = LogCursor()
+
+    def rotate(seconds):
+        server.data = _record(2)
+
+    follower = follow_log(server, "/log", cursor, backlog=5, sleep=rotate)
+    assert _messages(itertools.islice(follower, 3)) == ["error 0", "error 1", "error 2"]
+
+def test_follow_log_rejects_json_arrays():
+    server = _LogServer(b'[{"a": 1}]\n')
+    with pytest.raises(ValueError):
+        next(follow_log(server, "/log", LogCursor(), sleep=lambda seconds: None))
+
+#--------------------------------------------------------------
+# Streamed log downloads
+#--------------------------------------------------------------
+def _sedar(connection):
+    sedar = SedarAPI(connection.base_url)
+    sedar.connection = connection
+    return sedar
+
+def test_access_logs_are_streamed_to_disk(connection, tmp_path):
+    connection.session.route("GET", "/api/logs/access/download", FakeResponse(200, _record(1) + _record(2)))
+    target = tmp_path / "logs" / "access.log"
+
+    assert _sedar(connection).get_access_logs(download_path=str(target)) is True
+    assert target.read_bytes() == _record(1) + _record(2)
+
+def test_missing_error_logs_return_none(connection, tmp_path):
+    assert _sedar(connection).get_error_logs(download_path=str(tmp_path / "error.log")) is None
+    assert not (tmp_path / "error.log").exists()
+
+def test_logs_are_iterated_record_by_record(connection):
+    connection.session.route("GET", "/api/logs/access/download", FakeResponse(200, json.dumps([{"message": "a"}, {"message": "b"}]).encode()))
+    connection.session.route("GET", "/api/logs/error/download", FakeResponse(200, b"first line\nsecond line\n"))
+    sedar = _sedar(connection)
+
+    assert _messages(sedar.iter_access_logs()) == ["a", "b"]
+    assert list(sedar.iter_error_logs()) == ["first line", "second line"]
+
+#--------------------------------------------------------------
+# Local store for the access logs
+#--------------------------------------------------------------
+def _access(number, dataset="d1", latency=10):
+    return json.dumps({"timestamp": f"2024-01-0{1 + number % 2}T00:00:{number:02d}Z", "user": "ann", "method": "GET",
+                       "resource": f"/api/v1/workspaces/w/datasets/{dataset}", "status": 200, "latency": latency}).encode() + b"\n"
+
+def _serve_access_log(connection, log):
+    # Serves the current content of "log" with HTTP Range semantics
+    def answer(method, path, json, headers, body):
+        data = log["data"]
+        if "Range" in headers:
+            offset = int(headers["Range"][len("bytes="):-1])
+            if offset >= len(data):
+                return FakeResponse(416, b"", {"Content-Range": f"bytes */{len(data)}"})
+            return FakeResponse(206, data[offset:])
+        return FakeResponse(200, data)
+    connection.session.route("GET", "/api/logs/access/download", answer)
+
+def test_store_fetches_only_the_appended_records(connection, tmp_path):
+    log = {"data": _access(1) + _access(2, "d2", 30)}
+    _serve_access_log(connection, log)
+    store = AccessLogStore(str(tmp_path / "usage.db"))
+    sedar = _sedar(connection)
+
+    assert store.update(sedar) == 2
+    log["data"] += _access(3, latency=20) + b'{"timestamp": "2024-01-02T00:00:04Z"'
+    assert store.update(sedar) == 1
+    assert store.update(sedar) == 0
+
+    ranges = [request[3].get("Range") for request in connection.session.requests]
+    assert ranges == [None, f"bytes={len(_access(1))}-", f"bytes={len(_access(1) + _access(2, 'd2', 30))}-"]
+    assert store.get_top("dataset") == [("d1", 2), ("d2", 1)]
+    assert store.count_by_dataset_per_day() == [("2024-01-01", "d2", 1), ("2024-01-02", "d1", 2)]
+    assert store.get_latency_percentile(50) == 20
+    assert store.get_latest_time() == "2024-01-02T00:00:03"
+
+def test_store_reads_a_replaced_log_from_the_beginning(connection, tmp_path):
+    log = {"data": _access(1) + _access(2)}
+    _serve_access_log(connection, log)
+    store = AccessLogStore(str(tmp_path / "usage.db"))
+    sedar = _sedar(connection)
+    store.update(sedar)
+
+    # The rotated log starts with new records, older ones are not added again
+    log["data"] = _access(5) + _access(1)
+    assert store.update(sedar) == 1
+    assert [request[3].get("Range") for request in connection.session.requests][-1] is None
+
+def test_store_keeps_its_cursor_between_sessions(connection, tmp_path):
+    log = {"data": _access(1) + _access(2)}
+    _serve_access_log(connection, log)
+    AccessLogStore(str(tmp_path / "usage.db")).update(_sedar(connection))
+
+    log["data"] += _access(3)
+    assert AccessLogStore(str(tmp_path / "usage.db")).update(_sedar(connection)) == 1
+    assert connection.session.requests[-1][3]["Range"] == f"bytes={len(_access(1))}-"
+
+def test_store_streams_json_array_logs_completely(connection, tmp_path):
+    log = {"data": b"[" + _access(1) + b"," + _access(2) + b"]"}
+    _serve_access_log(connection, log)
+    store = AccessLogStore(str(tmp_path / "usage.db"))
+
+    assert store.update(_sedar(connection)) == 2
+    assert store.update(_sedar(connection)) == 0
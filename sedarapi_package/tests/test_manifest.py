@@ -0,0 +1,63 @@
+import pytest
+from conftest import FakeResponse
+
+from sedarapi.dataset import Dataset
+from sedarapi.manifest import UploadManifest
+from sedarapi.manifest import hash_file
+from sedarapi.manifest import hash_json
+
+#--------------------------------------------------------------
+# Skipping unchanged datasource updates
+#--------------------------------------------------------------
+DATASET = {"id": "d", "title": "Sensors", "description": "", "isPublic": False, "isFavorite": False, "author": "", "longitude": "",
+           "latitude": "", "license": "", "language": "", "datasource": {"currentRevision": 1}}
+DEFINITION = {"name": "sensors", "read_format": "csv", "read_options": {"header": "true"}, "source_files": ["sensors"]}
+
+def _serve_dataset(connection):
+    connection.session.route("GET", "/api/v1/workspaces/w/datasets/d", DATASET)
+    connection.session.route("PUT", "/api/v1/workspaces/w/datasets/d/update-datasource", {"id": "d"})
+    connection.session.route("GET", "/api/v1/workspaces/w/datasets/d/run-ingestion", {"currentRevision": 2})
+
+def _uploads(connection):
+    return [request for request in connection.session.requests if request[0] == "PUT"]
+
+def test_manifest_persists_entries(tmp_path):
+    UploadManifest(str(tmp_path / "manifest.json")).set("key", {"files": {"a": "1"}})
+    assert UploadManifest(str(tmp_path / "manifest.json")).get("key") == {"files": {"a": "1"}}
+    assert UploadManifest(str(tmp_path / "manifest.json")).get("other") is None
+
+def test_hashes_do_not_depend_on_chunks_or_key_order(tmp_path):
+    source = tmp_path / "data.csv"
+    source.write_bytes(b"id\n" * 1000)
+    assert hash_file(str(source), chunk_size=7) == hash_file(str(source))
+    assert hash_json({"a": 1, "b": [1, 2]}) == hash_json({"b": [1, 2], "a": 1})
+
+def test_unchanged_update_is_skipped(connection, tmp_path):
+    _serve_dataset(connection)
+    source = tmp_path / "sensors.csv"
+    source.write_bytes(b"id\n1\n")
+    manifest_path = str(tmp_path / "manifest.json")
+    dataset = Dataset(connection, "w", "d", content=DATASET)
+
+    assert dataset.update_datasource(DEFINITION, str(source), skip_unchanged=True, manifest_path=manifest_path).update_skipped is False
+    assert dataset.update_datasource(DEFINITION, str(source), skip_unchanged=True, manifest_path=manifest_path).update_skipped is True
+    assert len(_uploads(connection)) == 1
+
+    source.write_bytes(b"id\n1\n2\n")
+    assert dataset.update_datasource(DEFINITION, str(source), skip_unchanged=True, manifest_path=manifest_path).update_skipped is False
+    assert len(_uploads(connection)) == 2
+
+def test_failed_update_is_not_recorded(connection, tmp_path):
+    _serve_dataset(connection)
+    connection.session.route("GET", "/api/v1/workspaces/w/datasets/d/run-ingestion", FakeResponse(500))
+    source = tmp_path / "sensors.csv"
+    source.write_bytes(b"id\n1\n")
+    manifest_path = str(tmp_path / "manifest.json")
+    dataset = Dataset(connection, "w", "d", content=DATASET)
+
+    with pytest.raises(Exception):
+        dataset.update_datasource(DEFINITION, str(source), skip_unchanged=True, manifest_path=manifest_path)
+
+    connection.session.route("GET", "/api/v1/workspaces/w/datasets/d/run-ingestion", {"currentRevision": 2})
+    assert dataset.update_datasource(DEFINITION, str(source), skip_unchanged=True, manifest_path=manifest_path).update_skipped is False
+    assert len(_uploads(connection)) == 2
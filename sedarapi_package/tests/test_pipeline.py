@@ -0,0 +1,82 @@
+from sedarapi.jobs import Job
+from sedarapi.pipeline import Pipeline
+from sedarapi.workspace import Workspace
+
+#--------------------------------------------------------------
+# Multi stage pipelines
+#--------------------------------------------------------------
+def test_items_pass_all_stages_in_order():
+    pipeline = Pipeline([("double", lambda value: value * 2, 2), ("add", lambda value: value + 1, 1)])
+    results = pipeline.run(range(5))
+
+    assert [result.value for result in results] == [1, 3, 5, 7, 9]
+    assert all(set(result.timings) == {"double", "add"} for result in results)
+    assert pipeline.get_stage_stats()["add"]["items"] == 5
+
+def test_failed_stage_is_reported_and_later_stages_are_skipped():
+    calls = []
+
+    def check(value):
+        if value == 2:
+            raise ValueError("bad item")
+        return value
+
+    pipeline = Pipeline([("check", check, 1), ("record", calls.append, 1)])
+    results = pipeline.run([1, 2, 3])
+
+    assert [(result.ok, result.stage) for result in results] == [(True, None), (False, "check"), (True, None)]
+    assert sorted(calls) == [1, 3]
+
+def test_stop_on_error_admits_no_further_items():
+    pipeline = Pipeline([("fail", lambda value: 1 / 0, 1)], max_in_flight=1)
+    results = pipeline.run(range(10), stop_on_error=True)
+
+    assert len(results) == 1 and results[0].stage == "fail"
+
+#--------------------------------------------------------------
+# Timeouts of the server side stages
+#--------------------------------------------------------------
+class _Dataset:
+    def __init__(self, connection, finish_ingestion):
+        self.connection = connection
+        self.finish_ingestion = finish_ingestion
+        self.ingestion = None
+        self.steps = []
+
+    def ingest(self, **options):
+        # The job is only polled after a minute, so it stays pending unless it is finished right away
+        self.ingestion = Job("ingestion", lambda: (True, self), self.connection.jobs, initial_interval=60)
+        if self.finish_ingestion:
+            self.ingestion._finish(value=self)
+        return self.ingestion
+
+    def publish(self, **options):
+        self.steps.append("publish")
+        job = Job("publish", lambda: (True, self), self.connection.jobs, initial_interval=60)
+        job._finish(value=self)
+        return job
+
+    def start_profiling(self):
+        self.steps.append("profile")
+
+    def create_index_data(self):
+        self.steps.append("index")
+
+def test_stage_timeout_fails_the_stage(connection, monkeypatch):
+    workspace = Workspace(connection, "w", content={"title": "Workspace", "description": ""})
+    datasets = {"slow": _Dataset(connection, False)}
+    monkeypatch.setattr(workspace, "_create_dataset_from_spec", lambda spec, naming_rule, upload_options: datasets[spec[0]])
+
+    results = workspace.run_ingestion_pipeline([("slow", "slow.csv")], stage_timeouts={"ingest": 0.05})
+    assert results[0].stage == "ingest"
+    assert isinstance(results[0].error, TimeoutError)
+    assert datasets["slow"].ingestion.done() and datasets["slow"].steps == []
+
+def test_finished_jobs_continue_to_the_next_stages(connection, monkeypatch):
+    workspace = Workspace(connection, "w", content={"title": "Workspace", "description": ""})
+    dataset = _Dataset(connection, True)
+    monkeypatch.setattr(workspace, "_create_dataset_from_spec", lambda spec, naming_rule, upload_options: dataset)
+
+    results = workspace.run_ingestion_pipeline([("fast", "fast.csv")], stage_timeouts={"ingest": 5, "publish": 5})
+    assert results[0].ok and results[0].value is dataset
+    assert dataset.steps == ["publish", "profile", "index"]
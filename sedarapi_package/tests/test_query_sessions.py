@@ -0,0 +1,52 @@
+import threading
+import time
+
+import pytest
+
+from sedarapi.commons import QuerySessionPool
+
+#--------------------------------------------------------------
+# Query session pool
+#--------------------------------------------------------------
+def test_checkout_hands_out_distinct_ids_and_reuses_them():
+    pool = QuerySessionPool(size=2)
+    with pool.checkout() as first, pool.checkout() as second:
+        assert first != second
+    with pool.checkout() as again:
+        assert again in (first, second)
+
+def test_checkout_times_out_when_the_pool_is_exhausted():
+    pool = QuerySessionPool(size=1)
+    with pool.checkout():
+        with pytest.raises(TimeoutError):
+            with pool.checkout(timeout=0.05):
+                pass
+    with pool.checkout(timeout=0.05):
+        pass
+
+def test_checkout_waits_for_a_returned_id():
+    pool = QuerySessionPool(size=1)
+    ids = []
+
+    def worker():
+        with pool.checkout(timeout=5) as session_id:
+            ids.append(session_id)
+
+    with pool.checkout() as session_id:
+        thread = threading.Thread(target=worker)
+        thread.start()
+        assert not ids
+    thread.join(5)
+    assert ids == [session_id]
+
+def test_idle_ids_expire():
+    pool = QuerySessionPool(size=1, idle_expiry=0)
+    with pool.checkout() as first:
+        pass
+    time.sleep(0.01)
+    with pool.checkout() as second:
+        assert second != first
+
+def test_pool_needs_a_positive_size():
+    with pytest.raises(ValueError):
+        QuerySessionPool(size=0)
@@ -0,0 +1,126 @@
+import threading
+
+import pytest
+from conftest import FakeResponse
+from conftest import FakeSession
+
+from sedarapi.dataset import Dataset
+from sedarapi.search import merge_ranked_results
+from sedarapi.search import search_workspaces
+from sedarapi.sedarapi import SedarAPI
+from sedarapi.workspace import Workspace
+
+#--------------------------------------------------------------
+# Auto-paginating dataset search
+#--------------------------------------------------------------
+def _hit(index, **members):
+    hit = {"id": f"d{index}", "title": f"Dataset {index}", "description": "", "isPublic": False, "isFavorite": False, "author": "",
+           "longitude": "", "latitude": "", "license": "", "language": "", "datasource": {"currentRevision": 0}}
+    return dict(hit, **members)
+
+def _serve_hits(connection, workspace_id, hits):
+    # The server has no offset, it always answers with the first "limit" hits
+    def search(method, path, json, headers, body):
+        return hits[:int(json["limit"])]
+
+    connection.session.route("POST", f"/api/v1/workspaces/{workspace_id}/search", search)
+
+def _limits(connection):
+    return [json["limit"] for method, path, json, headers, body in connection.session.requests if method == "POST"]
+
+def test_iter_search_doubles_the_limit_and_yields_every_hit_once(connection):
+    _serve_hits(connection, "w", [_hit(index) for index in range(7)])
+    workspace = Workspace(connection, "w", content={"title": "Workspace", "description": ""})
+
+    datasets = list(workspace.iter_search("sensor", page_size=2))
+    assert [dataset.id for dataset in datasets] == [f"d{index}" for index in range(7)]
+    assert _limits(connection) == ["2", "4", "8"]
+    # The datasets are built from the hits, without a request per hit
+    assert datasets[3].title == "Dataset 3" and len(connection.session.requests) == 3
+
+def test_iter_search_requests_only_what_is_consumed(connection):
+    _serve_hits(connection, "w", [_hit(index) for index in range(100)])
+    workspace = Workspace(connection, "w", content={"title": "Workspace", "description": ""})
+
+    iterator = workspace.iter_search("sensor", page_size=3)
+    assert [next(iterator).id for _ in range(3)] == ["d0", "d1", "d2"]
+    assert _limits(connection) == ["3"]
+
+    assert [dataset.id for dataset in workspace.iter_search("sensor", page_size=3, max_results=4)] == ["d0", "d1", "d2", "d3"]
+    assert _limits(connection) == ["3", "3", "6"]
+
+def test_iter_search_manages_the_limit_and_forwards_filters(connection):
+    _serve_hits(connection, "w", [_hit(0)])
+    workspace = Workspace(connection, "w", content={"title": "Workspace", "description": ""})
+
+    assert len(list(workspace.iter_search("sensor", limit="500", zone="processed"))) == 1
+    payload = connection.session.requests[0][2]
+    assert payload["limit"] == "50" and payload["zone"] == "processed" and payload["query"] == "sensor"
+
+def test_iter_search_errors(connection):
+    connection.session.route("POST", "/api/v1/workspaces/w/search", FakeResponse(500))
+    workspace = Workspace(connection, "w", content={"title": "Workspace", "description": ""})
+
+    assert list(workspace.iter_search("sensor", ignore_errors=True)) == []
+    with pytest.raises(Exception, match="Failed to search Datasets"):
+        list(workspace.iter_search("sensor"))
+
+#--------------------------------------------------------------
+# Merging the rankings of several workspaces
+#--------------------------------------------------------------
+def _dataset(connection, workspace_id, index, **members):
+    return Dataset(connection, workspace_id, f"{workspace_id}{index}", content=_hit(index, **members))
+
+def _ids(datasets):
+    return [dataset.id for dataset in datasets]
+
+def test_merge_ranked_results_interleaves_by_rank(connection):
+    a = [_dataset(connection, "a", index) for index in range(3)]
+    b = [_dataset(connection, "b", index) for index in range(1)]
+    assert _ids(merge_ranked_results([("B", b), ("A", a)])) == ["a0", "b0", "a1", "a2"]
+    assert _ids(merge_ranked_results([("A", a), ("B", b)])) == _ids(merge_ranked_results([("B", b), ("A", a)]))
+    assert merge_ranked_results([]) == []
+
+def test_merge_ranked_results_orders_by_score(connection):
+    a = [_dataset(connection, "a", 0, score=0.5), _dataset(connection, "a", 1, _score=0.1)]
+    b = [_dataset(connection, "b", 0, score=0.9), _dataset(connection, "b", 1, score=0.5)]
+    assert _ids(merge_ranked_results([("A", a), ("B", b)])) == ["b0", "a0", "b1", "a1"]
+
+def test_merge_ranked_results_ignores_partial_scores(connection):
+    a = [_dataset(connection, "a", 0), _dataset(connection, "a", 1, score=0.9)]
+    b = [_dataset(connection, "b", 0, score=0.1)]
+    assert _ids(merge_ranked_results([("A", a), ("B", b)])) == ["a0", "b0", "a1"]
+
+#--------------------------------------------------------------
+# Concurrent search
+#--------------------------------------------------------------
+def test_search_workspaces_reports_failed_and_slow_workspaces(connection):
+    release = threading.Event()
+    workspaces = [Workspace(connection, id, content={"title": id.upper(), "description": ""}) for id in ("a", "b", "c")]
+
+    def search(workspace):
+        if workspace.id == "b":
+            raise Exception("Search failed")
+        if workspace.id == "c":
+            release.wait(5)
+        return [_dataset(connection, workspace.id, 0)]
+
+    try:
+        results = search_workspaces(workspaces, search, max_workers=3, timeout=0.2)
+    finally:
+        release.set()
+    assert _ids(results) == ["a0"] and not results.complete
+    assert str(results.errors["b"]) == "Search failed"
+    assert isinstance(results.errors["c"], TimeoutError)
+
+def test_search_all_merges_the_hits_of_every_workspace():
+    sedar = SedarAPI("http://sedar")
+    sedar.connection.session = FakeSession(sedar.connection.base_url)
+    sedar.connection.session.route("GET", "/api/v1/workspaces/", [{"id": "a", "title": "A", "description": ""},
+                                                                  {"id": "b", "title": "B", "description": ""}])
+    _serve_hits(sedar.connection, "a", [_hit(index, id=f"a{index}") for index in range(3)])
+    _serve_hits(sedar.connection, "b", [_hit(index, id=f"b{index}") for index in range(3)])
+
+    results = sedar.search_all("sensor", limit=2)
+    assert results.complete and _ids(results) == ["a0", "b0", "a1", "b1"]
+    assert sorted(_limits(sedar.connection)) == ["2", "2"]
@@ -0,0 +1,63 @@
+import pytest
+
+from sedarapi.sourcefiles import plan_shards
+from sedarapi.sourcefiles import shard_upload_files
+
+#--------------------------------------------------------------
+# Sharded uploads
+#--------------------------------------------------------------
+def _read(segments):
+    data = b""
+    for segment in segments:
+        if isinstance(segment, bytes):
+            data += segment
+        else:
+            path, start, end = segment
+            with open(path, "rb") as f:
+                f.seek(start)
+                data += f.read(end - start)
+    return data
+
+def test_plan_shards_splits_at_line_ends_and_repeats_the_header(tmp_path):
+    source = tmp_path / "data.csv"
+    rows = [f"{i},value {i}\n".encode() for i in range(100)]
+    source.write_bytes(b"id,value\n" + b"".join(rows))
+
+    shards = plan_shards(str(source), 3, has_header=True)
+    assert len(shards) == 3
+    contents = [_read(segments) for segments in shards]
+    assert all(content.startswith(b"id,value\n") and content.endswith(b"\n") for content in contents)
+    assert b"".join(content[len(b"id,value\n"):] for content in contents) == b"".join(rows)
+
+def test_plan_shards_leaves_out_empty_shards(tmp_path):
+    source = tmp_path / "data.json"
+    source.write_bytes(b'{"id": 1}\n')
+    assert [_read(segments) for segments in plan_shards(str(source), 4)] == [b'{"id": 1}\n']
+
+def test_shard_upload_files_replaces_source_files(tmp_path):
+    source = tmp_path / "data.csv"
+    source.write_bytes(b"id\n" + b"".join(f"{i}\n".encode() for i in range(10)))
+    definition = {"read_format": "csv", "read_options": {"header": "true"}, "source_files": ["data"]}
+
+    definition, files = shard_upload_files(definition, {"data": ("data.csv", str(source), "text/csv")}, 2)
+    assert definition["source_files"] == ["data_part000", "data_part001"]
+    assert [files[name][0] for name in definition["source_files"]] == ["data_part000.csv", "data_part001.csv"]
+
+def test_plan_shards_keeps_quoted_line_breaks_together(tmp_path):
+    source = tmp_path / "data.csv"
+    rows = [f'{i},"line one\nline ""two""\n\\"three",x\n'.encode() for i in range(50)]
+    source.write_bytes(b'id,"te\nxt",v\n' + b"".join(rows))
+
+    shards = plan_shards(str(source), 4, has_header=True, quote='"', escape="\\")
+    assert len(shards) == 4
+    contents = [_read(segments) for segments in shards]
+    assert all(content.startswith(b'id,"te\nxt",v\n') for content in contents)
+    bodies = [content[len(b'id,"te\nxt",v\n'):] for content in contents]
+    assert b"".join(bodies) == b"".join(rows)
+    assert all(body.count(b"\n") % 3 == 0 for body in bodies)
+
+def test_shard_upload_files_rejects_multi_line_json(tmp_path):
+    source = tmp_path / "data.json"
+    source.write_bytes(b'[{"id": 1}]\n')
+    with pytest.raises(Exception):
+        shard_upload_files({"read_format": "json", "read_options": {"multiLine": "true"}}, {"data": ("data.json", str(source), None)}, 2)
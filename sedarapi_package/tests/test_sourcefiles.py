@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from sedarapi.sourcefiles import convert_to_parquet
+
+#--------------------------------------------------------------
+# Parquet conversion
+#--------------------------------------------------------------
+pyarrow = pytest.importorskip("pyarrow")
+import pyarrow.parquet
+
+CSV_DEFINITION = {"read_format": "csv", "read_options": {"header": "true", "delimiter": ","}}
+JSON_DEFINITION = {"read_format": "json"}
+
+def test_csv_types_are_widened_over_the_whole_file(tmp_path):
+    source = tmp_path / "data.csv"
+    lines = ["id,value,name,empty"] + [f"{i},{i},n{i}," for i in range(20000)] + ["20000,1.5,last,"]
+    source.write_text("\n".join(lines) + "\n")
+
+    convert_to_parquet(str(source), CSV_DEFINITION, str(tmp_path / "data.parquet"), block_size=16 * 1024)
+    table = pyarrow.parquet.read_table(tmp_path / "data.parquet")
+
+    assert table.num_rows == 20001
+    assert table.schema.field("id").type == pyarrow.int64()
+    assert table.schema.field("value").type == pyarrow.float64()
+    assert table.schema.field("empty").type == pyarrow.string()
+    assert table["value"][-1].as_py() == 1.5
+
+def test_json_lines_with_null_first_block(tmp_path):
+    source = tmp_path / "data.json"
+    records = [{"a": None, "b": i} for i in range(5000)] + [{"a": "late", "b": 2.5, "c": "new"}]
+    source.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+    convert_to_parquet(str(source), JSON_DEFINITION, str(tmp_path / "data.parquet"), block_size=4 * 1024)
+    table = pyarrow.parquet.read_table(tmp_path / "data.parquet")
+
+    assert table.num_rows == 5001
+    assert table.schema.field("a").type == pyarrow.string()
+    assert table.schema.field("b").type == pyarrow.float64()
+    assert table["a"][-1].as_py() == "late"
+    assert table["c"][0].as_py() is None
+
+def test_invalid_json_raises_repo_exception(tmp_path):
+    source = tmp_path / "data.json"
+    source.write_text('{"a": 1}\n{"a": \n')
+
+    with pytest.raises(Exception, match="could not be converted to Parquet"):
+        convert_to_parquet(str(source), JSON_DEFINITION, str(tmp_path / "data.parquet"))
+
+def test_unsupported_format_raises(tmp_path):
+    with pytest.raises(Exception, match="Only 'csv' and 'json'"):
+        convert_to_parquet("data.xml", {"read_format": "xml"}, str(tmp_path / "data.parquet"))
+
+def test_csv_quote_and_escape_options_are_honoured(tmp_path):
+    source = tmp_path / "data.csv"
+    source.write_text("id;text\n1;'a;b'\n2;'it\\'s'\n3;'two\nlines'\n")
+    definition = {"read_format": "csv", "read_options": {"header": "true", "delimiter": ";", "quote": "'", "escape": "\\", "multiLine": "true"}}
+    table = pyarrow.parquet.read_table(convert_to_parquet(str(source), definition, str(tmp_path / "data.parquet")))
+
+    assert table.column("text").to_pylist() == ["a;b", "it's", "two\nlines"]
+
+def test_csv_without_header_uses_spark_column_names(tmp_path):
+    source = tmp_path / "data.csv"
+    source.write_text('1,"x, y"\n2,"z"\n')
+    definition = {"read_format": "csv", "read_options": {"header": "false"}}
+    table = pyarrow.parquet.read_table(convert_to_parquet(str(source), definition, str(tmp_path / "data.parquet")))
+
+    assert table.schema.names == ["_c0", "_c1"]
+    assert table.column("_c1").to_pylist() == ["x, y", "z"]
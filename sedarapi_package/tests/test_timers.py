@@ -0,0 +1,73 @@
+from datetime import datetime
+from datetime import timezone
+
+import pytest
+
+from sedarapi.changelog import DatasetLogRecord
+from sedarapi.commons import _parse_time
+from sedarapi.dataset import Dataset
+from sedarapi.timers import estimate_ingestion_minutes
+from sedarapi.timers import get_load
+from sedarapi.timers import plan_staggered_offsets
+from sedarapi.timers import to_timer
+from sedarapi.workspace import Workspace
+
+#--------------------------------------------------------------
+# Staggered continuation timers
+#--------------------------------------------------------------
+def test_to_timer_returns_the_delay_and_the_interval_in_milliseconds():
+    assert to_timer(360, 20) == [str(20 * 60000), str(360 * 60000)]
+    assert to_timer(15, 0) == ["0", "900000"]
+
+def test_to_timer_rejects_periods_not_dividing_a_day():
+    with pytest.raises(Exception):
+        to_timer(7, 0)
+
+def test_plan_staggered_offsets_lowers_the_peak():
+    jobs = {f"dataset-{index}": (60, 15) for index in range(4)}
+    offsets = plan_staggered_offsets(jobs)
+    assert max(get_load({name: (60, 15, 0) for name in jobs})) == 4
+    assert max(get_load({name: (60, 15, offsets[name]) for name in jobs})) == 1
+    assert all(0 <= offset < 60 for offset in offsets.values())
+
+def test_plan_staggered_offsets_rejects_periods_not_dividing_a_day():
+    with pytest.raises(Exception):
+        plan_staggered_offsets({"dataset": (7, 1)})
+
+#--------------------------------------------------------------
+# Ingestion costs from the change logs
+#--------------------------------------------------------------
+def _log(time, description):
+    return {"version": 1, "createdOn": time, "description": {"en": description}}
+
+LOGS = [
+    _log("2024-01-01T10:00:00Z", "Ingestion started"), _log("2024-01-01T10:12:00Z", "Ingestion finished"),
+    _log("2024-01-01T11:00:00Z", "Changed the title"),
+    _log("2024-01-02T10:00:00Z", "Ingestion started"), _log("2024-01-02T10:20:30Z", "Ingestion completed successfully"),
+    _log("2024-01-03T10:00:00Z", "Ingestion started"), _log("2024-01-03T10:30:00Z", "Ingestion finished"),
+    _log("2024-01-04T10:00:00Z", "Ingestion started")
+]
+
+def test_estimate_takes_the_median_of_complete_runs():
+    records = [DatasetLogRecord(log) for log in LOGS]
+    assert estimate_ingestion_minutes(records) == 21
+    assert estimate_ingestion_minutes(records, last_runs=1) == 30
+    assert estimate_ingestion_minutes(records[:1], default=7) == 7
+
+def test_parse_time_returns_comparable_utc_times():
+    assert _parse_time("2024-01-01T12:00:00+02:00") == datetime(2024, 1, 1, 10, tzinfo=timezone.utc)
+    assert _parse_time("2024-01-01T10:00:00") == _parse_time(1704103200000)
+    assert _parse_time(datetime(2024, 1, 1, 10)).tzinfo is timezone.utc
+    assert _parse_time("yesterday") is None
+
+def test_plan_estimates_missing_costs_from_the_logs(connection):
+    for dataset_id, logs in (("a", LOGS), ("b", [])):
+        connection.session.route("GET", f"/api/v1/workspaces/w/datasets/{dataset_id}/logs", logs)
+    workspace = Workspace(connection, "w", content={"title": "Workspace", "description": ""})
+    datasets = [Dataset(connection, "w", dataset_id, content={"id": dataset_id, "title": dataset_id, "description": "", "isPublic": False,
+                        "isFavorite": False, "author": "", "longitude": "", "latitude": "", "license": "", "language": "", "datasource": {"currentRevision": 1}}) for dataset_id in ("a", "b", "c")]
+
+    plan = workspace.plan_continuation_timers({dataset: 60 for dataset in datasets}, costs={"c": 30}, default_cost=5)
+    # "c" is placed first, "a" with its estimated 21 minutes right after it and "b" with the default cost after "a"
+    assert plan == {"c": ["0", "3600000"], "a": [str(30 * 60000), "3600000"], "b": [str(51 * 60000), "3600000"]}
+    assert not any(request[1].endswith("/c/logs") for request in connection.session.requests)
@@ -0,0 +1,66 @@
+import json
+
+from sedarapi.commons import Commons
+from sedarapi.upload import MultipartStream
+from sedarapi.upload import format_transfer_stats
+
+#--------------------------------------------------------------
+# Streaming multipart uploads
+#--------------------------------------------------------------
+class _Response:
+    def __init__(self, status_code=200, body=None):
+        self.status_code = status_code
+        self.content = json.dumps(body).encode()
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.content)
+
+class _Session:
+    # Records the requests of the connection and reads streamed bodies like an HTTP client
+    def __init__(self):
+        self.requests = []
+
+    def request(self, method, url, data=None, headers=None):
+        body = b"".join(data) if not isinstance(data, (bytes, str, type(None))) else data
+        self.requests.append((method, url, body, headers))
+        return _Response(body={"id": "new"})
+
+def test_stream_matches_its_length_and_contains_all_parts(tmp_path):
+    source = tmp_path / "data.csv"
+    source.write_bytes(b"id\n1\n2\n")
+    progress = []
+    stream = MultipartStream({"datasource_definition": '{"name": "x"}'},
+                             {"data": ("data.csv", str(source), "text/csv"), "part": ("part.csv", [b"id\n", (str(source), 3, 5)], None)},
+                             chunk_size=7, progress_callback=lambda sent, total: progress.append((sent, total)))
+    body = b"".join(stream)
+
+    assert len(body) == len(stream)
+    assert progress[-1] == (len(body), len(body))
+    assert body.count(f"--{stream.boundary}\r\n".encode()) == 3 and body.endswith(f"--{stream.boundary}--\r\n".encode())
+    assert b'name="datasource_definition"\r\n\r\n{"name": "x"}\r\n' in body
+    assert b'filename="data.csv"\r\nContent-Type: text/csv\r\n\r\nid\n1\n2\n\r\n' in body
+    assert b'filename="part.csv"\r\n\r\nid\n1\n\r\n' in body
+    assert stream.get_stats()["bytes_sent"] == len(body)
+
+def test_read_without_size_returns_the_rest():
+    stream = MultipartStream({"a": "1"})
+    body = stream.read(5) + stream.read()
+    assert len(body) == len(stream)
+    assert stream.read(10) == b""
+
+def test_upload_resource_streams_the_body():
+    connection = Commons("http://sedar")
+    connection.session = _Session()
+    response = connection._upload_resource("POST", "/api/v1/workspaces/w/datasets", {"field": "value"}, {"file": ("a.txt", [b"abc"], "text/plain")})
+
+    assert response == {"id": "new"}
+    method, url, body, headers = connection.session.requests[0]
+    assert (method, url) == ("POST", "http://sedar/api/v1/workspaces/w/datasets")
+    assert headers["Content-Type"].startswith("multipart/form-data; boundary=")
+    assert b"\r\n\r\nabc\r\n" in body
+
+def test_format_transfer_stats():
+    assert format_transfer_stats({"bytes_sent": 3 * 1024 * 1024, "seconds": 2, "bytes_per_second": 1.5 * 1024 * 1024}) == "3.00 MB in 2.00 s (1.50 MB/s)"
@@ -0,0 +1,63 @@
+from sedarapi.journal import JobJournal
+from sedarapi.workspace import Workspace
+
+#--------------------------------------------------------------
+# Bulk dataset creation
+#--------------------------------------------------------------
+DATASET = {"title": "b", "description": "", "isPublic": False, "isFavorite": False, "author": "", "longitude": "",
+           "latitude": "", "license": "", "language": ""}
+
+class _Created:
+    def __init__(self, id):
+        self.id = id
+
+def _workspace(connection, monkeypatch, created, fail=()):
+    workspace = Workspace(connection, "w", content={"title": "Workspace", "description": ""})
+
+    def create_dataset(datasource_definition, file_paths, **upload_options):
+        if datasource_definition["name"] in fail:
+            raise Exception("Upload failed")
+        created.append((datasource_definition["name"], file_paths, upload_options))
+        return _Created(f"id-{datasource_definition['name']}")
+
+    monkeypatch.setattr(workspace, "create_dataset", create_dataset)
+    return workspace
+
+def _write_sources(directory):
+    for name in ("a", "b", ".hidden"):
+        (directory / f"{name}.csv").write_text("id,value\n1,2\n")
+    (directory / "nested").mkdir()
+
+def test_directory_is_onboarded_with_inferred_definitions(connection, monkeypatch, tmp_path):
+    _write_sources(tmp_path)
+    created = []
+    workspace = _workspace(connection, monkeypatch, created, fail={"a"})
+
+    results = workspace.create_datasets_bulk(str(tmp_path), max_workers=2, shards=2)
+    assert [(result.key, result.ok) for result in results] == [("a", False), ("b", True)]
+    assert str(results[0].error) == "Upload failed"
+    assert created == [("b", str(tmp_path / "b.csv"), {"shards": 2})]
+
+def test_naming_rule_names_the_datasets(connection, monkeypatch, tmp_path):
+    _write_sources(tmp_path)
+    created = []
+    workspace = _workspace(connection, monkeypatch, created)
+
+    results = workspace.create_datasets_bulk(str(tmp_path), naming_rule=lambda path: "ds_" + path[-5])
+    assert [result.key for result in results] == ["ds_a", "ds_b"]
+    assert sorted(name for name, _, _ in created) == ["ds_a", "ds_b"]
+
+def test_created_datasets_are_restored_from_the_journal(connection, monkeypatch, tmp_path):
+    sources = tmp_path / "sources"
+    sources.mkdir()
+    _write_sources(sources)
+    connection.session.route("GET", "/api/v1/workspaces/w/datasets/id-a", dict(DATASET, id="id-a"))
+    connection.session.route("GET", "/api/v1/workspaces/w/datasets/id-b", dict(DATASET, id="id-b"))
+    journal = JobJournal(str(tmp_path / "journal.db"))
+    created = []
+    workspace = _workspace(connection, monkeypatch, created)
+
+    workspace.create_datasets_bulk(str(sources), journal=journal)
+    results = workspace.create_datasets_bulk(str(sources), journal=journal)
+    assert len(created) == 2
+    assert [(result.resumed, result.value.id) for result in results] == [(True, "id-a"), (True, "id-b")]
@@ -54,8 +54,8 @@ if __name__ == "__main__":
 
         tag = dataset.add_tag("MyTag", foaf, anon)
 
-        dataset.ingest()
-        dataset.publish()
+        dataset.ingest(return_job=True).wait(timeout=3600)
+        dataset.publish(return_job=True).wait(timeout=3600)
 
         sedar.logout()
     except Exception as e: